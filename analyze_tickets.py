@@ -1,16 +1,29 @@
 """
 Analyze English support tickets to answer interesting questions about the data
+
+Run with --profile to time every SQL statement, capture its query plan and
+print a per-question timing table with full table scans flagged.
 """
+import argparse
+import contextlib
 import sqlite3
 import pandas as pd
 from collections import Counter
-import matplotlib.pyplot as plt
+
+from body_store import register_body_functions
+from ticket_schema import count_by_sql
+
+DB_FILENAME = 'english_support_tickets.db'
+# Set by main(profile=True); connect_to_database() then records every statement
+PROFILER = None
 
 def connect_to_database():
     """Connect to the English support tickets database"""
     try:
-        conn = sqlite3.connect('english_support_tickets.db')
-        return conn
+        if PROFILER:
+            return register_body_functions(PROFILER.connect(DB_FILENAME))
+        conn = sqlite3.connect(DB_FILENAME)
+        return register_body_functions(conn)
     except Exception as e:
         print(f"❌ Error connecting to database: {e}")
         return None
@@ -72,13 +85,7 @@ def question_2_priority_distribution():
         return
     
     try:
-        query = """
-        SELECT priority, COUNT(*) as ticket_count
-        FROM tickets 
-        WHERE priority IS NOT NULL 
-        GROUP BY priority 
-        ORDER BY ticket_count DESC
-        """
+        query = count_by_sql(conn, 'priority')
         
         df = pd.read_sql_query(query, conn)
         
@@ -293,15 +300,30 @@ def question_5_most_common_words():
     finally:
         conn.close()
 
-def main():
+QUESTIONS = [
+    question_1_top_categories,
+    question_2_priority_distribution,
+    question_3_average_text_length,
+    question_4_status_analysis,
+    question_5_most_common_words,
+]
+
+def main(profile=False, db_filename=None):
     """Run all analysis questions"""
+    global PROFILER, DB_FILENAME
+    if db_filename:
+        DB_FILENAME = db_filename
+    PROFILER = None
+    if profile:
+        from sql_profiler import SQLProfiler
+        PROFILER = SQLProfiler()
     
     print("🎫 ENGLISH SUPPORT TICKETS DATA ANALYSIS")
     print("=" * 60)
     
     # Check if database exists
     try:
-        conn = sqlite3.connect('english_support_tickets.db')
+        conn = register_body_functions(sqlite3.connect(DB_FILENAME))
         cursor = conn.cursor()
         cursor.execute("SELECT COUNT(*) FROM tickets")
         total_records = cursor.fetchone()[0]
@@ -312,11 +334,9 @@ def main():
         return
     
     # Run all questions
-    question_1_top_categories()
-    question_2_priority_distribution()
-    question_3_average_text_length()
-    question_4_status_analysis()
-    question_5_most_common_words()
+    for question in QUESTIONS:
+        with PROFILER.section(question.__name__) if PROFILER else contextlib.nullcontext():
+            question()
     
     print("\n" + "="*60)
     print("🎉 DATA ANALYSIS COMPLETE!")
@@ -326,6 +346,12 @@ def main():
     print("- Balance priority distributions")
     print("- Optimize ticket resolution processes")
     print("- Improve ticket descriptions based on length analysis")
+    
+    if PROFILER:
+        PROFILER.report()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Analyze English support tickets")
+    parser.add_argument('--profile', action='store_true',
+                        help='time every SQL statement and report query plans and full scans')
+    main(profile=parser.parse_args().profile)
\ No newline at end of file
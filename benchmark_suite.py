@@ -0,0 +1,210 @@
+"""
+Benchmark suite for the ticket pipeline.
+
+Each pinned scenario (fixed row count and seed) generates a synthetic
+multi-language dataset (ticket_corpus) in a temporary directory and times:
+
+- ingest: filter_english_tickets load/filter, CSV + SQLite save and the
+  near-duplicate pass
+- every analyze_tickets question
+- word counting (test2.question_3_common_words)
+- classifier training and bulk scoring
+
+Results are written as JSON. Saved baselines are kept per scenario in
+benchmark_baselines.json, and a run fails when any stage is slower than
+its baseline by more than the threshold.
+
+    python benchmark_suite.py                          # 20k scenario
+    python benchmark_suite.py --scenario 1m --save-baseline
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from ticket_corpus import write_corpus
+
+SCENARIOS = {
+    '20k': {'rows': 20_000, 'seed': 20, 'repeat': 3},
+    '1m': {'rows': 1_000_000, 'seed': 1, 'repeat': 1},
+    '10m': {'rows': 10_000_000, 'seed': 10, 'repeat': 1},
+}
+BASELINE_FILENAME = 'benchmark_baselines.json'
+# A stage regresses when it is this much slower than its baseline...
+REGRESSION_THRESHOLD = 0.25
+# ...and by at least this many seconds, so jitter on fast stages is ignored
+MIN_REGRESSION_SECONDS = 0.05
+
+# The input file name filter_english_tickets() looks for
+DATASET_FILENAME = 'dataset-tickets-multi-lang-4-20k.csv'
+GENERATE_CHUNK_ROWS = 100_000
+
+
+def write_synthetic_dataset(filename, rows, seed, chunk_rows=GENERATE_CHUNK_ROWS):
+    """Write a seeded dataset with the multi-lang CSV columns, chunk by chunk"""
+    write_corpus(filename, rows, seed=seed, chunk_rows=chunk_rows)
+
+
+def _best_time(fn, repeat):
+    """Fastest of repeat runs (seconds) and the last return value; output is discarded"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            started = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_scenario(name, rows=None, seed=None, repeat=None):
+    """Run every stage for one scenario; returns the results dict
+
+    rows, seed and repeat default to the pinned values in SCENARIOS.
+    """
+    import analyze_tickets
+    import filter_english_tickets
+    import test2
+    from near_duplicates import update_near_duplicates
+    from score_tickets import score_tickets
+    from ticket_classifier import train_ticket_classifier
+
+    pinned = SCENARIOS.get(name, {})
+    rows = rows if rows is not None else pinned['rows']
+    seed = seed if seed is not None else pinned['seed']
+    repeat = repeat if repeat is not None else pinned.get('repeat', 1)
+    db_filename = 'english_support_tickets.db'
+    model_filename = 'benchmark_classifier.pkl'
+
+    stages = {}
+    setup = {}
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            started = time.perf_counter()
+            write_synthetic_dataset(DATASET_FILENAME, rows, seed)
+            setup['generate'] = time.perf_counter() - started
+
+            stages['ingest.filter'], english_df = _best_time(
+                filter_english_tickets.filter_english_tickets, repeat)
+            stages['ingest.save'], _ = _best_time(
+                lambda: filter_english_tickets.save_english_tickets(english_df), repeat)
+            stages['ingest.near_duplicates'], _ = _best_time(
+                lambda: update_near_duplicates(db_filename, rebuild=True), repeat)
+            english_rows = len(english_df)
+            del english_df
+
+            for section in ('question_1_top_categories', 'question_2_priority_distribution',
+                            'question_3_average_text_length', 'question_4_status_analysis',
+                            'question_5_most_common_words'):
+                stages[f'analyze.{section}'], _ = _best_time(getattr(analyze_tickets, section), repeat)
+
+            stages['words.common_words'], _ = _best_time(test2.question_3_common_words, repeat)
+
+            stages['classifier.train'], _ = _best_time(
+                lambda: train_ticket_classifier(db_filename, 'queue', model_filename), repeat)
+            stages['classifier.score'], _ = _best_time(
+                lambda: score_tickets(db_filename, model_filename), repeat)
+        finally:
+            os.chdir(original_dir)
+
+    return {
+        'scenario': name,
+        'rows': rows,
+        'english_rows': english_rows,
+        'seed': seed,
+        'repeat': repeat,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'setup': setup,
+        'stages': stages,
+    }
+
+
+def load_baselines(filename=BASELINE_FILENAME):
+    if not os.path.exists(filename):
+        return {}
+    with open(filename) as f:
+        return json.load(f)
+
+
+def save_baseline(results, filename=BASELINE_FILENAME):
+    """Store results as the baseline for their scenario"""
+    baselines = load_baselines(filename)
+    baselines[results['scenario']] = results
+    with open(filename, 'w') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+
+
+def compare_to_baseline(results, baseline, threshold=REGRESSION_THRESHOLD,
+                        min_seconds=MIN_REGRESSION_SECONDS):
+    """Return [(stage, baseline_seconds, seconds), ...] for stages that regressed"""
+    regressions = []
+    for stage, seconds in results['stages'].items():
+        base = baseline.get('stages', {}).get(stage)
+        if base is None:
+            continue
+        if seconds > base * (1 + threshold) and seconds - base >= min_seconds:
+            regressions.append((stage, base, seconds))
+    return regressions
+
+
+def print_results(results, baseline=None):
+    print(f"\n⏱️ BENCHMARK: {results['scenario']} "
+          f"({results['rows']:,} tickets, {results['english_rows']:,} English)")
+    print("=" * 70)
+    for stage, seconds in results['stages'].items():
+        line = f"   {stage:<45} {seconds:9.3f}s"
+        base = (baseline or {}).get('stages', {}).get(stage)
+        if base:
+            line += f"  ({(seconds / base - 1) * 100:+6.1f}% vs baseline)"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), default='20k')
+    parser.add_argument('--baseline-file', default=BASELINE_FILENAME)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='store this run as the scenario baseline instead of comparing')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help='allowed slowdown as a fraction (default: %(default)s)')
+    parser.add_argument('--output', help='also write the results JSON to this file')
+    args = parser.parse_args(argv)
+
+    results = run_scenario(args.scenario)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        print_results(results)
+        save_baseline(results, args.baseline_file)
+        print(f"\n💾 Saved baseline for {args.scenario} to {args.baseline_file}")
+        return 0
+
+    baseline = load_baselines(args.baseline_file).get(args.scenario)
+    print_results(results, baseline)
+    if baseline is None:
+        print(f"\n⚠️ No baseline for {args.scenario}; run with --save-baseline to record one")
+        return 0
+
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} stage(s) regressed more than {args.threshold:.0%}:")
+        for stage, base, seconds in regressions:
+            print(f"   {stage}: {base:.3f}s → {seconds:.3f}s")
+        return 1
+    print(f"\n✅ No stage regressed more than {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""
+Optional compressed storage for ticket bodies.
+
+Bodies are most of the database but most queries never read them. In this
+mode they move out of ticket_rows into ticket_bodies, each one compressed
+with zlib against a preset dictionary trained on a sample of the bodies
+(body_dictionaries). Support tickets repeat the same greetings, phrases and
+sign-offs, which a 300-character body cannot reference on its own; the
+dictionary gives every body those strings up front. ticket_rows keeps only
+the metadata, so scans that never touch the body read far fewer pages.
+
+The tickets view stays the read path: its body column is
+ticket_body(dictionary_id, data), an SQL function that
+register_body_functions() adds to a sqlite3 connection:
+
+    conn = sqlite3.connect(DB_FILENAME)
+    register_body_functions(conn)
+    conn.execute("SELECT subject, body FROM tickets WHERE rowid = ?", (42,))
+
+Tickets inserted through the view are stored uncompressed (dictionary_id
+NULL) and the next compress_bodies() compresses them. Clients that cannot
+register SQL functions, such as the ticket app's node-sqlite3 driver,
+cannot read bodies from a compressed database; keep the app's database
+uncompressed.
+
+    python body_store.py compress [db]    # compress bodies in place (normalizes first if needed)
+    python body_store.py compare [db]     # compression ratio and query timings
+"""
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import zlib
+from collections import Counter
+
+from ticket_schema import (BODY_TABLE, DATA_TABLE, DICTIONARY_TABLE, count_by_sql, drop_search_index,
+                           is_normalized, normalize_tickets, view_columns, _create_view_and_trigger)
+
+DB_FILENAME = 'english_support_tickets.db'
+# zlib can reference at most 32 KB back, so a larger dictionary is never used
+DICTIONARY_SIZE = 32 * 1024
+SAMPLE_SIZE = 5000
+NGRAM_SIZES = (2, 3, 4, 6, 8)
+COMPRESSION_LEVEL = 9
+BATCH_SIZE = 5000
+COMPARE_REPEAT = 3
+
+
+def train_dictionary(bodies, size=DICTIONARY_SIZE):
+    """Preset dictionary of the word n-grams that save the most bytes across bodies
+
+    Each n-gram is scored by the bytes it would save (repeats x length);
+    n-grams already contained in a better one are skipped. The best are put
+    last, where zlib reaches them with the shortest distances.
+    """
+    counts = Counter()
+    for body in bodies:
+        words = body.split()
+        for n in NGRAM_SIZES:
+            counts.update(' '.join(words[i:i + n]) for i in range(len(words) - n + 1))
+
+    chosen = []
+    text = ''
+    used = 0
+    for gram, count in sorted(counts.items(), key=lambda item: (item[1] - 1) * len(item[0]), reverse=True):
+        if count < 2 or used >= size:
+            break
+        if gram in text:
+            continue
+        chosen.append(gram)
+        text += gram + '\n'
+        used += len(gram.encode('utf-8')) + 1
+    return ' '.join(reversed(chosen)).encode('utf-8')[-size:]
+
+
+def compress_body(text, dictionary):
+    compressor = zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, -15, zdict=dictionary)
+    return compressor.compress(text.encode('utf-8')) + compressor.flush()
+
+
+def decompress_body(data, dictionary):
+    decompressor = zlib.decompressobj(-15, zdict=dictionary)
+    return (decompressor.decompress(data) + decompressor.flush()).decode('utf-8')
+
+
+def is_compressed(conn):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (BODY_TABLE,)
+    ).fetchone() is not None
+
+
+def _load_dictionaries(conn):
+    if not is_compressed(conn):
+        return {}
+    return dict(conn.execute(f"SELECT id, dictionary FROM {DICTIONARY_TABLE}"))
+
+
+def register_body_functions(conn):
+    """Add ticket_body(dictionary_id, data) to conn so the tickets view can return bodies
+
+    Cheap on an uncompressed database (one sqlite_master lookup), so readers
+    call it unconditionally after connecting.
+    """
+    dictionaries = _load_dictionaries(conn)
+
+    def ticket_body(dictionary_id, data):
+        if data is None or dictionary_id is None:
+            # Not compressed yet
+            return data
+        if dictionary_id not in dictionaries:
+            dictionaries.update(_load_dictionaries(conn))
+        return decompress_body(data, dictionaries[dictionary_id])
+
+    conn.create_function('ticket_body', 2, ticket_body, deterministic=True)
+    return conn
+
+
+def _sample_bodies(conn, table, sample_size):
+    total = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    step = max(1, total // sample_size)
+    # Every step-th row rather than the first rows, so the sample spans the whole load
+    return [row[0] for row in conn.execute(
+        f"SELECT body FROM {table} WHERE body IS NOT NULL AND rowid % ? = 0 LIMIT ?",
+        (step, sample_size))]
+
+
+def _compress_rows(conn, rows, dictionary_id, dictionary):
+    conn.executemany(
+        f"INSERT OR REPLACE INTO {BODY_TABLE} (rowid, dictionary_id, data) VALUES (?, ?, ?)",
+        [(rowid, dictionary_id, compress_body(body, dictionary)) if body is not None else (rowid, None, None)
+         for rowid, body in rows])
+
+
+def compress_bodies(conn, sample_size=SAMPLE_SIZE, batch_size=BATCH_SIZE):
+    """Move bodies into compressed storage, or compress the ones added since; returns rows compressed
+
+    A flat database is normalized first. Runs in one transaction; bodies
+    are compressed batch_size rows at a time. Dropping the body column
+    leaves its bytes in ticket_rows' pages, so VACUUM afterwards for the
+    smaller table.
+    """
+    if not is_normalized(conn):
+        normalize_tickets(conn)
+    register_body_functions(conn)
+    columns = view_columns(conn)
+    if 'body' not in {name for name, _ in columns}:
+        raise ValueError("The tickets table has no body column")
+
+    compressed = 0
+    with conn:
+        conn.execute("BEGIN")
+        if not is_compressed(conn):
+            dictionary = train_dictionary(_sample_bodies(conn, DATA_TABLE, sample_size))
+            conn.execute(f"CREATE TABLE {DICTIONARY_TABLE} "
+                         f"(id INTEGER PRIMARY KEY, dictionary BLOB NOT NULL, "
+                         f"created_at TEXT DEFAULT CURRENT_TIMESTAMP)")
+            dictionary_id = conn.execute(f"INSERT INTO {DICTIONARY_TABLE} (dictionary) VALUES (?)",
+                                         (dictionary,)).lastrowid
+            conn.execute(f"CREATE TABLE {BODY_TABLE} (rowid INTEGER PRIMARY KEY, "
+                         f"dictionary_id INTEGER REFERENCES {DICTIONARY_TABLE} (id), data BLOB)")
+            after = 0
+            while True:
+                rows = conn.execute(f"SELECT rowid, body FROM {DATA_TABLE} WHERE rowid > ? "
+                                    f"ORDER BY rowid LIMIT ?", (after, batch_size)).fetchall()
+                if not rows:
+                    break
+                _compress_rows(conn, rows, dictionary_id, dictionary)
+                compressed += len(rows)
+                after = rows[-1][0]
+            # The new view no longer reads ticket_rows.body, so the column can go;
+            # the ticket app's search triggers read it too and cannot index compressed bodies
+            drop_search_index(conn)
+            conn.execute("DROP VIEW tickets")
+            _create_view_and_trigger(conn, columns, compressed_body=True)
+            conn.execute(f"ALTER TABLE {DATA_TABLE} DROP COLUMN body")
+        else:
+            dictionary_id, dictionary = conn.execute(
+                f"SELECT id, dictionary FROM {DICTIONARY_TABLE} ORDER BY id DESC LIMIT 1").fetchone()
+            while True:
+                rows = conn.execute(f"SELECT rowid, data FROM {BODY_TABLE} WHERE dictionary_id IS NULL "
+                                    f"AND data IS NOT NULL LIMIT ?", (batch_size,)).fetchall()
+                if not rows:
+                    break
+                _compress_rows(conn, rows, dictionary_id, dictionary)
+                compressed += len(rows)
+    return compressed
+
+
+def _best_time(conn, sql, repeat=COMPARE_REPEAT):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(sql).fetchall()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def comparison_queries(conn):
+    """{label: (workload, SQL)}; metadata queries never read the body"""
+    last = conn.execute("SELECT MAX(rowid) FROM tickets").fetchone()[0] or 0
+    middle = last // 2
+    metadata = ', '.join(name for name, _ in view_columns(conn) if name != 'body')
+    queries = {}
+    if 'priority' in metadata.split(', '):
+        queries["GROUP BY priority"] = ('metadata', count_by_sql(conn, 'priority'))
+    queries.update({
+        "subject LIKE scan": ('metadata', "SELECT COUNT(*) FROM tickets WHERE subject LIKE '%error%'"),
+        "page of 100, no body": ('metadata',
+                                 f"SELECT rowid, {metadata} FROM tickets "
+                                 f"WHERE rowid > {middle} ORDER BY rowid LIMIT 100"),
+        "page of 100 with body": ('body',
+                                  f"SELECT rowid, {metadata}, body FROM tickets "
+                                  f"WHERE rowid > {middle} ORDER BY rowid LIMIT 100"),
+        "body LIKE scan": ('body', "SELECT COUNT(*) FROM tickets WHERE body LIKE '%password%'"),
+        "SUM(length(body))": ('body', "SELECT SUM(length(body)) FROM tickets"),
+    })
+    return queries
+
+
+def compare_body_storage(db_filename=DB_FILENAME, repeat=COMPARE_REPEAT):
+    """Compression ratio, file size and query timings with plain and compressed bodies
+
+    Works on two vacuumed, normalized copies in a temporary directory; the
+    source database is not modified. Returns {'plain_bytes',
+    'compressed_bytes', 'body_bytes', 'compressed_body_bytes',
+    'no_dictionary_body_bytes', 'queries': {label: {'workload', 'plain',
+    'compressed'}}} with times in seconds.
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        plain_path = os.path.join(workdir, 'plain.db')
+        compressed_path = os.path.join(workdir, 'compressed.db')
+        shutil.copyfile(db_filename, plain_path)
+
+        conn = sqlite3.connect(plain_path)
+        register_body_functions(conn)
+        if is_compressed(conn):
+            raise ValueError(f"{db_filename} already has compressed bodies")
+        normalize_tickets(conn)
+        conn.execute("VACUUM")
+        conn.close()
+        shutil.copyfile(plain_path, compressed_path)
+
+        conn = sqlite3.connect(compressed_path)
+        compress_bodies(conn)
+        conn.execute("VACUUM")
+        conn.close()
+
+        plain = sqlite3.connect(plain_path)
+        compressed = register_body_functions(sqlite3.connect(compressed_path))
+        try:
+            dictionary = compressed.execute(f"SELECT dictionary FROM {DICTIONARY_TABLE}").fetchone()[0]
+            sample = _sample_bodies(plain, DATA_TABLE, SAMPLE_SIZE)
+            results = {
+                'plain_bytes': os.path.getsize(plain_path),
+                'compressed_bytes': os.path.getsize(compressed_path),
+                'dictionary_bytes': len(dictionary),
+                'body_bytes': plain.execute(
+                    f"SELECT SUM(length(CAST(body AS BLOB))) FROM {DATA_TABLE}").fetchone()[0] or 0,
+                'compressed_body_bytes': compressed.execute(
+                    f"SELECT SUM(length(data)) FROM {BODY_TABLE}").fetchone()[0] or 0,
+                # The same sample compressed body by body without a dictionary, scaled to the table
+                'sample_bytes': sum(len(body.encode('utf-8')) for body in sample),
+                'sample_no_dictionary_bytes': sum(len(compress_body(body, b'')) for body in sample),
+                'queries': {},
+            }
+            for label, (workload, sql) in comparison_queries(plain).items():
+                results['queries'][label] = {
+                    'workload': workload,
+                    'plain': _best_time(plain, sql, repeat),
+                    'compressed': _best_time(compressed, sql, repeat),
+                }
+        finally:
+            plain.close()
+            compressed.close()
+    return results
+
+
+def print_body_comparison(results):
+    print("\n🗜️ PLAIN vs COMPRESSED BODIES")
+    print("=" * 70)
+    body_mb, packed_mb = results['body_bytes'] / 1e6, results['compressed_body_bytes'] / 1e6
+    if packed_mb:
+        print(f"Body text:     {body_mb:,.1f} MB → {packed_mb:,.1f} MB "
+              f"({results['body_bytes'] / results['compressed_body_bytes']:.2f}x, "
+              f"{results['dictionary_bytes'] / 1024:.0f} KB dictionary)")
+    if results['sample_no_dictionary_bytes']:
+        print(f"Without dictionary (sample): "
+              f"{results['sample_bytes'] / results['sample_no_dictionary_bytes']:.2f}x")
+    plain_mb, compressed_mb = results['plain_bytes'] / 1e6, results['compressed_bytes'] / 1e6
+    print(f"Database size: {plain_mb:,.1f} MB → {compressed_mb:,.1f} MB "
+          f"({(compressed_mb / plain_mb - 1) * 100:+.1f}%)")
+    print(f"\n{'Query':<26} {'workload':<9} {'plain':>10} {'compressed':>11}")
+    print("-" * 70)
+    for label, times in results['queries'].items():
+        print(f"{label:<26} {times['workload']:<9} {times['plain'] * 1000:8.1f}ms "
+              f"{times['compressed'] * 1000:9.1f}ms")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else 'compare'
+    db_file = sys.argv[2] if len(sys.argv) > 2 else DB_FILENAME
+    if command == 'compress':
+        conn = sqlite3.connect(db_file)
+        rows = compress_bodies(conn)
+        conn.execute("VACUUM")
+        conn.close()
+        print(f"✅ Compressed {rows:,} ticket bodies in {db_file}")
+    elif command == 'compare':
+        print_body_comparison(compare_body_storage(db_file))
+    else:
+        print("Usage: python body_store.py compress|compare [db]")
@@ -1,14 +1,53 @@
+import os
+
 import pandas
 
+FILE_PATH = "data/data.csv"
+
+# Parsed CSV and derived aggregations, keyed by path and invalidated when the
+# file's mtime or size changes
+_cache = {}
+
+
+def _file_signature(file_path):
+    stat = os.stat(file_path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _cache_entry(file_path):
+    signature = _file_signature(file_path)
+    entry = _cache.get(file_path)
+    if entry is None or entry["signature"] != signature:
+        entry = {
+            "signature": signature,
+            "data": pandas.read_csv(file_path),
+            "industry_stats": None,
+        }
+        _cache[file_path] = entry
+    return entry
 
-def load_data():
-    FILE_PATH = "data/data.csv"
-    df = pandas.read_csv(FILE_PATH)
-    return df
 
+def clear_cache():
+    _cache.clear()
 
-def get_public_orgs():
-    df = load_data()
+
+def load_data(file_path=FILE_PATH):
+    # A deep copy, so changes made by the caller never reach the cache; a
+    # shallow copy is only safe with copy-on-write, which pandas < 3 leaves off
+    return _cache_entry(file_path)["data"].copy()
+
+
+def industry_stats(file_path=FILE_PATH):
+    entry = _cache_entry(file_path)
+    if entry["industry_stats"] is None:
+        entry["industry_stats"] = entry["data"].groupby("Industry")["Revenue"].agg(
+            revenue="sum", count="size"
+        )
+    return entry["industry_stats"].copy()
+
+
+def get_public_orgs(file_path=FILE_PATH):
+    df = load_data(file_path)
     public_df = df[df["Public?"] == 1]
     num = len(public_df)
     print("There are ", num, "public organizations.")
@@ -16,20 +55,16 @@ def get_public_orgs():
     return num
 
 
-def revenue_per_industry():
-    df = load_data()
-    revenue_by_industry = df.groupby("Industry")["Revenue"].sum()
-    count_by_industry = df["Industry"].value_counts()
-
-    rev_ratio = revenue_by_industry / count_by_industry
+def revenue_per_industry(file_path=FILE_PATH):
+    stats = industry_stats(file_path)
+    rev_ratio = stats["revenue"] / stats["count"]
 
     return rev_ratio
 
 
-def highest_revenue_industry():
-    df = load_data()
-    revenue_by_industry = df.groupby("Industry")["Revenue"].sum()
-    top_revenue_industry = revenue_by_industry.idxmax()
+def highest_revenue_industry(file_path=FILE_PATH):
+    stats = industry_stats(file_path)
+    top_revenue_industry = stats["revenue"].idxmax()
 
     return top_revenue_industry
 
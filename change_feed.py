@@ -0,0 +1,129 @@
+"""
+Rowid high-water-mark change feed over the tickets table.
+
+Each downstream consumer (scoring, reports, ...) has a row in
+feed_checkpoints holding the last rowid it has fully processed. A run reads
+only the rows above that mark, in rowid order and in batches, and moves the
+mark forward *in the same transaction* that stores its results. A crash
+therefore either keeps a batch's results and its checkpoint, or neither.
+
+    for rows in iter_changes(conn, 'my_report', 'subject, body'):
+        with conn:
+            store_results(conn, rows)
+            set_checkpoint(conn, 'my_report', rows[-1][0])
+
+consume_changes() wraps that loop. Tickets added by the ticket app's
+createTicket or the bulk endpoint get new, higher rowids, so they appear
+in the feed like ingested ones. The feed only sees appends; updates and
+deletes are not tracked. Replacing the tickets table (a fresh ingest)
+invalidates every mark, so the ingest calls reset_checkpoints().
+"""
+import sqlite3
+
+from body_store import register_body_functions
+
+DB_FILENAME = 'english_support_tickets.db'
+BATCH_SIZE = 10_000
+
+
+def create_checkpoint_table(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS feed_checkpoints (
+            consumer TEXT PRIMARY KEY,
+            last_rowid INTEGER NOT NULL,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def get_checkpoint(conn, consumer):
+    """Last rowid the consumer has committed (0 if it never ran)"""
+    create_checkpoint_table(conn)
+    row = conn.execute(
+        "SELECT last_rowid FROM feed_checkpoints WHERE consumer = ?", (consumer,)
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def set_checkpoint(conn, consumer, rowid):
+    """Move the consumer's mark forward to rowid
+
+    Does not commit: call it inside the transaction that stores the results
+    for the rows up to rowid. A mark never moves backwards.
+    """
+    create_checkpoint_table(conn)
+    conn.execute("""
+        INSERT INTO feed_checkpoints (consumer, last_rowid) VALUES (?, ?)
+        ON CONFLICT (consumer) DO UPDATE SET
+            last_rowid = excluded.last_rowid,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE excluded.last_rowid > feed_checkpoints.last_rowid
+    """, (consumer, rowid))
+
+
+def reset_checkpoints(conn, consumer=None):
+    """Forget one consumer's mark, or every mark, so it starts from the beginning"""
+    create_checkpoint_table(conn)
+    if consumer is None:
+        conn.execute("DELETE FROM feed_checkpoints")
+    else:
+        conn.execute("DELETE FROM feed_checkpoints WHERE consumer = ?", (consumer,))
+
+
+def pending_changes(conn, consumer, table='tickets'):
+    """Number of rows above the consumer's mark (a rowid range count)"""
+    after = get_checkpoint(conn, consumer)
+    return conn.execute(f"SELECT COUNT(*) FROM {table} WHERE rowid > ?", (after,)).fetchone()[0]
+
+
+def iter_changes(conn, consumer, columns='*', table='tickets', batch_size=BATCH_SIZE):
+    """Yield batches of (rowid, *columns) rows newer than the consumer's mark
+
+    Batches follow on from the last row yielded, so the loop advances even
+    if the caller has not committed a checkpoint yet; committing is up to
+    the caller (see set_checkpoint).
+    """
+    after = get_checkpoint(conn, consumer)
+    conn.commit()
+    while True:
+        rows = conn.execute(
+            f"SELECT rowid, {columns} FROM {table} WHERE rowid > ? ORDER BY rowid LIMIT ?",
+            (after, batch_size),
+        ).fetchall()
+        if not rows:
+            return
+        yield rows
+        after = rows[-1][0]
+
+
+def consume_changes(conn, consumer, handler, columns='*', table='tickets', batch_size=BATCH_SIZE):
+    """Call handler(conn, rows) for each new batch, committing its writes and the checkpoint together
+
+    Returns the number of rows processed.
+    """
+    processed = 0
+    for rows in iter_changes(conn, consumer, columns, table, batch_size):
+        with conn:
+            handler(conn, rows)
+            set_checkpoint(conn, consumer, rows[-1][0])
+        processed += len(rows)
+    return processed
+
+
+def feed_status(db_filename=DB_FILENAME, table='tickets'):
+    """[(consumer, last_rowid, pending rows, updated_at), ...] for every consumer"""
+    conn = register_body_functions(sqlite3.connect(db_filename))
+    try:
+        create_checkpoint_table(conn)
+        consumers = conn.execute(
+            "SELECT consumer, last_rowid, updated_at FROM feed_checkpoints ORDER BY consumer"
+        ).fetchall()
+        return [
+            (consumer, last_rowid,
+             conn.execute(f"SELECT COUNT(*) FROM {table} WHERE rowid > ?", (last_rowid,)).fetchone()[0],
+             updated_at)
+            for consumer, last_rowid, updated_at in consumers
+        ]
+    finally:
+        conn.close()
+
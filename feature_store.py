@@ -0,0 +1,292 @@
+"""
+Feature store: vectorize the ticket text once, open it memory-mapped everywhere.
+
+build_features() reads subject + body from the tickets table, fits a
+TfidfVectorizer and saves the document-term CSR matrix, the rowids and the
+label columns (as integer codes) to plain .npy files. load_features() opens
+those files with mmap_mode='r', so it costs a few milliseconds whatever the
+corpus size, and every process that opens the same entry shares the page
+cache instead of holding its own copy.
+
+Entries live in store_dir/<key>/, where the key hashes the vectorizer
+config, the database file's absolute path and its version:
+
+    features = load_features('english_support_tickets.db', {'ngram_range': (1, 2)})
+    X, y = features['X'], features['labels']['queue']
+
+The database version is the rowid high-water mark, the id the last ingest
+recorded (ticket_schema.record_ingest) and the tickets tables' definitions.
+Appends and re-ingests give a new version (and so a new entry); like the
+change feed, UPDATEs and DELETEs of old rows are not noticed, and neither
+is a tickets table re-created by hand without recording an ingest.
+prune_features() removes entries for older versions.
+
+    python feature_store.py build [db]    # build the default entry (no-op if current)
+    python feature_store.py list          # entries in the store
+    python feature_store.py prune [db]    # remove entries for older database versions
+"""
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from body_store import register_body_functions
+from ticket_schema import DATA_TABLE, ingest_id, is_normalized, tickets_definition
+
+DB_FILENAME = 'english_support_tickets.db'
+STORE_DIR = 'feature_store'
+LABEL_COLUMNS = ('queue', 'priority', 'type', 'language')
+# The TF-IDF settings used by ticket_classifier's pipeline
+DEFAULT_CONFIG = {
+    'stop_words': 'english',
+    'sublinear_tf': True,
+    'lowercase': True,
+    'ngram_range': (1, 1),
+    'min_df': 1,
+    'max_df': 1.0,
+    'max_features': None,
+}
+
+MATRIX_FILES = ('data.npy', 'indices.npy', 'indptr.npy')
+SHAPE_FILE = 'shape.npy'
+ROWIDS_FILE = 'rowids.npy'
+LABELS_DIR = 'labels'
+VECTORIZER_FILE = 'vectorizer.pkl'
+META_FILE = 'meta.json'
+
+
+def vectorizer_config(config=None):
+    """DEFAULT_CONFIG updated with config, in a JSON-stable form (tuples as lists)"""
+    merged = dict(DEFAULT_CONFIG, **(config or {}))
+    return {name: list(value) if isinstance(value, tuple) else value for name, value in sorted(merged.items())}
+
+
+def make_vectorizer(config=None):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    params = {name: tuple(value) if isinstance(value, list) else value
+              for name, value in vectorizer_config(config).items()}
+    return TfidfVectorizer(dtype=np.float32, **params)
+
+
+def db_version(conn):
+    """Version string of the tickets data: rowid high-water mark, ingest id and table definitions
+
+    All three are cheap lookups, so checking the version keeps
+    load_features() fast. Each ingest records a new random id, so a
+    re-ingest of the same number of rows still gets a new version. Only the
+    tickets tables' own definitions are hashed, not the global schema
+    cookie, so unrelated DDL (an index, the change feed's checkpoint table)
+    does not retire the features.
+    """
+    # The base table rather than the view, so MAX(rowid) is a single b-tree seek
+    table = DATA_TABLE if is_normalized(conn) else 'tickets'
+    max_rowid = conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").fetchone()[0]
+    definition = hashlib.sha1(json.dumps(tickets_definition(conn)).encode('utf-8')).hexdigest()[:8]
+    return f"{max_rowid}-{(ingest_id(conn) or 'none')[:8]}-{definition}"
+
+
+def current_version(db_filename):
+    conn = sqlite3.connect(db_filename)
+    try:
+        return db_version(conn)
+    finally:
+        conn.close()
+
+
+def feature_key(config, version, db_filename=None):
+    """Store key of config at a database version; with db_filename, only for that file"""
+    payload = {'config': vectorizer_config(config), 'db_version': version}
+    if db_filename is not None:
+        payload['db_filename'] = os.path.abspath(db_filename)
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def _is_entry_for(path, db_filename, version):
+    """True if path holds a finished entry built from this database file at this version"""
+    try:
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        return False
+    return meta['db_filename'] == os.path.abspath(db_filename) and meta['db_version'] == version
+
+
+def save_matrix(directory, matrix):
+    """Save a CSR matrix as .npy arrays that load_matrix() can memory-map"""
+    matrix = sparse.csr_matrix(matrix)
+    index_dtype = np.int32 if matrix.nnz < np.iinfo(np.int32).max else np.int64
+    arrays = (matrix.data.astype(np.float32), matrix.indices.astype(index_dtype), matrix.indptr.astype(index_dtype))
+    for filename, array in zip(MATRIX_FILES, arrays):
+        np.save(os.path.join(directory, filename), array)
+    np.save(os.path.join(directory, SHAPE_FILE), np.array(matrix.shape, dtype=np.int64))
+
+
+def load_matrix(directory):
+    """Open a matrix saved by save_matrix() without reading its arrays into memory"""
+    data, indices, indptr = (np.load(os.path.join(directory, filename), mmap_mode='r') for filename in MATRIX_FILES)
+    shape = tuple(int(size) for size in np.load(os.path.join(directory, SHAPE_FILE)))
+    return sparse.csr_matrix((data, indices, indptr), shape=shape, copy=False)
+
+
+def _read_tickets(db_filename):
+    """(db version, DataFrame of rowid, subject, body and label columns) read in one transaction"""
+    conn = register_body_functions(sqlite3.connect(db_filename))
+    try:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(tickets)")}
+        labels = [name for name in LABEL_COLUMNS if name in columns]
+        # The version and the rows come from the same snapshot
+        conn.execute("BEGIN")
+        version = db_version(conn)
+        df = pd.read_sql_query(
+            f"SELECT rowid, subject, body{''.join(', ' + name for name in labels)} FROM tickets ORDER BY rowid",
+            conn,
+        )
+        conn.rollback()
+    finally:
+        conn.close()
+    return version, df, labels
+
+
+def build_features(db_filename=DB_FILENAME, config=None, store_dir=STORE_DIR, rebuild=False):
+    """Vectorize the tickets and save the entry for (config, current database version); returns its path
+
+    Does nothing if that entry already exists (unless rebuild). The entry is
+    written to a temporary directory and renamed into place, so readers never
+    see a half-written one.
+    """
+    from similar_tickets import ticket_text
+
+    version = current_version(db_filename)
+    path = os.path.join(store_dir, feature_key(config, version, db_filename))
+    if not rebuild and _is_entry_for(path, db_filename, version):
+        return path
+
+    started = time.perf_counter()
+    version, df, labels = _read_tickets(db_filename)
+    path = os.path.join(store_dir, feature_key(config, version, db_filename))
+    vectorizer = make_vectorizer(config)
+    X = vectorizer.fit_transform(ticket_text(df))
+
+    os.makedirs(store_dir, exist_ok=True)
+    workdir = tempfile.mkdtemp(prefix='.building-', dir=store_dir)
+    try:
+        save_matrix(workdir, X)
+        np.save(os.path.join(workdir, ROWIDS_FILE), df['rowid'].to_numpy(dtype=np.int64))
+        os.makedirs(os.path.join(workdir, LABELS_DIR))
+        classes = {}
+        for name in labels:
+            # Integer codes, -1 for NULL; the names are in meta.json
+            codes, uniques = pd.factorize(df[name], sort=True)
+            np.save(os.path.join(workdir, LABELS_DIR, f"{name}.npy"), codes.astype(np.int32))
+            classes[name] = [str(value) for value in uniques]
+        with open(os.path.join(workdir, VECTORIZER_FILE), 'wb') as f:
+            pickle.dump(vectorizer, f)
+        meta = {
+            'key': os.path.basename(path),
+            'db_filename': os.path.abspath(db_filename),
+            'db_version': version,
+            'config': vectorizer_config(config),
+            'rows': X.shape[0],
+            'terms': X.shape[1],
+            'nnz': int(X.nnz),
+            'classes': classes,
+            'build_seconds': round(time.perf_counter() - started, 3),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        with open(os.path.join(workdir, META_FILE), 'w') as f:
+            json.dump(meta, f, indent=2)
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.replace(workdir, path)
+    except BaseException:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+    return path
+
+
+def open_features(path):
+    """Open a stored entry memory-mapped
+
+    Returns {'X', 'rowids', 'labels': {column: codes}, 'classes': {column:
+    names}, 'meta', 'path'}. Label codes index into classes; -1 is NULL.
+    """
+    with open(os.path.join(path, META_FILE)) as f:
+        meta = json.load(f)
+    return {
+        'X': load_matrix(path),
+        'rowids': np.load(os.path.join(path, ROWIDS_FILE), mmap_mode='r'),
+        'labels': {name: np.load(os.path.join(path, LABELS_DIR, f"{name}.npy"), mmap_mode='r')
+                   for name in meta['classes']},
+        'classes': meta['classes'],
+        'meta': meta,
+        'path': path,
+    }
+
+
+def load_features(db_filename=DB_FILENAME, config=None, store_dir=STORE_DIR, build=True):
+    """Features for config at the current database version, building them first if needed"""
+    version = current_version(db_filename)
+    path = os.path.join(store_dir, feature_key(config, version, db_filename))
+    if not _is_entry_for(path, db_filename, version):
+        if not build:
+            raise FileNotFoundError(f"No features for this config and database version in {store_dir}")
+        path = build_features(db_filename, config, store_dir)
+    return open_features(path)
+
+
+def load_vectorizer(features):
+    """The fitted vectorizer of an entry, to transform new text into the same feature space"""
+    with open(os.path.join(features['path'], VECTORIZER_FILE), 'rb') as f:
+        return pickle.load(f)
+
+
+def list_features(store_dir=STORE_DIR):
+    """meta.json of every entry in the store, newest first"""
+    if not os.path.isdir(store_dir):
+        return []
+    entries = []
+    for key in os.listdir(store_dir):
+        meta_path = os.path.join(store_dir, key, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                entries.append(json.load(f))
+    return sorted(entries, key=lambda meta: meta['created_at'], reverse=True)
+
+
+def prune_features(db_filename=DB_FILENAME, store_dir=STORE_DIR):
+    """Remove entries of db_filename built from an older database version; returns the keys removed"""
+    current = current_version(db_filename)
+    removed = []
+    for meta in list_features(store_dir):
+        if meta['db_filename'] == os.path.abspath(db_filename) and meta['db_version'] != current:
+            shutil.rmtree(os.path.join(store_dir, meta['key']))
+            removed.append(meta['key'])
+    return removed
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else 'build'
+    db_file = sys.argv[2] if len(sys.argv) > 2 else DB_FILENAME
+    if command == 'build':
+        started = time.perf_counter()
+        features = open_features(build_features(db_file))
+        print(f"✅ {features['meta']['rows']:,} tickets x {features['meta']['terms']:,} terms "
+              f"in {features['path']} ({time.perf_counter() - started:.1f}s)")
+    elif command == 'list':
+        for meta in list_features():
+            print(f"📦 {meta['key']}  {meta['rows']:>9,} rows  {meta['terms']:>8,} terms  "
+                  f"db {meta['db_version']}  {meta['created_at']}")
+    elif command == 'prune':
+        print(f"🧹 Removed {len(prune_features(db_file))} stale feature sets")
+    else:
+        print("Usage: python feature_store.py build|list|prune [db]")
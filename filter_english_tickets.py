@@ -1,33 +1,58 @@
 """
 Filter the multilingual customer support tickets to keep only English ones
+
+Each pipeline stage (load, filter, dedup, CSV and SQLite save, near-duplicate
+clustering, analysis, sample queries) is timed with wall and CPU time, the
+tracemalloc peak and its row count. The run ends with a console summary and
+a JSON report (--report, default ingest_report.json); --no-memory skips
+tracemalloc, which slows allocation-heavy stages.
+
+The database is written in the normalized layout (ticket_schema: integer ids
+into lookup tables behind a `tickets` view); --flat-schema keeps the plain
+pandas table. --compress-bodies also moves the bodies into compressed
+storage (body_store).
 """
+import argparse
+import contextlib
 import pandas as pd
 import sqlite3
 import os
 from collections import Counter
 import re
 
-def filter_english_tickets():
+from body_store import compress_bodies, register_body_functions
+from change_feed import reset_checkpoints
+from ticket_schema import (count_by_sql, drop_tickets, group_by_sql, normalize_tickets, record_ingest,
+                           view_columns)
+from near_duplicates import update_near_duplicates, duplicate_summary
+
+DATASET_FILENAME = 'dataset-tickets-multi-lang-4-20k.csv'
+CSV_FILENAME = 'english_support_tickets.csv'
+DB_FILENAME = 'english_support_tickets.db'
+REPORT_FILENAME = 'ingest_report.json'
+# Set by the script entry point; None means stages are not measured
+METRICS = None
+
+def _stage(name):
+    """METRICS.stage(name), or a no-op block yielding a throwaway record"""
+    return METRICS.stage(name) if METRICS else contextlib.nullcontext({})
+
+def filter_english_tickets(csv_file=DATASET_FILENAME):
     """Filter dataset to keep only English tickets"""
     
     print("🔍 Looking for dataset files...")
     
-    # Look for CSV files in current directory
-    csv_files = [f for f in os.listdir(".") if f.endswith('.csv') and 'dataset-tickets' in f]
-    
-    if not csv_files:
-        print("❌ No dataset CSV files found")
+    # Defaults to the largest multilingual file (17.9 MB)
+    if not os.path.exists(csv_file):
+        print(f"❌ Dataset file not found: {csv_file}")
         return None
     
-    print(f"📊 Found CSV files: {csv_files}")
-    
-    # Use the largest multilingual file
-    csv_file = "dataset-tickets-multi-lang-4-20k.csv"  # 17.9 MB - largest one
-    
     print(f"📊 Loading dataset: {csv_file}")
     
     # Load the full dataset
-    df = pd.read_csv(csv_file)
+    with _stage('load') as stage:
+        df = pd.read_csv(csv_file)
+        stage['rows'] = len(df)
     print(f"   Total tickets: {len(df):,}")
     print(f"   Columns: {list(df.columns)}")
     
@@ -60,11 +85,13 @@ def filter_english_tickets():
     english_variations = ['en', 'EN', 'english', 'English', 'ENGLISH']
     english_df = pd.DataFrame()
     
-    for variation in english_variations:
-        temp_df = df[df[lang_col] == variation]
-        if len(temp_df) > 0:
-            english_df = pd.concat([english_df, temp_df])
-            print(f"   Found {len(temp_df):,} tickets with language '{variation}'")
+    with _stage('filter') as stage:
+        for variation in english_variations:
+            temp_df = df[df[lang_col] == variation]
+            if len(temp_df) > 0:
+                english_df = pd.concat([english_df, temp_df])
+                print(f"   Found {len(temp_df):,} tickets with language '{variation}'")
+        stage['rows'] = len(english_df)
     
     if len(english_df) == 0:
         print("❌ No English tickets found!")
@@ -72,29 +99,54 @@ def filter_english_tickets():
         return None
     
     # Remove duplicates if any
-    english_df = english_df.drop_duplicates()
+    with _stage('dedup') as stage:
+        english_df = english_df.drop_duplicates()
+        stage['rows'] = len(english_df)
     
     print(f"\n🇺🇸 English tickets: {len(english_df):,}")
     print(f"   Filtered out: {len(df) - len(english_df):,} non-English tickets")
     
     return english_df
 
-def save_english_tickets(df):
+def save_english_tickets(df, csv_filename=CSV_FILENAME, db_filename=DB_FILENAME, normalize=True,
+                         compress=False):
     """Save English-only tickets to new files"""
     
     print(f"\n💾 Saving English-only dataset...")
     
     # Save as CSV
-    csv_filename = "english_support_tickets.csv"
-    df.to_csv(csv_filename, index=False)
+    with _stage('save_csv') as stage:
+        df.to_csv(csv_filename, index=False)
+        stage['rows'] = len(df)
     print(f"✅ Saved to: {csv_filename}")
     
     # Save to SQLite database
-    db_filename = "english_support_tickets.db"
-    conn = sqlite3.connect(db_filename)
-    df.to_sql('tickets', conn, if_exists='replace', index=False)
+    with _stage('save_sqlite') as stage:
+        conn = sqlite3.connect(db_filename)
+        # Removes either layout; to_sql cannot replace the normalized view
+        with conn:
+            drop_tickets(conn)
+        df.to_sql('tickets', conn, if_exists='replace', index=False)
+        # New table, new rowids: every change-feed consumer starts over, and
+        # the new ingest id retires features built from the old rows
+        with conn:
+            reset_checkpoints(conn)
+            record_ingest(conn)
+        stage['rows'] = len(df)
+    if normalize:
+        with _stage('normalize') as stage:
+            stage['rows'] = normalize_tickets(conn)
+    if compress:
+        with _stage('compress_bodies') as stage:
+            stage['rows'] = compress_bodies(conn)
+    if normalize or compress:
+        # The dropped flat table and body column stay on the freelist and in
+        # ticket_rows' pages until a VACUUM rewrites the file
+        with _stage('vacuum') as stage:
+            conn.execute("VACUUM")
+            stage['rows'] = len(df)
     conn.close()
-    print(f"✅ Saved to database: {db_filename}")
+    print(f"✅ Saved to database: {db_filename} ({os.path.getsize(db_filename) / 1e6:,.1f} MB)")
     
     return csv_filename, db_filename
 
@@ -144,12 +196,11 @@ def run_sample_queries(db_filename):
     print("🔍 SAMPLE QUERIES ON ENGLISH TICKETS")
     print("="*50)
     
-    conn = sqlite3.connect(db_filename)
+    conn = register_body_functions(sqlite3.connect(db_filename))
     cursor = conn.cursor()
     
     # Get column info
-    cursor.execute("PRAGMA table_info(tickets)")
-    columns = [col[1] for col in cursor.fetchall()]
+    columns = [name for name, _ in view_columns(conn)]
     print(f"📋 Available columns: {columns}")
     
     # Sample queries
@@ -159,7 +210,7 @@ def run_sample_queries(db_filename):
     
     # Add language query if column exists
     if 'language' in columns:
-        queries.append("SELECT language, COUNT(*) FROM tickets GROUP BY language")
+        queries.append(count_by_sql(conn, 'language', 'count'))
     
     # Add category query if column exists
     if 'category' in columns:
@@ -167,7 +218,7 @@ def run_sample_queries(db_filename):
     
     # Add priority query if column exists  
     if 'priority' in columns:
-        queries.append("SELECT priority, COUNT(*) as count FROM tickets GROUP BY priority ORDER BY count DESC")
+        queries.append(count_by_sql(conn, 'priority', 'count'))
     
     for query in queries:
         print(f"\n🔎 Query: {query}")
@@ -186,8 +237,8 @@ def run_sample_queries(db_filename):
 def connect_to_database():
     """Connect to the English support tickets database"""
     try:
-        conn = sqlite3.connect('english_support_tickets.db')
-        return conn
+        conn = sqlite3.connect(DB_FILENAME)
+        return register_body_functions(conn)
     except Exception as e:
         print(f"❌ Error connecting to database: {e}")
         return None
@@ -237,13 +288,7 @@ def question_1_priority_analysis():
         return
     
     try:
-        query = """
-        SELECT priority, COUNT(*) as ticket_count
-        FROM tickets 
-        WHERE priority IS NOT NULL 
-        GROUP BY priority 
-        ORDER BY ticket_count DESC
-        """
+        query = count_by_sql(conn, 'priority')
         
         df = pd.read_sql_query(query, conn)
         
@@ -411,16 +456,12 @@ def question_4_priority_vs_length():
         return
     
     try:
-        query = """
-        SELECT 
-            priority,
-            AVG(LENGTH(body)) as avg_length,
-            COUNT(*) as ticket_count
-        FROM tickets 
-        WHERE body IS NOT NULL AND body != '' AND priority IS NOT NULL
-        GROUP BY priority
-        ORDER BY avg_length DESC
-        """
+        # Grouped on the priority ids when the database is normalized
+        query = group_by_sql(
+            conn, 'priority',
+            {'avg_length': 'AVG(LENGTH(body))', 'ticket_count': 'COUNT(*)'},
+            where="body IS NOT NULL AND body != ''", order_by='avg_length DESC', uses=('body',),
+        )
         
         df = pd.read_sql_query(query, conn)
         
@@ -464,9 +505,7 @@ def question_5_ticket_patterns():
     
     try:
         # Get all available columns
-        cursor = conn.cursor()
-        cursor.execute("PRAGMA table_info(tickets)")
-        columns = [col[1] for col in cursor.fetchall()]
+        columns = [name for name, _ in view_columns(conn)]
         
         print(f"🔍 Exploring patterns in available data:")
         print("-" * 50)
@@ -476,7 +515,7 @@ def question_5_ticket_patterns():
         for col in columns:
             if col not in ['body']:  # Skip text columns
                 try:
-                    query = f"SELECT COUNT(DISTINCT {col}) as unique_count FROM tickets WHERE {col} IS NOT NULL"
+                    query = f"SELECT COUNT(*) as unique_count FROM ({count_by_sql(conn, col, 'count')})"
                     result = pd.read_sql_query(query, conn)
                     unique_count = result['unique_count'].iloc[0]
                     
@@ -489,14 +528,7 @@ def question_5_ticket_patterns():
         # Show distribution of categorical columns
         for col in categorical_columns[:3]:  # Limit to first 3
             try:
-                query = f"""
-                SELECT {col}, COUNT(*) as count 
-                FROM tickets 
-                WHERE {col} IS NOT NULL 
-                GROUP BY {col} 
-                ORDER BY count DESC 
-                LIMIT 5
-                """
+                query = f"{count_by_sql(conn, col, 'count')} LIMIT 5"
                 df = pd.read_sql_query(query, conn)
                 
                 if not df.empty:
@@ -519,7 +551,7 @@ def main():
     
     # Check database
     try:
-        conn = sqlite3.connect('english_support_tickets.db')
+        conn = register_body_functions(sqlite3.connect(DB_FILENAME))
         cursor = conn.cursor()
         cursor.execute("SELECT COUNT(*) FROM tickets")
         total_records = cursor.fetchone()[0]
@@ -549,6 +581,16 @@ def main():
     print("• Data structure is suitable for ML classification projects")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Filter the ticket dataset to English tickets")
+    parser.add_argument('--report', default=REPORT_FILENAME, help='JSON stage report (default: %(default)s)')
+    parser.add_argument('--no-memory', action='store_true', help='skip tracemalloc peak measurement')
+    parser.add_argument('--flat-schema', action='store_true', help='store a plain tickets table (no lookup tables)')
+    parser.add_argument('--compress-bodies', action='store_true', help='store ticket bodies compressed')
+    args = parser.parse_args()
+    
+    from stage_metrics import StageMetrics
+    METRICS = StageMetrics(trace_memory=not args.no_memory)
+    
     print("🇺🇸 Filtering dataset for English tickets only...")
     
     # Filter for English tickets
@@ -556,16 +598,27 @@ if __name__ == "__main__":
     
     if english_df is not None:
         # Save the filtered dataset
-        csv_file, db_file = save_english_tickets(english_df)
+        csv_file, db_file = save_english_tickets(english_df, normalize=not args.flat_schema,
+                                                 compress=args.compress_bodies)
+        
+        # Cluster near-duplicate resubmissions (table was replaced, so rebuild)
+        with _stage('near_duplicates') as stage:
+            update_near_duplicates(db_file, rebuild=True)
+            stage['rows'] = len(english_df)
+        duplicate_summary(db_file)
         
         # Analyze the English tickets
-        analyze_english_tickets(english_df)
+        with _stage('analysis') as stage:
+            analyze_english_tickets(english_df)
+            stage['rows'] = len(english_df)
         
         # Run sample queries
-        run_sample_queries(db_file)
+        with _stage('sample_queries'):
+            run_sample_queries(db_file)
         
         # Run corrected analysis
-        main()
+        with _stage('questions'):
+            main()
         
         print(f"\n🎉 English ticket filtering complete!")
         print(f"📁 Files created:")
@@ -574,4 +627,10 @@ if __name__ == "__main__":
         print(f"\n📊 Summary: {len(english_df):,} English tickets ready for analysis!")
         
     else:
-        print("❌ Could not filter English tickets. Check dataset format.")
\ No newline at end of file
+        print("❌ Could not filter English tickets. Check dataset format.")
+    
+    METRICS.close()
+    if METRICS.stages:
+        METRICS.print_summary()
+        METRICS.write_json(args.report)
+        print(f"📄 Stage report: {args.report}")
\ No newline at end of file
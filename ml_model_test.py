@@ -1,39 +1,46 @@
 """
 Simple HuggingFace model test using a lightweight text classification model.
 This uses distilbert-base-uncased-finetuned-sst-2-english which is relatively small (~250MB).
+
+Pass --quantize to also run the model with dynamic int8 quantization of its
+linear layers and compare accuracy and speed against the fp32 baseline.
 """
 
-from transformers import pipeline
-import torch
+import copy
+import sys
+import time
+
+MODEL_NAME = "distilbert-base-uncased-finetuned-sst-2-english"
+
+# Test sentences
+TEST_TEXTS = [
+    "I love using machine learning models!",
+    "This assignment is challenging but interesting.",
+    "The weather is terrible today.",
+    "Python makes AI development so much easier.",
+    "I'm not sure about this approach."
+]
 
 def test_sentiment_model():
     """Test a pre-trained sentiment analysis model from HuggingFace."""
+    from transformers import pipeline
     
     print("Loading sentiment analysis model...")
-    print("Model: distilbert-base-uncased-finetuned-sst-2-english")
+    print(f"Model: {MODEL_NAME}")
     
     # Create a sentiment analysis pipeline
     # This model is small and good for testing
     classifier = pipeline(
         "sentiment-analysis",
-        model="distilbert-base-uncased-finetuned-sst-2-english",
+        model=MODEL_NAME,
         return_all_scores=True
     )
     
-    # Test sentences
-    test_texts = [
-        "I love using machine learning models!",
-        "This assignment is challenging but interesting.",
-        "The weather is terrible today.",
-        "Python makes AI development so much easier.",
-        "I'm not sure about this approach."
-    ]
-    
     print("\n" + "="*50)
     print("SENTIMENT ANALYSIS RESULTS")
     print("="*50)
     
-    for text in test_texts:
+    for text in TEST_TEXTS:
         result = classifier(text)
         
         print(f"\nText: '{text}'")
@@ -47,23 +54,164 @@ def test_sentiment_model():
         top_prediction = max(result[0], key=lambda x: x['score'])
         print(f"  → Top prediction: {top_prediction['label']}")
 
+def quantize_model(model):
+    """Return an int8 copy of the model with dynamically quantized linear layers.
+
+    The original fp32 model is left untouched so both can be compared.
+    """
+    import torch
+
+    fp32_copy = copy.deepcopy(model).eval()
+    return torch.quantization.quantize_dynamic(
+        fp32_copy, {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+def build_random_model(seed=0, vocab_size=1000, num_labels=2):
+    """Build a small randomly initialized DistilBERT classifier for offline testing."""
+    import torch
+    from transformers import DistilBertConfig, DistilBertForSequenceClassification
+
+    torch.manual_seed(seed)
+    config = DistilBertConfig(
+        vocab_size=vocab_size,
+        dim=64,
+        n_layers=2,
+        n_heads=2,
+        hidden_dim=128,
+        max_position_embeddings=128,
+        num_labels=num_labels,
+    )
+    return DistilBertForSequenceClassification(config).eval()
+
+def predict_probabilities(model, inputs, batch_size=32):
+    """Run the model over tokenized inputs and return class probabilities."""
+    import torch
+
+    num_rows = inputs["input_ids"].shape[0]
+    batches = []
+    with torch.inference_mode():
+        for start in range(0, num_rows, batch_size):
+            batch = {key: value[start:start + batch_size] for key, value in inputs.items()}
+            logits = model(**batch).logits
+            batches.append(torch.softmax(logits, dim=-1))
+    return torch.cat(batches)
+
+def compare_accuracy(fp32_model, int8_model, inputs, labels=None):
+    """Compare int8 predictions against the fp32 baseline.
+
+    Reports how often the two models agree on the top class, how far their
+    probabilities drift, and (when labels are given) the accuracy of each.
+    """
+    import torch
+
+    fp32_probs = predict_probabilities(fp32_model, inputs)
+    int8_probs = predict_probabilities(int8_model, inputs)
+    fp32_preds = fp32_probs.argmax(dim=-1)
+    int8_preds = int8_probs.argmax(dim=-1)
+    prob_diff = (fp32_probs - int8_probs).abs()
+
+    report = {
+        "agreement": (fp32_preds == int8_preds).float().mean().item(),
+        "mean_abs_prob_diff": prob_diff.mean().item(),
+        "max_abs_prob_diff": prob_diff.max().item(),
+    }
+    if labels is not None:
+        labels = torch.as_tensor(labels)
+        report["fp32_accuracy"] = (fp32_preds == labels).float().mean().item()
+        report["int8_accuracy"] = (int8_preds == labels).float().mean().item()
+    return report
+
+def benchmark_model(model, inputs, batch_size=8, repeats=5, warmup=1):
+    """Measure per-batch latency and rows/sec throughput for a model."""
+    import torch
+
+    num_rows = inputs["input_ids"].shape[0]
+    latencies = []
+    with torch.inference_mode():
+        for run in range(warmup + repeats):
+            for start in range(0, num_rows, batch_size):
+                batch = {key: value[start:start + batch_size] for key, value in inputs.items()}
+                started = time.perf_counter()
+                model(**batch)
+                if run >= warmup:
+                    latencies.append(time.perf_counter() - started)
+
+    latencies.sort()
+    total_time = sum(latencies)
+    return {
+        "batches": len(latencies),
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+        "rows_per_sec": (num_rows * repeats) / total_time if total_time else float("inf"),
+    }
+
+def compare_quantized_inference(model, inputs, labels=None, batch_size=8, repeats=5):
+    """Quantize a model and report accuracy drift and speedup against fp32."""
+    int8_model = quantize_model(model)
+    accuracy = compare_accuracy(model, int8_model, inputs, labels)
+    fp32_bench = benchmark_model(model, inputs, batch_size, repeats)
+    int8_bench = benchmark_model(int8_model, inputs, batch_size, repeats)
+    return {
+        "accuracy": accuracy,
+        "fp32": fp32_bench,
+        "int8": int8_bench,
+        "speedup": int8_bench["rows_per_sec"] / fp32_bench["rows_per_sec"],
+    }
+
+def print_quantization_report(report):
+    """Print the fp32 vs int8 comparison produced by compare_quantized_inference."""
+    print("\n" + "="*50)
+    print("DYNAMIC INT8 QUANTIZATION REPORT")
+    print("="*50)
+
+    accuracy = report["accuracy"]
+    print(f"Top-class agreement with fp32: {accuracy['agreement']*100:.2f}%")
+    print(f"Mean |prob diff|: {accuracy['mean_abs_prob_diff']:.4f}")
+    print(f"Max  |prob diff|: {accuracy['max_abs_prob_diff']:.4f}")
+    if "fp32_accuracy" in accuracy:
+        print(f"Accuracy fp32: {accuracy['fp32_accuracy']*100:.2f}%  int8: {accuracy['int8_accuracy']*100:.2f}%")
+
+    print(f"\n{'Mode':<6} {'p50 ms':>10} {'p95 ms':>10} {'rows/sec':>12}")
+    for mode in ("fp32", "int8"):
+        bench = report[mode]
+        print(f"{mode:<6} {bench['p50_ms']:>10.2f} {bench['p95_ms']:>10.2f} {bench['rows_per_sec']:>12.1f}")
+    print(f"\nSpeedup: {report['speedup']:.2f}x")
+
+def run_quantized_sentiment_comparison(batch_size=8, repeats=5):
+    """Compare the pre-trained sentiment model in fp32 and dynamic int8."""
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    print("\nLoading model for quantized comparison...")
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+    model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME).eval()
+    inputs = tokenizer(TEST_TEXTS, padding=True, truncation=True, return_tensors="pt")
+
+    report = compare_quantized_inference(model, dict(inputs), batch_size=batch_size, repeats=repeats)
+    print_quantization_report(report)
+    return report
+
 def check_system_info():
     """Display system information for debugging."""
+    import torch
+
     print("SYSTEM INFORMATION")
     print("="*30)
     print(f"PyTorch version: {torch.__version__}")
     print(f"CUDA available: {torch.cuda.is_available()}")
     if torch.cuda.is_available():
         print(f"CUDA device: {torch.cuda.get_device_name()}")
+    print(f"Quantized engine: {torch.backends.quantized.engine}")
     print()
 
 if __name__ == "__main__":
     try:
         check_system_info()
         test_sentiment_model()
+        if "--quantize" in sys.argv[1:]:
+            run_quantized_sentiment_comparison()
         print("\n✅ Model test completed successfully!")
         
     except Exception as e:
         print(f"\n❌ Error occurred: {e}")
         print("\nMake sure you have the required packages installed:")
-        print("pip install transformers torch")
\ No newline at end of file
+        print("pip install transformers torch")
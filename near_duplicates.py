@@ -0,0 +1,303 @@
+"""
+Detect near-duplicate support tickets with MinHash signatures and LSH banding.
+
+Each ticket body is split into word shingles, summarised as a MinHash
+signature, and the signature is cut into bands. Tickets that share a band
+bucket are candidates, and a candidate is accepted when the estimated Jaccard
+similarity of the two signatures passes the threshold. Only candidate pairs
+are compared, so the work grows with the number of tickets rather than the
+number of pairs.
+
+Results are stored next to the tickets table:
+- ticket_clusters:    cluster_id for every processed ticket rowid
+- ticket_minhash:     signatures of cluster representatives
+- ticket_lsh_buckets: (bucket, rowid) band buckets of cluster representatives
+
+Only representatives are indexed in the bucket table, so a ticket resubmitted
+hundreds of times still occupies a single bucket entry per band. Both tables
+are kept compact: signatures are stored as the low 16 bits of each MinHash
+value (two unrelated values agree by chance once in 65,536, which does not
+move the similarity estimate), and each band bucket is a 32-bit key that
+also encodes the band, held in a single WITHOUT ROWID table whose primary
+key is the lookup index. Runs are incremental: only tickets with a rowid
+above the last processed one are read.
+"""
+import re
+import sqlite3
+import zlib
+
+import numpy as np
+
+from body_store import register_body_functions
+from ticket_schema import view_columns
+
+DB_FILENAME = 'english_support_tickets.db'
+
+NUM_PERM = 128
+NUM_BANDS = 16
+SHINGLE_SIZE = 3
+THRESHOLD = 0.8
+CHUNK_SIZE = 50_000
+SEED = 42
+# Stored signature slots keep the low 16 bits of each MinHash value
+SIGNATURE_DTYPE = np.uint16
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+_MASK_64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def shingle_hashes(text, k=SHINGLE_SIZE):
+    """Return the unique 32-bit hashes of the k-word shingles of a text"""
+    words = _WORD_RE.findall(str(text).lower())
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    if len(words) <= k:
+        shingles = [' '.join(words)]
+    else:
+        shingles = [' '.join(words[i:i + k]) for i in range(len(words) - k + 1)]
+    hashes = {zlib.crc32(s.encode('utf-8')) for s in shingles}
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+
+def make_permutations(num_perm=NUM_PERM, seed=SEED):
+    """Create the multiply-shift hash parameters used for every signature"""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signature(hashes, permutations):
+    """Compute the MinHash signature (uint32 per permutation) of shingle hashes"""
+    a, b = permutations
+    if len(hashes) == 0:
+        return np.full(len(a), np.iinfo(np.uint32).max, dtype=np.uint32)
+    with np.errstate(over='ignore'):
+        mixed = (a[:, None] * hashes[None, :] + b[:, None]) & _MASK_64
+    return (mixed >> np.uint64(32)).min(axis=1).astype(np.uint32)
+
+
+def band_buckets(signatures, num_bands=NUM_BANDS):
+    """Hash each band of each signature to a signed 32-bit bucket key
+
+    The band number is part of the hash, so keys of different bands do not
+    meet in the shared bucket table. A chance collision of two keys only adds
+    a candidate, which the signature comparison then rejects.
+    """
+    signatures = np.atleast_2d(signatures)
+    num_docs, num_perm = signatures.shape
+    if num_perm % num_bands:
+        raise ValueError(f"num_perm ({num_perm}) must be divisible by num_bands ({num_bands})")
+    rows = num_perm // num_bands
+    bands = signatures.reshape(num_docs, num_bands, rows).astype(np.uint64)
+
+    keys = np.full((num_docs, num_bands), 0xCBF29CE484222325, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        keys = (keys ^ np.arange(num_bands, dtype=np.uint64)) * np.uint64(0x100000001B3)
+        for r in range(rows):
+            keys = (keys ^ bands[:, :, r]) * np.uint64(0x100000001B3)
+    folded = (keys ^ (keys >> np.uint64(32))) & np.uint64(0xFFFFFFFF)
+    return folded.astype(np.uint32).view(np.int32)
+
+
+def estimated_jaccard(sig_a, sig_b):
+    """Estimate Jaccard similarity as the fraction of matching signature slots"""
+    return float(np.mean(sig_a == sig_b))
+
+
+def create_duplicate_tables(conn):
+    """Create the cluster, signature and bucket tables if they are missing"""
+    # Named columns: the tickets view already has a rowid column, so t.* would repeat it
+    columns = ''.join(', t."{}"'.format(name.replace('"', '""')) for name, _ in view_columns(conn))
+    conn.executescript(f"""
+        CREATE TABLE IF NOT EXISTS ticket_clusters (
+            rowid INTEGER PRIMARY KEY,
+            cluster_id INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_ticket_clusters_cluster
+            ON ticket_clusters (cluster_id);
+        CREATE TABLE IF NOT EXISTS ticket_minhash (
+            rowid INTEGER PRIMARY KEY,
+            signature BLOB NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS ticket_lsh_buckets (
+            bucket INTEGER NOT NULL,
+            rowid INTEGER NOT NULL,
+            PRIMARY KEY (bucket, rowid)
+        ) WITHOUT ROWID;
+        CREATE VIEW IF NOT EXISTS unique_tickets AS
+            SELECT t.rowid AS rowid{columns}
+            FROM tickets t
+            JOIN ticket_clusters c ON c.rowid = t.rowid
+            WHERE c.cluster_id = c.rowid;
+    """)
+
+
+def reset_duplicate_tables(conn):
+    """Drop all stored dedup state, e.g. after the tickets table was replaced"""
+    conn.executescript("""
+        DROP VIEW IF EXISTS unique_tickets;
+        DROP TABLE IF EXISTS ticket_clusters;
+        DROP TABLE IF EXISTS ticket_minhash;
+        DROP TABLE IF EXISTS ticket_lsh_buckets;
+        DROP TABLE IF EXISTS ticket_lsh_bands;
+    """)
+
+
+def has_legacy_tables(conn):
+    """True for state written before the compact layout (64-bit band rows, 32-bit signatures)"""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'ticket_lsh_bands'"
+    ).fetchone() is not None
+
+
+def _existing_candidates(conn, rowids, buckets):
+    """Find indexed representatives sharing a band bucket with the chunk"""
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS chunk_buckets (rowid INTEGER, bucket INTEGER)")
+    conn.execute("DELETE FROM chunk_buckets")
+    conn.executemany(
+        "INSERT INTO chunk_buckets VALUES (?, ?)",
+        ((int(rowid), int(bucket)) for rowid, row_buckets in zip(rowids, buckets) for bucket in row_buckets),
+    )
+    pairs = conn.execute("""
+        SELECT DISTINCT c.rowid, b.rowid
+        FROM chunk_buckets c
+        JOIN ticket_lsh_buckets b ON b.bucket = c.bucket
+    """).fetchall()
+
+    candidates = {}
+    for new_rowid, rep_rowid in pairs:
+        candidates.setdefault(new_rowid, []).append(rep_rowid)
+
+    rep_ids = sorted({rep for _, rep in pairs})
+    signatures = {}
+    for start in range(0, len(rep_ids), 900):
+        batch = rep_ids[start:start + 900]
+        placeholders = ','.join('?' * len(batch))
+        for rowid, blob in conn.execute(
+            f"SELECT rowid, signature FROM ticket_minhash WHERE rowid IN ({placeholders})", batch
+        ):
+            signatures[rowid] = np.frombuffer(blob, dtype=SIGNATURE_DTYPE)
+    return candidates, signatures
+
+
+def _process_chunk(conn, rows, permutations, num_bands, threshold):
+    """Assign cluster ids to one chunk of (rowid, body) rows"""
+    rowids = [rowid for rowid, _ in rows]
+    hashes = [shingle_hashes(body) for _, body in rows]
+    signatures = np.vstack([minhash_signature(h, permutations) for h in hashes])
+    buckets = band_buckets(signatures, num_bands)
+    # Compared in the stored width, so new and stored signatures agree slot for slot
+    signatures = signatures.astype(SIGNATURE_DTYPE)
+
+    # Representatives are their own cluster id, so a match gives the cluster directly
+    candidates, rep_signatures = _existing_candidates(conn, rowids, buckets)
+
+    local_buckets = {}
+    clusters = []
+    new_reps = []
+    for i, rowid in enumerate(rowids):
+        cluster_id = None
+        if len(hashes[i]) > 0:
+            row_candidates = set(candidates.get(rowid, []))
+            for bucket in buckets[i]:
+                row_candidates.update(local_buckets.get(int(bucket), ()))
+            for rep in sorted(row_candidates):
+                if estimated_jaccard(signatures[i], rep_signatures[rep]) >= threshold:
+                    cluster_id = rep
+                    break
+
+            if cluster_id is None:
+                cluster_id = rowid
+                rep_signatures[rowid] = signatures[i]
+                new_reps.append(i)
+                for bucket in buckets[i]:
+                    local_buckets.setdefault(int(bucket), []).append(rowid)
+        else:
+            # Empty bodies have nothing to compare, so they stay singletons and are not indexed
+            cluster_id = rowid
+        clusters.append((rowid, cluster_id))
+
+    conn.executemany("INSERT OR REPLACE INTO ticket_clusters (rowid, cluster_id) VALUES (?, ?)", clusters)
+    conn.executemany(
+        "INSERT OR REPLACE INTO ticket_minhash (rowid, signature) VALUES (?, ?)",
+        ((rowids[i], signatures[i].tobytes()) for i in new_reps),
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO ticket_lsh_buckets (bucket, rowid) VALUES (?, ?)",
+        ((int(bucket), rowids[i]) for i in new_reps for bucket in buckets[i]),
+    )
+    return sum(1 for rowid, cluster_id in clusters if rowid != cluster_id)
+
+
+def update_near_duplicates(db_filename=DB_FILENAME, rebuild=False, threshold=THRESHOLD,
+                           num_perm=NUM_PERM, num_bands=NUM_BANDS, chunk_size=CHUNK_SIZE):
+    """Cluster tickets added since the last run and store their cluster ids
+
+    Returns a dict with the number of tickets processed and how many of them
+    were assigned to an existing cluster.
+    """
+    conn = register_body_functions(sqlite3.connect(db_filename))
+    try:
+        if rebuild or has_legacy_tables(conn):
+            reset_duplicate_tables(conn)
+        create_duplicate_tables(conn)
+        conn.commit()
+
+        permutations = make_permutations(num_perm)
+        last_rowid = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM ticket_clusters").fetchone()[0]
+
+        processed = 0
+        duplicates = 0
+        while True:
+            rows = conn.execute(
+                "SELECT rowid, body FROM tickets WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (last_rowid, chunk_size),
+            ).fetchall()
+            if not rows:
+                break
+            with conn:
+                duplicates += _process_chunk(conn, rows, permutations, num_bands, threshold)
+            processed += len(rows)
+            last_rowid = rows[-1][0]
+
+        return {'processed': processed, 'duplicates': duplicates}
+    finally:
+        conn.close()
+
+
+def duplicate_summary(db_filename=DB_FILENAME, top_n=5):
+    """Print how many tickets are near-duplicates and the largest clusters"""
+    conn = sqlite3.connect(db_filename)
+    try:
+        total, clusters = conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT cluster_id) FROM ticket_clusters"
+        ).fetchone()
+        largest = conn.execute("""
+            SELECT cluster_id, COUNT(*) as size
+            FROM ticket_clusters
+            GROUP BY cluster_id
+            HAVING size > 1
+            ORDER BY size DESC
+            LIMIT ?
+        """, (top_n,)).fetchall()
+    finally:
+        conn.close()
+
+    print(f"🧬 Near-duplicate clusters:")
+    print(f"   Tickets clustered: {total:,}")
+    print(f"   Unique clusters:   {clusters:,}")
+    print(f"   Near-duplicates:   {total - clusters:,}")
+    for cluster_id, size in largest:
+        print(f"   Cluster {cluster_id}: {size:,} tickets")
+
+
+if __name__ == "__main__":
+    import sys
+
+    rebuild = '--rebuild' in sys.argv[1:]
+    print("🔍 Detecting near-duplicate tickets...")
+    result = update_near_duplicates(rebuild=rebuild)
+    print(f"✅ Processed {result['processed']:,} new tickets, "
+          f"{result['duplicates']:,} joined an existing cluster")
+    duplicate_summary()
@@ -0,0 +1,185 @@
+"""
+Bulk-score every stored ticket with a saved classifier.
+
+The tickets table is split into rowid ranges that are scored in a process
+pool. Workers only read (each with its own read-only connection) and send
+their predictions back; the parent process is the single writer and
+upserts them into ticket_predictions in batched transactions. At most
+IN_FLIGHT_PER_WORKER ranges per worker are submitted ahead of the writer,
+so the parent holds a bounded number of results however large the table. The database
+is switched to WAL journaling so the readers never block that writer.
+
+Each model is a change-feed consumer ("score:<model name>"): every write
+batch also moves its checkpoint to the last rowid range it covers, in the
+same transaction. With incremental=True only tickets above that mark are
+scored, so a rerun after new tickets arrive costs only those tickets.
+"""
+import os
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from body_store import register_body_functions
+from change_feed import get_checkpoint, set_checkpoint
+from ticket_classifier import DB_FILENAME, MODEL_FILENAME, load_classifier
+from similar_tickets import ticket_text
+
+RANGE_SIZE = 20_000
+WRITE_BATCH_SIZE = 50_000
+IN_FLIGHT_PER_WORKER = 2
+
+_worker_model = None
+
+
+def create_predictions_table(conn):
+    """Create ticket_predictions, keyed by ticket rowid and model name"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ticket_predictions (
+            rowid INTEGER NOT NULL,
+            model TEXT NOT NULL,
+            target TEXT NOT NULL,
+            label TEXT,
+            score REAL,
+            scored_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (rowid, model)
+        )
+    """)
+
+
+def rowid_ranges(db_filename, range_size=RANGE_SIZE, after_rowid=0):
+    """Split the tickets above after_rowid into inclusive (first, last) rowid ranges"""
+    conn = register_body_functions(sqlite3.connect(db_filename))
+    try:
+        low, high = conn.execute(
+            "SELECT MIN(rowid), MAX(rowid) FROM tickets WHERE rowid > ?", (after_rowid,)
+        ).fetchone()
+    finally:
+        conn.close()
+    if low is None:
+        return []
+    return [(start, min(start + range_size - 1, high)) for start in range(low, high + 1, range_size)]
+
+
+def _init_worker(model_filename):
+    """Load the classifier once per worker process"""
+    global _worker_model
+    _worker_model = load_classifier(model_filename)
+
+
+def _score_range(db_filename, first_rowid, last_rowid):
+    """Score one rowid range; returns a list of (rowid, label, score)"""
+    conn = register_body_functions(sqlite3.connect(f"file:{db_filename}?mode=ro", uri=True))
+    try:
+        df = pd.read_sql_query(
+            "SELECT rowid, subject, body FROM tickets WHERE rowid BETWEEN ? AND ?",
+            conn, params=(first_rowid, last_rowid),
+        )
+    finally:
+        conn.close()
+    if df.empty:
+        return []
+
+    classifier = _worker_model['classifier']
+    probabilities = classifier.predict_proba(ticket_text(df))
+    best = probabilities.argmax(axis=1)
+    labels = classifier.classes_[best]
+    scores = probabilities[range(len(best)), best]
+    return list(zip(df['rowid'].tolist(), labels.tolist(), scores.tolist()))
+
+
+def _write_predictions(conn, model_name, target, rows, checkpoint=None):
+    """Upsert a batch of predictions, and the model's feed checkpoint, in one transaction"""
+    with conn:
+        if checkpoint is not None:
+            set_checkpoint(conn, feed_consumer(model_name), checkpoint)
+        conn.executemany("""
+            INSERT INTO ticket_predictions (rowid, model, target, label, score)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (rowid, model) DO UPDATE SET
+                label = excluded.label,
+                score = excluded.score,
+                scored_at = CURRENT_TIMESTAMP
+        """, ((rowid, model_name, target, label, score) for rowid, label, score in rows))
+
+
+def feed_consumer(model_name):
+    """Change-feed consumer name for a model"""
+    return f"score:{model_name}"
+
+
+def score_tickets(db_filename=DB_FILENAME, model_filename=MODEL_FILENAME, workers=None,
+                  range_size=RANGE_SIZE, write_batch_size=WRITE_BATCH_SIZE, incremental=False):
+    """Score tickets in parallel and store the predictions
+
+    Scores every ticket, or with incremental=True only those added since
+    this model's last run. Returns a dict with the number of rows scored,
+    elapsed seconds and rows/sec.
+    """
+    started = time.perf_counter()
+    model_name = os.path.splitext(os.path.basename(model_filename))[0]
+    target = load_classifier(model_filename)['target']
+
+    writer = sqlite3.connect(db_filename, timeout=30)
+    writer.execute("PRAGMA journal_mode=WAL")
+    writer.execute("PRAGMA synchronous=NORMAL")
+    create_predictions_table(writer)
+    after_rowid = get_checkpoint(writer, feed_consumer(model_name)) if incremental else 0
+    writer.commit()
+
+    ranges = rowid_ranges(db_filename, range_size, after_rowid)
+    max_in_flight = (workers or os.cpu_count() or 1) * IN_FLIGHT_PER_WORKER
+    scored = 0
+    pending = []
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(model_filename,)) as pool:
+            remaining = iter(ranges)
+            in_flight = deque()
+
+            def submit_next():
+                next_range = next(remaining, None)
+                if next_range is not None:
+                    in_flight.append((next_range[1], pool.submit(_score_range, db_filename, *next_range)))
+
+            for _ in range(max_in_flight):
+                submit_next()
+            # Results are taken in range order, so everything up to this range's
+            # last rowid is covered once pending is written
+            while in_flight:
+                last, future = in_flight.popleft()
+                pending.extend(future.result())
+                # Dropped here, so the pool no longer holds this range's result
+                del future
+                submit_next()
+                if len(pending) >= write_batch_size:
+                    _write_predictions(writer, model_name, target, pending, checkpoint=last)
+                    scored += len(pending)
+                    pending = []
+        if ranges:
+            _write_predictions(writer, model_name, target, pending, checkpoint=ranges[-1][1])
+            scored += len(pending)
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    return {
+        'rows': scored,
+        'ranges': len(ranges),
+        'seconds': elapsed,
+        'rows_per_sec': scored / elapsed if elapsed else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    import sys
+
+    args = [arg for arg in sys.argv[1:] if arg != '--incremental']
+    model_file = args[0] if args else MODEL_FILENAME
+    incremental = '--incremental' in sys.argv[1:]
+    print(f"⚙️ Scoring {'new ' if incremental else ''}tickets with {model_file}...")
+    stats = score_tickets(model_filename=model_file, incremental=incremental)
+    print(f"✅ Scored {stats['rows']:,} tickets in {stats['ranges']} ranges "
+          f"({stats['seconds']:.1f}s, {stats['rows_per_sec']:,.0f} rows/sec)")
@@ -0,0 +1,166 @@
+"""
+Similar-ticket retrieval ("tickets like this one") using TF-IDF vectors.
+
+The index stores the TF-IDF matrix of subject + body transposed to a
+term-major CSR matrix (one row per term, like an inverted index), saved as
+plain .npy arrays so it can be opened memory-mapped. A query only touches
+the posting rows of the terms it contains, and batches of queries are
+scored in chunks so memory stays bounded however many queries are run.
+"""
+import os
+import pickle
+import sqlite3
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from body_store import register_body_functions
+
+DB_FILENAME = 'english_support_tickets.db'
+INDEX_DIR = 'similarity_index'
+
+VECTORIZER_FILE = 'vectorizer.pkl'
+ROWIDS_FILE = 'rowids.npy'
+MATRIX_FILES = ('data.npy', 'indices.npy', 'indptr.npy')
+SHAPE_FILE = 'shape.npy'
+
+
+def ticket_text(df):
+    """Combine subject and body into the text that gets vectorized"""
+    return df['subject'].fillna('').astype(str) + ' ' + df['body'].fillna('').astype(str)
+
+
+def build_similarity_index(db_filename=DB_FILENAME, index_dir=INDEX_DIR, max_features=200_000):
+    """Vectorize every ticket and save the term-major index to index_dir"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    conn = register_body_functions(sqlite3.connect(db_filename))
+    try:
+        df = pd.read_sql_query("SELECT rowid, subject, body FROM tickets ORDER BY rowid", conn)
+    finally:
+        conn.close()
+
+    vectorizer = TfidfVectorizer(
+        stop_words='english',
+        sublinear_tf=True,
+        max_df=0.5,
+        max_features=max_features,
+        dtype=np.float32,
+    )
+    # Rows are L2-normalized, so a dot product is the cosine similarity
+    doc_term = vectorizer.fit_transform(ticket_text(df))
+    term_doc = doc_term.T.tocsr()
+
+    os.makedirs(index_dir, exist_ok=True)
+    index_dtype = np.int32 if term_doc.nnz < np.iinfo(np.int32).max else np.int64
+    arrays = (
+        term_doc.data.astype(np.float32),
+        term_doc.indices.astype(index_dtype),
+        term_doc.indptr.astype(index_dtype),
+    )
+    for filename, array in zip(MATRIX_FILES, arrays):
+        np.save(os.path.join(index_dir, filename), array)
+    np.save(os.path.join(index_dir, SHAPE_FILE), np.array(term_doc.shape, dtype=np.int64))
+    np.save(os.path.join(index_dir, ROWIDS_FILE), df['rowid'].to_numpy(dtype=np.int64))
+    with open(os.path.join(index_dir, VECTORIZER_FILE), 'wb') as f:
+        pickle.dump(vectorizer, f)
+
+    load_similarity_index.cache_clear()
+    return {'tickets': len(df), 'terms': term_doc.shape[0], 'nnz': term_doc.nnz}
+
+
+@lru_cache(maxsize=4)
+def load_similarity_index(index_dir=INDEX_DIR):
+    """Open a saved index with its matrix arrays memory-mapped"""
+    data, indices, indptr = (
+        np.load(os.path.join(index_dir, filename), mmap_mode='r') for filename in MATRIX_FILES
+    )
+    shape = tuple(np.load(os.path.join(index_dir, SHAPE_FILE)))
+    term_doc = sparse.csr_matrix((data, indices, indptr), shape=shape, copy=False)
+    with open(os.path.join(index_dir, VECTORIZER_FILE), 'rb') as f:
+        vectorizer = pickle.load(f)
+    return {
+        'vectorizer': vectorizer,
+        'term_doc': term_doc,
+        'rowids': np.load(os.path.join(index_dir, ROWIDS_FILE), mmap_mode='r'),
+    }
+
+
+def top_k_similar(query_matrix, term_doc, k=10, chunk_size=256):
+    """Return (doc positions, scores) of the k best matches for each query row
+
+    Queries are multiplied against the term-major matrix chunk_size rows at
+    a time; only each chunk's sparse score matrix is held in memory. Rows
+    with fewer than k non-zero matches are padded with -1 / 0.0.
+    """
+    query_matrix = sparse.csr_matrix(query_matrix)
+    num_queries = query_matrix.shape[0]
+    positions = np.full((num_queries, k), -1, dtype=np.int64)
+    scores = np.zeros((num_queries, k), dtype=np.float32)
+
+    for start in range(0, num_queries, chunk_size):
+        chunk_scores = (query_matrix[start:start + chunk_size] @ term_doc).tocsr()
+        for offset in range(chunk_scores.shape[0]):
+            row_start, row_end = chunk_scores.indptr[offset], chunk_scores.indptr[offset + 1]
+            row_data = chunk_scores.data[row_start:row_end]
+            row_docs = chunk_scores.indices[row_start:row_end]
+            if len(row_data) > k:
+                best = np.argpartition(row_data, -k)[-k:]
+                row_data, row_docs = row_data[best], row_docs[best]
+            order = np.argsort(-row_data, kind='stable')
+            positions[start + offset, :len(order)] = row_docs[order]
+            scores[start + offset, :len(order)] = row_data[order]
+
+    return positions, scores
+
+
+def find_similar_tickets(text, k=10, index_dir=INDEX_DIR, exclude_rowid=None):
+    """Return [(rowid, score), ...] for the tickets most similar to a text"""
+    index = load_similarity_index(index_dir)
+    query = index['vectorizer'].transform([text])
+    positions, scores = top_k_similar(query, index['term_doc'], k + (exclude_rowid is not None))
+
+    results = []
+    for position, score in zip(positions[0], scores[0]):
+        if position < 0:
+            break
+        rowid = int(index['rowids'][position])
+        if rowid != exclude_rowid:
+            results.append((rowid, float(score)))
+    return results[:k]
+
+
+def similar_to_ticket(rowid, k=10, db_filename=DB_FILENAME, index_dir=INDEX_DIR):
+    """Return the tickets most similar to an existing ticket, excluding itself"""
+    conn = register_body_functions(sqlite3.connect(db_filename))
+    try:
+        row = conn.execute("SELECT subject, body FROM tickets WHERE rowid = ?", (rowid,)).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return []
+    text = f"{row[0] or ''} {row[1] or ''}"
+    return find_similar_tickets(text, k, index_dir, exclude_rowid=rowid)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'build':
+        print("🏗️ Building similarity index...")
+        stats = build_similarity_index()
+        print(f"✅ Indexed {stats['tickets']:,} tickets ({stats['terms']:,} terms, {stats['nnz']:,} non-zeros)")
+    elif len(sys.argv) > 1:
+        ticket_id = int(sys.argv[1])
+        load_similarity_index()
+        started = time.perf_counter()
+        matches = similar_to_ticket(ticket_id)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"🔎 Tickets similar to #{ticket_id} ({elapsed:.1f} ms):")
+        for rowid, score in matches:
+            print(f"   #{rowid:<8} {score:.3f}")
+    else:
+        print("Usage: python similar_tickets.py build | <ticket rowid>")
@@ -0,0 +1,169 @@
+"""
+Opt-in SQL profiling for sqlite3 connections.
+
+Connections opened through SQLProfiler.connect() are ordinary sqlite3
+connections (pandas.read_sql_query accepts them) whose cursors record, for
+every statement:
+
+- wall time spent executing and fetching
+- rows returned
+- the EXPLAIN QUERY PLAN output, captured on first execution of each SQL text
+
+Statements are attributed to the section that was active when they ran
+(`with profiler.section('question_1'):`). report() prints a per-section
+timing table, the slowest statements and every plan step that scans a whole
+table.
+"""
+import contextlib
+import sqlite3
+import time
+
+PLANNED_STATEMENTS = ('select', 'with')
+SLOWEST_STATEMENTS = 5
+
+
+class _ProfilingCursor(sqlite3.Cursor):
+    """Cursor that reports execute and fetch time to its connection's profiler"""
+
+    _record = None
+
+    def execute(self, sql, parameters=()):
+        profiler = self.connection.profiler
+        self._record = profiler.start_statement(sql)
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        except Exception as e:
+            self._record['error'] = str(e)
+            raise
+        finally:
+            self._record['seconds'] += time.perf_counter() - started
+            if 'error' not in self._record:
+                profiler.capture_plan(self.connection, sql, parameters)
+
+    def _timed_fetch(self, fetch, *args):
+        started = time.perf_counter()
+        result = fetch(*args)
+        if self._record is not None:
+            self._record['seconds'] += time.perf_counter() - started
+            if isinstance(result, list):
+                self._record['rows'] += len(result)
+            elif result is not None:
+                self._record['rows'] += 1
+        return result
+
+    def fetchone(self):
+        return self._timed_fetch(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._timed_fetch(super().fetchmany, size if size is not None else self.arraysize)
+
+    def fetchall(self):
+        return self._timed_fetch(super().fetchall)
+
+    def __next__(self):
+        row = self._timed_fetch(super().fetchone)
+        if row is None:
+            raise StopIteration
+        return row
+
+
+class _ProfilingConnection(sqlite3.Connection):
+    profiler = None
+
+    def cursor(self, factory=_ProfilingCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+
+class SQLProfiler:
+    """Collects statement timings and query plans across connections"""
+
+    def __init__(self):
+        self.statements = []
+        self.sections = {}
+        self.plans = {}
+        self._section = None
+
+    def connect(self, database, **kwargs):
+        """sqlite3.connect() whose statements are recorded by this profiler"""
+        conn = sqlite3.connect(database, factory=_ProfilingConnection, **kwargs)
+        conn.profiler = self
+        return conn
+
+    @contextlib.contextmanager
+    def section(self, name):
+        """Attribute statements to name and time the whole block"""
+        previous = self._section
+        self._section = name
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sections[name] = self.sections.get(name, 0.0) + time.perf_counter() - started
+            self._section = previous
+
+    def start_statement(self, sql):
+        record = {'section': self._section, 'sql': ' '.join(sql.split()), 'seconds': 0.0, 'rows': 0}
+        self.statements.append(record)
+        return record
+
+    def capture_plan(self, conn, sql, parameters=()):
+        """Store EXPLAIN QUERY PLAN details for sql, once per SQL text"""
+        key = ' '.join(sql.split())
+        if key in self.plans or not key.lower().startswith(PLANNED_STATEMENTS):
+            return
+        try:
+            # A plain cursor, so the EXPLAIN itself is not recorded
+            rows = sqlite3.Cursor(conn).execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+            self.plans[key] = [row[-1] for row in rows]
+        except sqlite3.Error:
+            self.plans[key] = []
+
+    def full_scans(self):
+        """[(sql, plan step), ...] for steps that read a whole table without an index"""
+        return [
+            (sql, step)
+            for sql, steps in self.plans.items()
+            for step in steps
+            if step.startswith('SCAN ') and ' USING ' not in step
+        ]
+
+    def section_summary(self):
+        """{section: {'seconds', 'sql_seconds', 'statements', 'rows'}} in run order"""
+        summary = {name: {'seconds': seconds, 'sql_seconds': 0.0, 'statements': 0, 'rows': 0}
+                   for name, seconds in self.sections.items()}
+        for record in self.statements:
+            entry = summary.setdefault(record['section'] or '(none)',
+                                       {'seconds': 0.0, 'sql_seconds': 0.0, 'statements': 0, 'rows': 0})
+            entry['sql_seconds'] += record['seconds']
+            entry['statements'] += 1
+            entry['rows'] += record['rows']
+        return summary
+
+    def report(self):
+        print("\n" + "="*60)
+        print("⏱️ SQL PROFILE")
+        print("="*60)
+        print(f"{'Section':<36} {'Total':>8} {'SQL':>8} {'Stmts':>6} {'Rows':>8}")
+        print("-" * 70)
+        for name, entry in self.section_summary().items():
+            print(f"{name:<36} {entry['seconds']:7.3f}s {entry['sql_seconds']:7.3f}s "
+                  f"{entry['statements']:>6} {entry['rows']:>8,}")
+
+        print(f"\n🐢 Slowest statements:")
+        for record in sorted(self.statements, key=lambda r: r['seconds'], reverse=True)[:SLOWEST_STATEMENTS]:
+            status = f"error: {record['error']}" if 'error' in record else f"{record['rows']:,} rows"
+            print(f"   {record['seconds']:7.3f}s  [{record['section']}] {record['sql'][:80]} ({status})")
+            for step in self.plans.get(record['sql'], []):
+                print(f"            plan: {step}")
+
+        scans = self.full_scans()
+        if scans:
+            print(f"\n⚠️ Full table scans ({len(scans)}):")
+            for sql, step in scans:
+                print(f"   {step}: {sql[:80]}")
+        else:
+            print("\n✅ No full table scans")
@@ -0,0 +1,91 @@
+"""
+Stage-level instrumentation for batch pipelines.
+
+Each `with metrics.stage('load') as stage:` block records wall time, CPU
+time, the tracemalloc peak reached inside the block and, when the block sets
+stage['rows'], the number of rows it produced. Stages are meant to run one
+after another (not nested), since each one resets the tracemalloc peak.
+
+The collected stages can be written as a JSON report and printed as a
+compact console table.
+"""
+import contextlib
+import json
+import platform
+import time
+import tracemalloc
+
+
+class StageMetrics:
+    """Records one entry per pipeline stage"""
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.stages = []
+        self.started_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self._started_tracing = False
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+
+        record = {'name': name, 'rows': None}
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        try:
+            yield record
+        except BaseException as e:
+            record['error'] = repr(e)
+            raise
+        finally:
+            record['wall_seconds'] = time.perf_counter() - wall_started
+            record['cpu_seconds'] = time.process_time() - cpu_started
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                record['peak_memory_bytes'] = peak
+                record['end_memory_bytes'] = current
+            self.stages.append(record)
+
+    def close(self):
+        """Stop tracemalloc if this recorder started it"""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def report(self):
+        """JSON-serialisable summary of every stage"""
+        peaks = [s['peak_memory_bytes'] for s in self.stages if 'peak_memory_bytes' in s]
+        return {
+            'started_at': self.started_at,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'total_wall_seconds': sum(s['wall_seconds'] for s in self.stages),
+            'total_cpu_seconds': sum(s['cpu_seconds'] for s in self.stages),
+            'peak_memory_bytes': max(peaks) if peaks else None,
+            'stages': self.stages,
+        }
+
+    def write_json(self, filename):
+        with open(filename, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def print_summary(self):
+        print("\n" + "="*70)
+        print("⏱️ STAGE SUMMARY")
+        print("="*70)
+        print(f"{'Stage':<18} {'Wall':>9} {'CPU':>9} {'Peak MB':>9} {'Rows':>10}")
+        print("-" * 70)
+        for s in self.stages:
+            peak = f"{s['peak_memory_bytes'] / 1e6:9.1f}" if 'peak_memory_bytes' in s else f"{'-':>9}"
+            rows = f"{s['rows']:>10,}" if s['rows'] is not None else f"{'-':>10}"
+            flag = "  ❌" if 'error' in s else ""
+            print(f"{s['name']:<18} {s['wall_seconds']:8.2f}s {s['cpu_seconds']:8.2f}s {peak} {rows}{flag}")
+        report = self.report()
+        peak = report['peak_memory_bytes']
+        print("-" * 70)
+        print(f"{'total':<18} {report['total_wall_seconds']:8.2f}s {report['total_cpu_seconds']:8.2f}s "
+              + (f"{peak / 1e6:9.1f}" if peak is not None else f"{'-':>9}"))
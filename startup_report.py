@@ -0,0 +1,78 @@
+"""
+Cold-start import report for the text-only entry points.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter,
+summarises the slowest top-level imports and checks the total against a
+fixed budget. Heavy libraries (matplotlib, torch, transformers, sklearn)
+must not be imported at all by the text-only reports.
+
+Exits non-zero when a module is over budget or pulls in a heavy library.
+"""
+import subprocess
+import sys
+
+ENTRY_POINTS = ['analyze_tickets', 'test2', 'calculations', 'ticketdb']
+HEAVY_MODULES = ('matplotlib', 'torch', 'transformers', 'sklearn')
+IMPORT_BUDGET_MS = 600
+
+
+def measure_import_time(module, python=sys.executable):
+    """Return [(self_us, cumulative_us, depth, name), ...] for importing a module"""
+    result = subprocess.run(
+        [python, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, check=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return entries
+
+
+def summarize_imports(module, entries, top_n=5):
+    """Total time, heavy modules pulled in and the slowest direct imports"""
+    # importtime lists children before their parent, so the module's subtree
+    # is everything between it and the previous top-level entry
+    end = max(i for i, e in enumerate(entries) if e[2] == 0 and e[3] == module)
+    start = end
+    while start > 0 and entries[start - 1][2] > 0:
+        start -= 1
+    subtree = entries[start:end]
+
+    heavy = sorted({name.split('.')[0] for _, _, _, name in subtree
+                    if name.split('.')[0] in HEAVY_MODULES})
+    direct = sorted((e for e in subtree if e[2] == 1), key=lambda e: e[1], reverse=True)
+    return {
+        'module': module,
+        'total_ms': entries[end][1] / 1000,
+        'heavy': heavy,
+        'slowest': [(name, cum / 1000) for _, cum, _, name in direct[:top_n]],
+    }
+
+
+def startup_report(modules=ENTRY_POINTS, budget_ms=IMPORT_BUDGET_MS):
+    """Print the import summary for each module; returns True if all pass"""
+    print("⏱️ COLD-START IMPORT REPORT")
+    print("=" * 50)
+
+    all_ok = True
+    for module in modules:
+        summary = summarize_imports(module, measure_import_time(module))
+        ok = summary['total_ms'] <= budget_ms and not summary['heavy']
+        all_ok = all_ok and ok
+
+        status = "✅" if ok else "❌"
+        print(f"\n{status} {module}: {summary['total_ms']:.1f} ms (budget {budget_ms} ms)")
+        for name, ms in summary['slowest']:
+            print(f"   {name:<30} {ms:8.1f} ms")
+        if summary['heavy']:
+            print(f"   Heavy imports: {', '.join(summary['heavy'])}")
+
+    return all_ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if startup_report() else 1)
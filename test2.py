@@ -6,11 +6,14 @@ import pandas as pd
 from collections import Counter
 import re
 
+from body_store import register_body_functions
+from ticket_schema import count_by_sql, group_by_sql, view_columns
+
 def connect_to_database():
     """Connect to the English support tickets database"""
     try:
         conn = sqlite3.connect('english_support_tickets.db')
-        return conn
+        return register_body_functions(conn)
     except Exception as e:
         print(f"❌ Error connecting to database: {e}")
         return None
@@ -60,13 +63,7 @@ def question_1_priority_analysis():
         return
     
     try:
-        query = """
-        SELECT priority, COUNT(*) as ticket_count
-        FROM tickets 
-        WHERE priority IS NOT NULL 
-        GROUP BY priority 
-        ORDER BY ticket_count DESC
-        """
+        query = count_by_sql(conn, 'priority')
         
         df = pd.read_sql_query(query, conn)
         
@@ -234,16 +231,12 @@ def question_4_priority_vs_length():
         return
     
     try:
-        query = """
-        SELECT 
-            priority,
-            AVG(LENGTH(body)) as avg_length,
-            COUNT(*) as ticket_count
-        FROM tickets 
-        WHERE body IS NOT NULL AND body != '' AND priority IS NOT NULL
-        GROUP BY priority
-        ORDER BY avg_length DESC
-        """
+        # Grouped on the priority ids when the database is normalized
+        query = group_by_sql(
+            conn, 'priority',
+            {'avg_length': 'AVG(LENGTH(body))', 'ticket_count': 'COUNT(*)'},
+            where="body IS NOT NULL AND body != ''", order_by='avg_length DESC', uses=('body',),
+        )
         
         df = pd.read_sql_query(query, conn)
         
@@ -287,9 +280,7 @@ def question_5_ticket_patterns():
     
     try:
         # Get all available columns
-        cursor = conn.cursor()
-        cursor.execute("PRAGMA table_info(tickets)")
-        columns = [col[1] for col in cursor.fetchall()]
+        columns = [name for name, _ in view_columns(conn)]
         
         print(f"🔍 Exploring patterns in available data:")
         print("-" * 50)
@@ -299,7 +290,7 @@ def question_5_ticket_patterns():
         for col in columns:
             if col not in ['body']:  # Skip text columns
                 try:
-                    query = f"SELECT COUNT(DISTINCT {col}) as unique_count FROM tickets WHERE {col} IS NOT NULL"
+                    query = f"SELECT COUNT(*) as unique_count FROM ({count_by_sql(conn, col, 'count')})"
                     result = pd.read_sql_query(query, conn)
                     unique_count = result['unique_count'].iloc[0]
                     
@@ -312,14 +303,7 @@ def question_5_ticket_patterns():
         # Show distribution of categorical columns
         for col in categorical_columns[:3]:  # Limit to first 3
             try:
-                query = f"""
-                SELECT {col}, COUNT(*) as count 
-                FROM tickets 
-                WHERE {col} IS NOT NULL 
-                GROUP BY {col} 
-                ORDER BY count DESC 
-                LIMIT 5
-                """
+                query = f"{count_by_sql(conn, col, 'count')} LIMIT 5"
                 df = pd.read_sql_query(query, conn)
                 
                 if not df.empty:
@@ -342,7 +326,7 @@ def main():
     
     # Check database
     try:
-        conn = sqlite3.connect('english_support_tickets.db')
+        conn = register_body_functions(sqlite3.connect('english_support_tickets.db'))
         cursor = conn.cursor()
         cursor.execute("SELECT COUNT(*) FROM tickets")
         total_records = cursor.fetchone()[0]
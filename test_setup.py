@@ -1,8 +1,30 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from sklearn import datasets
-import torch
-from transformers import AutoModel
-
-print("All imports successful!")
\ No newline at end of file
+"""
+Check that the data science stack is installed.
+
+Each library is imported only when the check runs, so importing this module
+stays cheap; the time each import takes is printed alongside it.
+"""
+import importlib
+import time
+
+LIBRARIES = ['pandas', 'numpy', 'matplotlib.pyplot', 'sklearn.datasets', 'torch', 'transformers']
+
+
+def check_imports(libraries=LIBRARIES):
+    """Import each library and report how long it took"""
+    failed = []
+    for name in libraries:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            failed.append(name)
+            print(f"❌ {name:<20} {e}")
+            continue
+        print(f"✅ {name:<20} {(time.perf_counter() - started) * 1000:8.1f} ms")
+    return failed
+
+
+if __name__ == "__main__":
+    if not check_imports():
+        print("All imports successful!")
@@ -0,0 +1,52 @@
+import os
+
+import pandas as pd
+
+from benchmark_suite import (
+    compare_to_baseline,
+    load_baselines,
+    run_scenario,
+    save_baseline,
+    write_synthetic_dataset,
+)
+
+
+def test_synthetic_dataset_is_seeded(tmp_path):
+    first, second = tmp_path / "a.csv", tmp_path / "b.csv"
+    write_synthetic_dataset(first, 250, seed=3, chunk_rows=100)
+    write_synthetic_dataset(second, 250, seed=3, chunk_rows=100)
+
+    df = pd.read_csv(first)
+    assert len(df) == 250
+    assert {"subject", "body", "type", "priority", "queue", "language"} <= set(df.columns)
+    assert first.read_bytes() == second.read_bytes()
+
+
+def test_compare_to_baseline_flags_only_real_regressions():
+    baseline = {"stages": {"slow": 1.0, "fast": 0.001, "same": 2.0}}
+    results = {"stages": {"slow": 1.5, "fast": 0.004, "same": 2.1, "new": 9.0}}
+
+    assert compare_to_baseline(results, baseline, threshold=0.25) == [("slow", 1.0, 1.5)]
+
+
+def test_save_and_load_baseline(tmp_path):
+    filename = tmp_path / "baselines.json"
+    save_baseline({"scenario": "20k", "stages": {"x": 1.0}}, filename)
+    save_baseline({"scenario": "1m", "stages": {"x": 5.0}}, filename)
+
+    assert set(load_baselines(filename)) == {"20k", "1m"}
+    assert load_baselines(tmp_path / "missing.json") == {}
+
+
+def test_run_scenario_times_every_stage():
+    cwd = os.getcwd()
+    results = run_scenario("20k", rows=400, repeat=1)
+
+    assert os.getcwd() == cwd
+    assert results["rows"] == 400
+    assert 0 < results["english_rows"] < 400
+    stages = results["stages"]
+    assert {"ingest.filter", "ingest.save", "words.common_words",
+            "classifier.train", "classifier.score"} <= set(stages)
+    assert sum(name.startswith("analyze.") for name in stages) == 5
+    assert all(seconds >= 0 for seconds in stages.values())
@@ -0,0 +1,108 @@
+import sqlite3
+
+import pytest
+
+from body_store import (compare_body_storage, compress_bodies, compress_body, decompress_body,
+                        is_compressed, register_body_functions, train_dictionary)
+from ticket_schema import normalize_tickets
+
+BODIES = [
+    f"Dear Support Team, my VPN connection drops every {n} minutes since the last update. "
+    f"Could you please help? Kind regards, User {n}"
+    for n in range(60)
+]
+
+
+@pytest.fixture
+def ticket_db(tmp_path):
+    db_path = str(tmp_path / "tickets.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE tickets (subject TEXT, body TEXT, priority TEXT)")
+    conn.executemany("INSERT INTO tickets VALUES (?, ?, ?)",
+                     [(f"Ticket {i}", body, 'high' if i % 3 else 'low') for i, body in enumerate(BODIES)])
+    conn.execute("INSERT INTO tickets VALUES ('No body', NULL, 'low')")
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def test_dictionary_round_trip_and_helps_short_bodies():
+    dictionary = train_dictionary(BODIES)
+    assert 0 < len(dictionary) <= 32 * 1024
+    assert b"Kind regards" in dictionary
+
+    text = BODIES[7] + " Ünïcode ✓"
+    assert decompress_body(compress_body(text, dictionary), dictionary) == text
+    assert len(compress_body(BODIES[7], dictionary)) < len(compress_body(BODIES[7], b''))
+
+
+def test_compressed_bodies_read_back_through_the_view(ticket_db):
+    conn = sqlite3.connect(ticket_db)
+    before = conn.execute("SELECT rowid, subject, body, priority FROM tickets ORDER BY rowid").fetchall()
+
+    assert compress_bodies(conn, sample_size=20) == len(before)
+    conn.close()
+
+    conn = register_body_functions(sqlite3.connect(ticket_db))
+    assert is_compressed(conn)
+    assert 'body' not in [row[1] for row in conn.execute("PRAGMA table_info(ticket_rows)")]
+    assert conn.execute("SELECT rowid, subject, body, priority FROM tickets ORDER BY rowid").fetchall() == before
+    conn.close()
+
+
+def test_compress_drops_the_ticket_apps_search_index(ticket_db):
+    conn = sqlite3.connect(ticket_db)
+    normalize_tickets(conn)
+    # What the ticket app creates on a normalized database (see config/database.ts)
+    conn.executescript("""
+        CREATE VIRTUAL TABLE tickets_fts USING fts5(subject, body, content='tickets', content_rowid='rowid');
+        CREATE TRIGGER tickets_fts_insert AFTER INSERT ON ticket_rows BEGIN
+            INSERT INTO tickets_fts (rowid, subject, body) VALUES (new.rowid, new.subject, new.body);
+        END;
+    """)
+
+    compress_bodies(conn, sample_size=20)
+
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name GLOB 'tickets_fts*'").fetchall() == []
+    conn.close()
+
+
+def test_new_tickets_are_compressed_by_the_next_run(ticket_db):
+    conn = register_body_functions(sqlite3.connect(ticket_db))
+    compress_bodies(conn, sample_size=20)
+    conn.execute("INSERT INTO tickets (subject, body, priority) VALUES ('New', 'VPN drops again', 'high')")
+    conn.commit()
+
+    assert conn.execute("SELECT dictionary_id FROM ticket_bodies ORDER BY rowid DESC LIMIT 1").fetchone() == (None,)
+    assert compress_bodies(conn) == 1
+    assert compress_bodies(conn) == 0
+    assert conn.execute("SELECT body FROM tickets ORDER BY rowid DESC LIMIT 1").fetchone() == ('VPN drops again',)
+    conn.close()
+
+
+def test_compare_body_storage_reports_both_workloads(ticket_db):
+    results = compare_body_storage(ticket_db, repeat=1)
+    assert results['compressed_body_bytes'] < results['body_bytes']
+    assert {times['workload'] for times in results['queries'].values()} == {'metadata', 'body'}
+
+    conn = sqlite3.connect(ticket_db)
+    assert not is_compressed(conn)
+    conn.close()
+
+
+def test_compressed_ingest_rebuilds_ticket_rows(tmp_path):
+    import pandas as pd
+
+    from filter_english_tickets import save_english_tickets
+
+    df = pd.DataFrame({'subject': [f"Ticket {i}" for i in range(len(BODIES))], 'body': BODIES})
+    db_path = str(tmp_path / "english.db")
+    save_english_tickets(pd.concat([df] * 20, ignore_index=True), str(tmp_path / "english.csv"), db_path,
+                         compress=True)
+
+    conn = register_body_functions(sqlite3.connect(db_path))
+    # Vacuumed: no free pages, and ticket_rows no longer spans the dropped bodies
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM dbstat WHERE name = 'ticket_rows'").fetchone()[0] < 10
+    assert conn.execute("SELECT body FROM tickets WHERE rowid = 2").fetchone()[0] == BODIES[1]
+    conn.close()
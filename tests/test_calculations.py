@@ -1,3 +1,4 @@
+import calculations
 from calculations import get_public_orgs, revenue_per_industry
 import pytest
 
@@ -23,3 +24,56 @@ def test_revenue_per_industry(Industry, expected_revenue):
     assert (
         revenue_ratio[Industry] == expected_revenue
     ), f"expected: {expected_revenue}, got: {revenue_ratio[Industry]}"
+
+
+@pytest.fixture
+def small_csv(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text(
+        "Name,Industry,Revenue,Public?\n"
+        "A,Wireless,100,1\n"
+        "B,Wireless,300,0\n"
+        "C,Textiles,50,1\n"
+    )
+    calculations.clear_cache()
+    yield str(csv_path)
+    calculations.clear_cache()
+
+
+def test_load_data_parses_file_once(small_csv, monkeypatch):
+    calculations.load_data(small_csv)
+    monkeypatch.setattr(
+        calculations.pandas, "read_csv", lambda *a, **k: pytest.fail("CSV re-parsed")
+    )
+
+    assert get_public_orgs(small_csv) == 2
+    assert revenue_per_industry(small_csv)["Wireless"] == 200.0
+    assert calculations.highest_revenue_industry(small_csv) == "Wireless"
+
+
+def test_load_data_invalidates_on_file_change(small_csv):
+    assert len(calculations.load_data(small_csv)) == 3
+
+    with open(small_csv, "a") as f:
+        f.write("D,Accounting,1000,1\n")
+
+    assert len(calculations.load_data(small_csv)) == 4
+    assert calculations.highest_revenue_industry(small_csv) == "Accounting"
+
+
+def test_load_data_changes_do_not_reach_cache(small_csv):
+    view = calculations.load_data(small_csv)
+    view["Revenue"] = 0
+
+    assert calculations.load_data(small_csv)["Revenue"].sum() == 450
+
+
+def test_in_place_edits_do_not_reach_cache(small_csv):
+    df = calculations.load_data(small_csv)
+    df.loc[:, "Revenue"] = 0
+    df.iloc[0, df.columns.get_loc("Industry")] = "Changed"
+    stats = calculations.industry_stats(small_csv)
+    stats.loc[:, "revenue"] = 0
+
+    assert calculations.load_data(small_csv)["Revenue"].sum() == 450
+    assert calculations.industry_stats(small_csv)["revenue"].sum() == 450
@@ -0,0 +1,71 @@
+import sqlite3
+
+import pytest
+
+from change_feed import (
+    consume_changes,
+    get_checkpoint,
+    iter_changes,
+    pending_changes,
+    reset_checkpoints,
+    set_checkpoint,
+)
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE tickets (body TEXT)")
+    conn.executemany("INSERT INTO tickets VALUES (?)", [(f"ticket {i}",) for i in range(7)])
+    conn.execute("CREATE TABLE lengths (rowid INTEGER PRIMARY KEY, length INTEGER)")
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def _store_lengths(conn, rows):
+    conn.executemany("INSERT INTO lengths VALUES (?, ?)", [(rowid, len(body)) for rowid, body in rows])
+
+
+def test_consumers_only_see_rows_after_their_checkpoint(conn):
+    assert consume_changes(conn, "lengths", _store_lengths, "body", batch_size=3) == 7
+    assert get_checkpoint(conn, "lengths") == 7
+    assert consume_changes(conn, "lengths", _store_lengths, "body") == 0
+
+    conn.executemany("INSERT INTO tickets VALUES (?)", [("new one",), ("new two",)])
+    conn.commit()
+    assert pending_changes(conn, "lengths") == 2
+    assert pending_changes(conn, "other") == 9
+    assert [rows[0][0] for rows in iter_changes(conn, "lengths", "body")] == [8]
+    assert consume_changes(conn, "lengths", _store_lengths, "body") == 2
+    assert conn.execute("SELECT COUNT(*) FROM lengths").fetchone()[0] == 9
+
+
+def test_failed_batch_rolls_back_results_and_checkpoint(conn):
+    def fail_on_second_batch(conn, rows):
+        _store_lengths(conn, rows)
+        if rows[0][0] > 1:
+            raise RuntimeError("crash")
+
+    with pytest.raises(RuntimeError):
+        consume_changes(conn, "lengths", fail_on_second_batch, "body", batch_size=4)
+
+    assert get_checkpoint(conn, "lengths") == 4
+    assert conn.execute("SELECT MAX(rowid) FROM lengths").fetchone()[0] == 4
+    # The rerun resumes with the batch that failed
+    assert consume_changes(conn, "lengths", _store_lengths, "body") == 3
+
+
+def test_checkpoints_never_move_backwards_until_reset(conn):
+    with conn:
+        set_checkpoint(conn, "a", 5)
+        set_checkpoint(conn, "a", 2)
+        set_checkpoint(conn, "b", 3)
+    assert get_checkpoint(conn, "a") == 5
+
+    with conn:
+        reset_checkpoints(conn, "a")
+    assert get_checkpoint(conn, "a") == 0 and get_checkpoint(conn, "b") == 3
+    with conn:
+        reset_checkpoints(conn)
+    assert get_checkpoint(conn, "b") == 0
@@ -0,0 +1,115 @@
+import os
+import sqlite3
+
+import pytest
+
+from feature_store import build_features, list_features, load_features, load_vectorizer, prune_features
+from ticket_schema import record_ingest
+from ticket_classifier import load_classifier, train_ticket_classifier
+
+TICKETS = [
+    ("VPN drops", "The VPN client disconnects on my laptop", "IT Support"),
+    ("Invoice wrong", "Our invoice shows the wrong billing amount", "Billing"),
+    ("VPN again", "VPN connection keeps dropping after the update", "IT Support"),
+    ("Refund", "Please refund the duplicate charge on my invoice", "Billing"),
+    ("Laptop", "My laptop cannot reach the VPN gateway", None),
+]
+
+
+@pytest.fixture
+def ticket_db(tmp_path):
+    db_path = str(tmp_path / "tickets.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE tickets (subject TEXT, body TEXT, queue TEXT)")
+    conn.executemany("INSERT INTO tickets VALUES (?, ?, ?)", TICKETS)
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def test_features_are_memory_mapped_with_label_codes(ticket_db, tmp_path):
+    store = str(tmp_path / "store")
+    features = load_features(ticket_db, store_dir=store)
+
+    assert features['X'].shape[0] == 5
+    assert not features['X'].data.flags.owndata
+    assert not features['X'].data.flags.writeable
+    assert list(features['rowids']) == [1, 2, 3, 4, 5]
+    assert features['classes']['queue'] == ['Billing', 'IT Support']
+    assert list(features['labels']['queue']) == [1, 0, 1, 0, -1]
+    vectorizer = load_vectorizer(features)
+    assert vectorizer.transform(["VPN invoice"]).shape[1] == features['X'].shape[1]
+
+
+def test_entries_are_keyed_by_config_and_db_version(ticket_db, tmp_path):
+    store = str(tmp_path / "store")
+    first = build_features(ticket_db, store_dir=store)
+    assert build_features(ticket_db, store_dir=store) == first
+    assert build_features(ticket_db, {'ngram_range': (1, 2)}, store_dir=store) != first
+
+    conn = sqlite3.connect(ticket_db)
+    conn.execute("INSERT INTO tickets VALUES ('New', 'Printer is offline', 'IT Support')")
+    conn.commit()
+    conn.close()
+
+    features = load_features(ticket_db, store_dir=store)
+    assert features['path'] != first
+    assert features['X'].shape[0] == 6
+    assert len(list_features(store)) == 3
+    assert len(prune_features(ticket_db, store)) == 2
+    assert [meta['key'] for meta in list_features(store)] == [features['meta']['key']]
+
+
+def test_reingest_of_the_same_size_gets_new_features(ticket_db, tmp_path):
+    store = str(tmp_path / "store")
+    first = build_features(ticket_db, store_dir=store)
+
+    conn = sqlite3.connect(ticket_db)
+    conn.execute("DROP TABLE tickets")
+    conn.execute("CREATE TABLE tickets (subject TEXT, body TEXT, queue TEXT)")
+    conn.executemany("INSERT INTO tickets VALUES (?, ?, ?)", [(s, 'Printer offline', q) for s, _, q in TICKETS])
+    # What the ingest does after writing the new rows
+    record_ingest(conn)
+    conn.commit()
+    conn.close()
+
+    assert build_features(ticket_db, store_dir=store) != first
+
+
+def test_databases_of_the_same_shape_get_their_own_features(ticket_db, tmp_path):
+    store = str(tmp_path / "store")
+    other_db = str(tmp_path / "other.db")
+    conn = sqlite3.connect(other_db)
+    conn.execute("CREATE TABLE tickets (subject TEXT, body TEXT, queue TEXT)")
+    conn.executemany("INSERT INTO tickets VALUES (?, ?, ?)", [(s, 'Printer offline', q) for s, _, q in TICKETS])
+    conn.commit()
+    conn.close()
+
+    first = load_features(ticket_db, store_dir=store)
+    other = load_features(other_db, store_dir=store)
+
+    assert other['path'] != first['path']
+    assert other['meta']['db_filename'] == os.path.abspath(other_db)
+    assert 'printer' in load_vectorizer(other).vocabulary_
+
+
+def test_unrelated_schema_changes_keep_the_features(ticket_db, tmp_path):
+    store = str(tmp_path / "store")
+    first = build_features(ticket_db, store_dir=store)
+
+    conn = sqlite3.connect(ticket_db)
+    conn.execute("CREATE INDEX idx_tickets_queue ON tickets (queue)")
+    conn.execute("CREATE TABLE feed_checkpoints (consumer TEXT PRIMARY KEY, last_rowid INTEGER)")
+    conn.commit()
+    conn.close()
+
+    assert build_features(ticket_db, store_dir=store) == first
+
+
+def test_classifier_trains_from_the_feature_store(ticket_db, tmp_path):
+    model_path = str(tmp_path / "queue_model.pkl")
+    train_ticket_classifier(ticket_db, "queue", model_path, features_dir=str(tmp_path / "store"))
+
+    classifier = load_classifier(model_path)["classifier"]
+    assert list(classifier.classes_) == ['Billing', 'IT Support']
+    assert classifier.predict(["refund my invoice", "VPN laptop"]).tolist() == ['Billing', 'IT Support']
@@ -0,0 +1,53 @@
+import torch
+import pytest
+
+from ml_model_test import (
+    benchmark_model,
+    build_random_model,
+    compare_accuracy,
+    compare_quantized_inference,
+    quantize_model,
+)
+
+
+@pytest.fixture
+def random_inputs():
+    torch.manual_seed(1)
+    input_ids = torch.randint(0, 1000, (12, 16))
+    return {"input_ids": input_ids, "attention_mask": torch.ones_like(input_ids)}
+
+
+def test_quantize_model_replaces_linear_layers():
+    model = build_random_model()
+    int8_model = quantize_model(model)
+
+    assert isinstance(model.classifier, torch.nn.Linear)
+    assert type(int8_model.classifier) is not torch.nn.Linear
+    assert "quantized" in type(int8_model.classifier).__module__
+
+
+def test_compare_accuracy_against_fp32(random_inputs):
+    model = build_random_model()
+    report = compare_accuracy(model, model, random_inputs, labels=[0] * 12)
+
+    assert report["agreement"] == 1.0
+    assert report["max_abs_prob_diff"] == 0.0
+    assert report["fp32_accuracy"] == report["int8_accuracy"]
+
+
+def test_compare_quantized_inference_report(random_inputs):
+    model = build_random_model()
+    report = compare_quantized_inference(model, random_inputs, batch_size=4, repeats=2)
+
+    assert 0.0 <= report["accuracy"]["agreement"] <= 1.0
+    assert report["accuracy"]["max_abs_prob_diff"] < 0.5
+    assert report["fp32"]["batches"] == 6
+    assert report["int8"]["rows_per_sec"] > 0
+    assert report["speedup"] > 0
+
+
+def test_benchmark_model_counts_batches(random_inputs):
+    stats = benchmark_model(build_random_model(), random_inputs, batch_size=5, repeats=3)
+
+    assert stats["batches"] == 9
+    assert stats["p50_ms"] <= stats["p95_ms"]
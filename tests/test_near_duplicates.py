@@ -0,0 +1,112 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+from near_duplicates import (
+    band_buckets,
+    estimated_jaccard,
+    make_permutations,
+    minhash_signature,
+    shingle_hashes,
+    update_near_duplicates,
+)
+
+BASE = (
+    "Hello support team, since this morning I cannot log in to the billing portal. "
+    "The page shows an error after I enter my password and the reset link never arrives. "
+    "Could you please check my account and restore access as soon as possible?"
+)
+
+
+@pytest.fixture
+def ticket_db(tmp_path):
+    db_path = tmp_path / "tickets.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE tickets (subject TEXT, body TEXT)")
+    conn.executemany(
+        "INSERT INTO tickets (subject, body) VALUES (?, ?)",
+        [
+            ("Login", BASE),
+            ("Login again", BASE.replace("this morning", "this morning,")),
+            ("Printer", "The office printer on floor three jams on every duplex job we send to it."),
+            ("Empty", ""),
+            ("Login resend", BASE + " Thanks"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def clusters(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = dict(conn.execute("SELECT rowid, cluster_id FROM ticket_clusters").fetchall())
+    conn.close()
+    return rows
+
+
+def test_similar_bodies_have_similar_signatures():
+    perms = make_permutations()
+    a = minhash_signature(shingle_hashes(BASE), perms)
+    b = minhash_signature(shingle_hashes(BASE + " Thanks"), perms)
+    c = minhash_signature(shingle_hashes("Totally unrelated printer jam report"), perms)
+
+    assert estimated_jaccard(a, b) > 0.8
+    assert estimated_jaccard(a, c) < 0.2
+    assert band_buckets(np.vstack([a, b])).shape == (2, 16)
+
+
+def test_update_near_duplicates_assigns_clusters(ticket_db):
+    result = update_near_duplicates(ticket_db)
+
+    assert result == {"processed": 5, "duplicates": 2}
+    assert clusters(ticket_db) == {1: 1, 2: 1, 3: 3, 4: 4, 5: 1}
+
+
+def test_update_near_duplicates_is_incremental(ticket_db):
+    update_near_duplicates(ticket_db)
+
+    conn = sqlite3.connect(ticket_db)
+    conn.execute("INSERT INTO tickets (subject, body) VALUES (?, ?)", ("Printer", "The office printer on floor three jams on every duplex job we send to it!"))
+    conn.commit()
+    conn.close()
+
+    result = update_near_duplicates(ticket_db)
+
+    assert result == {"processed": 1, "duplicates": 1}
+    assert clusters(ticket_db)[6] == 3
+    conn = sqlite3.connect(ticket_db)
+    unique = conn.execute("SELECT COUNT(*) FROM unique_tickets").fetchone()[0]
+    conn.close()
+    assert unique == 3
+
+
+def test_unique_tickets_view_over_normalized_tickets(ticket_db):
+    from ticket_schema import normalize_tickets
+
+    conn = sqlite3.connect(ticket_db)
+    normalize_tickets(conn)
+    conn.close()
+    update_near_duplicates(ticket_db)
+
+    conn = sqlite3.connect(ticket_db)
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(unique_tickets)")]
+    subjects = [row[0] for row in conn.execute("SELECT subject FROM unique_tickets ORDER BY rowid")]
+    conn.close()
+    assert columns == ["rowid", "subject", "body"]
+    assert subjects == ["Login", "Printer", "Empty"]
+
+
+def test_legacy_band_table_is_rebuilt(ticket_db):
+    conn = sqlite3.connect(ticket_db)
+    conn.execute("CREATE TABLE ticket_lsh_bands (band INTEGER, bucket INTEGER, rowid INTEGER)")
+    conn.execute("CREATE TABLE ticket_clusters (rowid INTEGER PRIMARY KEY, cluster_id INTEGER NOT NULL)")
+    conn.execute("INSERT INTO ticket_clusters VALUES (5, 5)")
+    conn.commit()
+    conn.close()
+
+    assert update_near_duplicates(ticket_db) == {"processed": 5, "duplicates": 2}
+    conn = sqlite3.connect(ticket_db)
+    assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'ticket_lsh_bands'").fetchone() is None
+    conn.close()
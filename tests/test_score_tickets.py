@@ -0,0 +1,69 @@
+import sqlite3
+
+import pytest
+
+from score_tickets import rowid_ranges, score_tickets
+from ticket_classifier import load_classifier, train_ticket_classifier
+
+TICKETS = [
+    ("VPN drops", "The VPN client disconnects on my laptop", "IT Support"),
+    ("Invoice wrong", "Our invoice shows the wrong billing amount", "Billing"),
+    ("VPN again", "VPN connection keeps dropping after the update", "IT Support"),
+    ("Refund", "Please refund the duplicate charge on my invoice", "Billing"),
+    ("Laptop", "My laptop cannot reach the VPN gateway", "IT Support"),
+]
+
+
+@pytest.fixture
+def ticket_db(tmp_path):
+    db_path = tmp_path / "tickets.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE tickets (subject TEXT, body TEXT, queue TEXT)")
+    conn.executemany("INSERT INTO tickets VALUES (?, ?, ?)", TICKETS)
+    conn.commit()
+    conn.close()
+    return str(db_path)
+
+
+def test_rowid_ranges_cover_table(ticket_db):
+    assert rowid_ranges(ticket_db, range_size=2) == [(1, 2), (3, 4), (5, 5)]
+
+
+def test_score_tickets_writes_predictions(ticket_db, tmp_path):
+    model_path = str(tmp_path / "queue_model.pkl")
+    train_ticket_classifier(ticket_db, target="queue", model_filename=model_path)
+    assert load_classifier(model_path)["target"] == "queue"
+
+    stats = score_tickets(ticket_db, model_path, workers=2, range_size=2, write_batch_size=3)
+    assert stats["rows"] == 5
+    assert stats["ranges"] == 3
+
+    # Re-running upserts instead of duplicating rows
+    score_tickets(ticket_db, model_path, workers=2, range_size=2)
+
+    conn = sqlite3.connect(ticket_db)
+    rows = conn.execute("SELECT rowid, model, label FROM ticket_predictions ORDER BY rowid").fetchall()
+    conn.close()
+    assert len(rows) == 5
+    assert {model for _, model, _ in rows} == {"queue_model"}
+    assert rows[0][2] == "IT Support"
+    assert rows[1][2] == "Billing"
+
+
+def test_incremental_scoring_only_scores_new_tickets(ticket_db, tmp_path):
+    model_path = str(tmp_path / "queue_model.pkl")
+    train_ticket_classifier(ticket_db, target="queue", model_filename=model_path)
+
+    assert score_tickets(ticket_db, model_path, workers=1, range_size=2, incremental=True)["rows"] == 5
+    assert score_tickets(ticket_db, model_path, workers=1, incremental=True)["rows"] == 0
+
+    conn = sqlite3.connect(ticket_db)
+    conn.execute("INSERT INTO tickets VALUES ('VPN', 'The VPN is down again', NULL)")
+    conn.commit()
+    conn.close()
+
+    stats = score_tickets(ticket_db, model_path, workers=1, incremental=True)
+    assert stats["rows"] == 1
+    conn = sqlite3.connect(ticket_db)
+    assert conn.execute("SELECT COUNT(*) FROM ticket_predictions").fetchone()[0] == 6
+    conn.close()
@@ -0,0 +1,70 @@
+import sqlite3
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+from similar_tickets import (
+    build_similarity_index,
+    find_similar_tickets,
+    load_similarity_index,
+    similar_to_ticket,
+    top_k_similar,
+)
+
+
+@pytest.fixture
+def index_paths(tmp_path):
+    db_path = tmp_path / "tickets.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE tickets (subject TEXT, body TEXT)")
+    conn.executemany(
+        "INSERT INTO tickets (subject, body) VALUES (?, ?)",
+        [
+            ("VPN drops", "The VPN client disconnects every few minutes on the laptop"),
+            ("Invoice wrong", "Our invoice lists the wrong billing address and tax number"),
+            ("VPN disconnects", "VPN connection keeps dropping on my laptop after the update"),
+            ("Password reset", "The password reset email never arrives in my inbox"),
+            ("Billing address", "Please correct the billing address shown on the last invoice"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    index_dir = tmp_path / "index"
+    build_similarity_index(db_path, str(index_dir))
+    return db_path, str(index_dir)
+
+
+def test_index_is_memory_mapped(index_paths):
+    _, index_dir = index_paths
+    index = load_similarity_index(index_dir)
+
+    assert not index["term_doc"].data.flags.owndata
+    assert not index["term_doc"].data.flags.writeable
+    assert not index["term_doc"].indices.flags.owndata
+    assert index["term_doc"].shape[1] == 5
+
+
+def test_similar_to_ticket_excludes_itself(index_paths):
+    db_path, index_dir = index_paths
+    matches = similar_to_ticket(1, k=2, db_filename=db_path, index_dir=index_dir)
+
+    assert matches[0][0] == 3
+    assert all(rowid != 1 for rowid, _ in matches)
+    assert find_similar_tickets("invoice billing address", k=2, index_dir=index_dir)[0][0] in (2, 5)
+
+
+def test_top_k_similar_chunks_match_full_product():
+    rng = np.random.default_rng(0)
+    doc_term = sparse.random(50, 30, density=0.2, format="csr", random_state=rng, dtype=np.float32)
+    queries = sparse.random(7, 30, density=0.3, format="csr", random_state=rng, dtype=np.float32)
+
+    positions, scores = top_k_similar(queries, doc_term.T.tocsr(), k=3, chunk_size=2)
+
+    dense = (queries @ doc_term.T).toarray()
+    for row in range(7):
+        expected = np.sort(dense[row])[::-1][:3]
+        np.testing.assert_allclose(scores[row], expected, rtol=1e-6)
+        valid = positions[row] >= 0
+        np.testing.assert_allclose(dense[row, positions[row][valid]], scores[row][valid], rtol=1e-6)
@@ -0,0 +1,43 @@
+import sqlite3
+
+import pandas as pd
+
+import analyze_tickets
+from sql_profiler import SQLProfiler
+
+
+def test_profiler_records_rows_sections_and_full_scans():
+    profiler = SQLProfiler()
+    conn = profiler.connect(":memory:")
+    conn.execute("CREATE TABLE tickets (id INTEGER PRIMARY KEY, priority TEXT)")
+    conn.executemany("INSERT INTO tickets (priority) VALUES (?)", [("high",), ("low",), ("low",)])
+
+    with profiler.section("counts"):
+        df = pd.read_sql_query("SELECT priority, COUNT(*) FROM tickets GROUP BY priority", conn)
+        row = conn.execute("SELECT priority FROM tickets WHERE id = ?", (1,)).fetchone()
+
+    assert isinstance(conn, sqlite3.Connection)
+    assert len(df) == 2 and row == ("high",)
+    summary = profiler.section_summary()["counts"]
+    assert summary["statements"] == 2
+    assert summary["rows"] == 3
+    scans = profiler.full_scans()
+    assert [sql for sql, _ in scans] == ["SELECT priority, COUNT(*) FROM tickets GROUP BY priority"]
+
+
+def test_analyze_tickets_profile_mode(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    conn = sqlite3.connect("english_support_tickets.db")
+    conn.execute("CREATE TABLE tickets (title TEXT, description TEXT, status TEXT, priority TEXT)")
+    conn.execute("INSERT INTO tickets VALUES ('Login fails', 'Cannot log in to the portal', 'Incident', 'high')")
+    conn.commit()
+    conn.close()
+
+    analyze_tickets.main(profile=True)
+
+    output = capsys.readouterr().out
+    assert "SQL PROFILE" in output
+    assert "question_2_priority_distribution" in output
+    assert "Full table scans" in output
+    analyze_tickets.main()
+    assert analyze_tickets.PROFILER is None
@@ -0,0 +1,41 @@
+import json
+import tracemalloc
+
+import pytest
+
+from stage_metrics import StageMetrics
+
+
+def test_stages_record_time_memory_and_rows(tmp_path, capsys):
+    metrics = StageMetrics()
+    with metrics.stage("build") as stage:
+        data = [str(i) * 10 for i in range(50_000)]
+        stage["rows"] = len(data)
+    with pytest.raises(ValueError):
+        with metrics.stage("fail"):
+            raise ValueError("boom")
+    metrics.close()
+
+    build, fail = metrics.stages
+    assert build["rows"] == 50_000
+    assert build["wall_seconds"] > 0 and build["cpu_seconds"] >= 0
+    assert build["peak_memory_bytes"] > 1_000_000
+    assert "ValueError" in fail["error"]
+    assert not tracemalloc.is_tracing()
+
+    report_file = tmp_path / "report.json"
+    metrics.write_json(report_file)
+    report = json.loads(report_file.read_text())
+    assert [s["name"] for s in report["stages"]] == ["build", "fail"]
+    assert report["peak_memory_bytes"] == max(build["peak_memory_bytes"], fail["peak_memory_bytes"])
+
+    metrics.print_summary()
+    assert "build" in capsys.readouterr().out
+
+
+def test_memory_tracing_can_be_disabled():
+    metrics = StageMetrics(trace_memory=False)
+    with metrics.stage("quick"):
+        pass
+    assert "peak_memory_bytes" not in metrics.stages[0]
+    assert metrics.report()["peak_memory_bytes"] is None
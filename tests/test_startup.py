@@ -0,0 +1,11 @@
+import pytest
+
+from startup_report import measure_import_time, summarize_imports
+
+
+@pytest.mark.parametrize("module", ["analyze_tickets", "test2", "ml_model_test", "test_setup"])
+def test_entry_points_do_not_import_heavy_libraries(module):
+    summary = summarize_imports(module, measure_import_time(module))
+
+    assert summary["heavy"] == []
+    assert summary["total_ms"] > 0
@@ -0,0 +1,162 @@
+import gzip
+import json
+import threading
+import urllib.error
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from ticket_api_client import (
+    download_tickets_csv,
+    iter_ticket_frames,
+    payload_sizes,
+    post_ticket_batch,
+    stream_tickets,
+    upload_tickets,
+)
+
+TICKETS = [{"id": i, "title": f"Ticket {i}", "priority": "high" if i % 2 else "low"} for i in range(1, 8)]
+
+
+class ExportHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        for ticket in TICKETS:
+            self.wfile.write((json.dumps(ticket) + "\n").encode())
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode()
+        tickets = [json.loads(line) for line in body.splitlines() if line]
+        self.server.uploads.append((self.path, self.headers["Content-Type"], tickets))
+        errors = [{"index": i, "error": "description is required"}
+                  for i, ticket in enumerate(tickets) if not ticket.get("description")]
+        summary = {"received": len(tickets), "inserted": len(tickets) - len(errors),
+                   "failed": len(errors), "errors": errors}
+        self.send_response(201 if not errors else 207)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps(summary).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api_url():
+    server = HTTPServer(("127.0.0.1", 0), ExportHandler)
+    server.paths = []
+    server.uploads = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_port}/api"
+    yield server.url, server.paths
+    server.shutdown()
+
+
+def test_stream_tickets_yields_each_row(api_url):
+    url, paths = api_url
+    tickets = list(stream_tickets(url, priority=["high", "low"], search="vpn"))
+
+    assert tickets == TICKETS
+    assert paths == ["/api/tickets/export?priority=high%2Clow&search=vpn"]
+
+
+def test_download_tickets_csv_requests_csv_format(api_url, tmp_path):
+    url, paths = api_url
+    target = tmp_path / "export.csv"
+
+    written = download_tickets_csv(str(target), url, queue="IT")
+
+    assert paths == ["/api/tickets/export?format=csv&queue=IT"]
+    assert written == target.stat().st_size > 0
+
+
+def test_iter_ticket_frames_chunks(api_url):
+    url, _ = api_url
+    frames = list(iter_ticket_frames(chunksize=3, api_url=url))
+
+    assert [len(frame) for frame in frames] == [3, 3, 1]
+    assert list(frames[0].columns) == ["id", "title", "priority"]
+
+
+def test_upload_tickets_batches_csv_rows(api_url, tmp_path):
+    url, _ = api_url
+    csv_file = tmp_path / "tickets.csv"
+    csv_file.write_text(
+        "subject,body,answer,type,queue,priority,language\n"
+        "VPN down,Cannot connect,,Incident,IT,high,en\n"
+        ",No subject here,,Request,HR,low,en\n"
+        "Empty body,,,Problem,IT,medium,en\n"
+        "Printer,Out of toner,,Request,IT,low,en\n"
+        "Laptop,Screen flickers,,Incident,IT,medium,en\n"
+    )
+
+    stats = upload_tickets(str(csv_file), api_url=url, batch_size=2, pipeline_depth=2)
+
+    assert stats["rows"] == 5
+    assert stats["batches"] == 3
+    assert stats["inserted"] == 4
+    assert stats["failed"] == 1
+    assert stats["errors"] == [{"index": 2, "error": "description is required"}]
+    assert stats["rows_per_sec"] > 0
+
+
+class TooLargeHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(413)
+        self.send_header("Content-Type", "text/html")
+        self.end_headers()
+        self.wfile.write(b"<pre>PayloadTooLargeError: request entity too large</pre>")
+
+    def log_message(self, *args):
+        pass
+
+
+def test_post_ticket_batch_reports_a_non_json_error_body():
+    server = HTTPServer(("127.0.0.1", 0), TooLargeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with pytest.raises(urllib.error.HTTPError) as raised:
+            post_ticket_batch([{"description": "x" * 100}], api_url=f"http://127.0.0.1:{server.server_port}/api")
+    finally:
+        server.shutdown()
+
+    assert raised.value.code == 413
+    assert "request entity too large" in str(raised.value)
+
+
+class ListHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        fields = "fields=" in self.path
+        body = json.dumps([{"id": t["id"], "title": t["title"]} if fields else t for t in TICKETS] * 50).encode()
+        gzipped = "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzipped:
+            body = gzip.compress(body)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_payload_sizes_reports_wire_bytes():
+    server = HTTPServer(("127.0.0.1", 0), ListHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        results = payload_sizes(f"http://127.0.0.1:{server.server_port}/api", encodings=["identity", "gzip"])
+    finally:
+        server.shutdown()
+
+    sizes = {(r["variant"], r["content_encoding"]): r["bytes"] for r in results}
+    assert set(sizes) == {("full", "identity"), ("full", "gzip"), ("list", "identity"), ("list", "gzip")}
+    assert sizes["list", "identity"] < sizes["full", "identity"]
+    assert sizes["full", "gzip"] < sizes["full", "identity"]
@@ -0,0 +1,44 @@
+import pandas as pd
+
+from ticket_corpus import COLUMNS, LANGUAGES, iter_ticket_chunks, write_corpus
+
+
+def _rows(rows, **kwargs):
+    return [row for chunk in iter_ticket_chunks(rows, **kwargs) for row in chunk]
+
+
+def test_corpus_is_seeded_and_matches_schema(tmp_path):
+    first, second = tmp_path / "a.csv", tmp_path / "b.csv"
+    write_corpus(first, 500, seed=7, chunk_rows=200)
+    write_corpus(second, 500, seed=7, chunk_rows=200)
+
+    df = pd.read_csv(first)
+    assert list(df.columns) == COLUMNS
+    assert len(df) == 500
+    assert set(df["language"]) <= set(LANGUAGES)
+    assert df["body"].notna().all()
+    assert first.read_bytes() == second.read_bytes()
+
+
+def test_duplicate_rates_are_configurable():
+    unique = _rows(2000, seed=1, duplicate_rate=0.0, near_duplicate_rate=0.0)
+    duplicated = _rows(2000, seed=1, duplicate_rate=0.2, near_duplicate_rate=0.0)
+
+    assert len(set(unique)) == len(unique)
+    assert 0.15 < 1 - len(set(duplicated)) / len(duplicated) < 0.25
+
+
+def test_near_duplicates_differ_by_a_few_words():
+    rows = _rows(1000, seed=2, duplicate_rate=0.0, near_duplicate_rate=0.3)
+    bodies = {row[1] for row in rows}
+    near = 0
+    for row in rows[1:]:
+        words = row[1].split(" ")
+        for other in bodies:
+            other_words = other.split(" ")
+            if other != row[1] and len(other_words) == len(words):
+                changed = sum(a != b for a, b in zip(words, other_words))
+                if changed <= 2:
+                    near += 1
+                    break
+    assert near > 200
@@ -0,0 +1,134 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from filter_english_tickets import save_english_tickets
+from ticket_schema import (_create_view_and_trigger, compare_layouts, count_by_sql, group_by_sql, is_normalized,
+                           normalize_tickets)
+
+TICKETS = [
+    ("VPN drops", "The VPN client disconnects", "Incident", "high", "IT Support", "en"),
+    ("Invoice wrong", "Wrong billing amount", "Request", "low", "Billing", "en"),
+    (None, "VPN keeps dropping", "Incident", "high", "IT Support", "en"),
+    ("Refund", "Refund the duplicate charge", "Problem", None, "Billing", "en"),
+]
+COLUMNS = "subject, body, type, priority, queue, language"
+
+
+@pytest.fixture
+def flat_db(tmp_path):
+    db_path = str(tmp_path / "tickets.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute(f"CREATE TABLE tickets ({COLUMNS})")
+    conn.executemany("INSERT INTO tickets VALUES (?, ?, ?, ?, ?, ?)", TICKETS)
+    # A gap in the rowids must survive the conversion
+    conn.execute("DELETE FROM tickets WHERE rowid = 2")
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def test_normalize_keeps_rowids_columns_and_values(flat_db):
+    conn = sqlite3.connect(flat_db)
+    before = conn.execute(f"SELECT rowid, {COLUMNS} FROM tickets ORDER BY rowid").fetchall()
+
+    assert normalize_tickets(conn) == 3
+    assert is_normalized(conn)
+    assert normalize_tickets(conn) == 0
+    assert conn.execute(f"SELECT rowid, {COLUMNS} FROM tickets ORDER BY rowid").fetchall() == before
+    assert [row[1] for row in conn.execute("PRAGMA table_info(tickets)")] == (
+        ['rowid'] + COLUMNS.split(', ') + ['priority_rank'])
+    assert conn.execute("SELECT name FROM ticket_priorities ORDER BY id").fetchall() == [('high',)]
+    conn.close()
+
+
+def test_insert_through_view_adds_lookup_values(flat_db):
+    conn = sqlite3.connect(flat_db)
+    normalize_tickets(conn)
+    conn.execute("INSERT INTO tickets (subject, body, type, priority) VALUES ('New', 'Body', 'Change', 'high')")
+    conn.commit()
+
+    assert conn.execute("SELECT rowid, subject, type, priority, queue FROM tickets WHERE rowid > 4").fetchall() == [
+        (5, 'New', 'Change', 'high', None)
+    ]
+    assert conn.execute("SELECT COUNT(*) FROM ticket_priorities").fetchone()[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM ticket_types WHERE name = 'Change'").fetchone()[0] == 1
+    assert conn.execute("SELECT rowid, priority_rank FROM tickets ORDER BY rowid").fetchall() == [
+        (1, 3), (3, 3), (4, 0), (5, 3)
+    ]
+    conn.close()
+
+
+def test_priority_sorted_pages_use_the_rank_index(flat_db):
+    conn = sqlite3.connect(flat_db)
+    normalize_tickets(conn)
+    # A database normalized before priority_rank existed gets it on the next normalize
+    conn.execute("DROP VIEW tickets")
+    conn.execute("DROP INDEX idx_ticket_rows_priority_rank")
+    conn.execute("ALTER TABLE ticket_rows DROP COLUMN priority_rank")
+    _create_view_and_trigger(conn, [(name, '') for name in COLUMNS.split(', ')])
+    assert 'priority_rank' not in {row[1] for row in conn.execute("PRAGMA table_info(tickets)")}
+
+    assert normalize_tickets(conn) == 0
+    page = "SELECT rowid, subject FROM tickets ORDER BY priority_rank DESC, rowid DESC LIMIT 2"
+    assert conn.execute(page).fetchall() == [(3, None), (1, 'VPN drops')]
+    plan = ' '.join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + page))
+    assert 'idx_ticket_rows_priority_rank' in plan and 'TEMP B-TREE' not in plan
+    conn.close()
+
+
+def test_count_by_sql_matches_in_both_layouts(flat_db):
+    conn = sqlite3.connect(flat_db)
+    flat = conn.execute(count_by_sql(conn, 'queue')).fetchall()
+    normalize_tickets(conn)
+    assert 'ticket_rows' in count_by_sql(conn, 'queue')
+    assert conn.execute(count_by_sql(conn, 'queue')).fetchall() == flat
+    assert conn.execute(count_by_sql(conn, 'priority')).fetchall() == [('high', 2)]
+    conn.close()
+
+
+def test_group_by_sql_matches_in_both_layouts(flat_db):
+    conn = sqlite3.connect(flat_db)
+    aggregates = {'avg_length': 'AVG(LENGTH(body))', 'tickets': 'COUNT(*)'}
+    queries = [
+        lambda: group_by_sql(conn, 'queue', aggregates, where="body != ''", order_by='queue', uses=('body',)),
+        lambda: group_by_sql(conn, 'subject', {'tickets': 'COUNT(*)'}, order_by='subject'),
+    ]
+    flat = [conn.execute(query()).fetchall() for query in queries]
+    normalize_tickets(conn)
+    assert all('FROM ticket_rows' in query() for query in queries)
+    assert [conn.execute(query()).fetchall() for query in queries] == flat
+    conn.close()
+
+
+def test_compare_layouts_leaves_source_flat(flat_db):
+    results = compare_layouts(flat_db, repeat=1)
+    assert results['flat_bytes'] > 0 and results['normalized_bytes'] > 0
+    assert "GROUP BY priority" in results['queries']
+    assert all(times['flat'] >= 0 and times['view'] >= 0 for times in results['queries'].values())
+
+    conn = sqlite3.connect(flat_db)
+    assert not is_normalized(conn)
+    conn.close()
+
+
+def test_save_english_tickets_replaces_a_normalized_database(tmp_path):
+    df = pd.DataFrame(TICKETS, columns=COLUMNS.split(', '))
+    csv_path, db_path = str(tmp_path / "english.csv"), str(tmp_path / "english.db")
+
+    save_english_tickets(df, csv_path, db_path)
+    save_english_tickets(df.head(2), csv_path, db_path)
+
+    conn = sqlite3.connect(db_path)
+    assert is_normalized(conn)
+    assert conn.execute("SELECT COUNT(*) FROM tickets").fetchone()[0] == 2
+    # Vacuumed: the flat staging table's pages are not left on the freelist
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    conn.close()
+
+    save_english_tickets(df, csv_path, db_path, normalize=False)
+    conn = sqlite3.connect(db_path)
+    assert not is_normalized(conn)
+    assert conn.execute("SELECT COUNT(*) FROM tickets").fetchone()[0] == 4
+    conn.close()
@@ -0,0 +1,54 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+import analyze_tickets
+import ticketdb
+from startup_report import measure_import_time, summarize_imports
+
+
+def test_cli_import_loads_no_data_libraries():
+    summary = summarize_imports("ticketdb", measure_import_time("ticketdb"))
+    imported = {name for _, _, _, name in measure_import_time("ticketdb")}
+
+    assert summary["heavy"] == []
+    assert not {"pandas", "numpy", "scipy"} & imported
+
+
+def test_shared_options_and_bench_passthrough(monkeypatch):
+    monkeypatch.setenv("TICKETDB_DB", "from_env.db")
+    args = ticketdb.build_parser().parse_args(["search", "login", "fails"])
+    assert args.db == "from_env.db"
+    assert args.text == ["login", "fails"]
+
+    seen = []
+    monkeypatch.setattr(ticketdb, "cmd_bench", lambda args: seen.append(args.bench_args) or 0)
+    assert ticketdb.main(["bench", "--scenario", "1m", "--help"]) == 0
+    assert seen == [["--scenario", "1m", "--help"]]
+
+    with pytest.raises(SystemExit):
+        ticketdb.main(["analyze", "--bogus"])
+
+
+def test_analyze_uses_db_option(tmp_path, monkeypatch, capsys):
+    # main() points analyze_tickets at --db; restore the default afterwards
+    monkeypatch.setattr(analyze_tickets, "DB_FILENAME", analyze_tickets.DB_FILENAME)
+    db = tmp_path / "other.db"
+    conn = sqlite3.connect(db)
+    conn.execute("CREATE TABLE tickets (body TEXT, priority TEXT)")
+    conn.execute("INSERT INTO tickets VALUES ('Printer offline again', 'low')")
+    conn.commit()
+    conn.close()
+
+    assert ticketdb.main(["--db", str(db), "analyze"]) == 0
+    assert "Database loaded: 1 English support tickets" in capsys.readouterr().out
+
+
+def test_help_runs_in_a_fresh_interpreter():
+    script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ticketdb.py")
+    result = subprocess.run([sys.executable, script, "--help"], capture_output=True, text=True)
+    assert result.returncode == 0
+    assert "ingest" in result.stdout and "bench" in result.stdout
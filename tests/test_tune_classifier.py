@@ -0,0 +1,77 @@
+import os
+import sqlite3
+
+import pytest
+
+from ticket_classifier import load_classifier
+from tune_classifier import halving_schedule, save_best_classifier, tune_classifier
+
+WORDS = {
+    "IT Support": ["vpn", "laptop", "password", "network", "printer"],
+    "Billing": ["invoice", "refund", "charge", "payment", "billing"],
+}
+
+
+def make_ticket_db(db_path, swap_queues=False):
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE tickets (subject TEXT, body TEXT, queue TEXT)")
+    rows = []
+    for i in range(60):
+        queue = "IT Support" if i % 2 else "Billing"
+        words = WORDS[queue]
+        label = {"IT Support": "Billing", "Billing": "IT Support"}[queue] if swap_queues else queue
+        rows.append((f"Ticket {i}", f"my {words[i % 5]} and {words[(i + 2) % 5]} need help", label))
+    conn.executemany("INSERT INTO tickets VALUES (?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+@pytest.fixture
+def ticket_db(tmp_path):
+    return make_ticket_db(str(tmp_path / "tickets.db"))
+
+
+def test_halving_schedule_ends_on_the_full_folds():
+    assert halving_schedule(27, 10_000, eta=3, min_rows=200) == [370, 1111, 3333, 10_000]
+    assert halving_schedule(27, 500, eta=3, min_rows=200) == [500]
+    assert halving_schedule(1, 10_000) == [10_000]
+
+
+def test_tuning_halves_configs_and_reuses_cached_vectors(ticket_db, tmp_path):
+    cache = str(tmp_path / "cache")
+    grids = dict(vectorizer_grid={'min_df': [1, 2]}, model_grid={'alpha': [0.1, 1.0], 'fit_prior': [True, False]})
+    report = tune_classifier(ticket_db, 'queue', folds=2, eta=2, workers=2, cache_dir=cache,
+                             min_train_rows=10, **grids)
+
+    assert report['rungs'] == [15, 30]
+    leaderboard = report['leaderboard']
+    assert len(leaderboard) == 8
+    assert [entry['rung'] for entry in leaderboard] == sorted((entry['rung'] for entry in leaderboard), reverse=True)
+    assert sum(entry['rung'] == 1 for entry in leaderboard) == 4
+    assert leaderboard[0]['score'] > 0.9
+    assert all(entry['vectorize_seconds'] > 0 and entry['fit_seconds'] > 0 for entry in leaderboard)
+
+    again = tune_classifier(ticket_db, 'queue', folds=2, eta=2, workers=1, cache_dir=cache,
+                            min_train_rows=10, **grids)
+    assert all(entry['vectorize_seconds'] == 0 for entry in again['leaderboard'])
+    assert [e['score'] for e in again['leaderboard']] == [e['score'] for e in leaderboard]
+
+    model_path = str(tmp_path / "best.pkl")
+    save_best_classifier(report, ticket_db, model_path)
+    assert os.path.exists(model_path)
+    assert load_classifier(model_path)["classifier"].predict(["refund my invoice"]).tolist() == ["Billing"]
+
+
+def test_databases_of_the_same_shape_do_not_share_cached_folds(ticket_db, tmp_path):
+    cache = str(tmp_path / "cache")
+    swapped_db = make_ticket_db(str(tmp_path / "swapped.db"), swap_queues=True)
+    grids = dict(vectorizer_grid={'min_df': [1]}, model_grid={'alpha': [1.0]})
+    tune_classifier(ticket_db, 'queue', folds=2, workers=1, cache_dir=cache, min_train_rows=10, **grids)
+    report = tune_classifier(swapped_db, 'queue', folds=2, workers=1, cache_dir=cache, min_train_rows=10, **grids)
+
+    assert len(os.listdir(cache)) == 2
+    assert all(entry['vectorize_seconds'] > 0 for entry in report['leaderboard'])
+    model_path = str(tmp_path / "best.pkl")
+    save_best_classifier(report, swapped_db, model_path)
+    assert load_classifier(model_path)["classifier"].predict(["refund my invoice"]).tolist() == ["IT Support"]
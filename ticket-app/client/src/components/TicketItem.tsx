@@ -4,7 +4,8 @@ interface TicketItemProps {
     ticket: {
         id: number;
         title: string;
-        description: string;
+        description?: string;
+        preview?: string;
         status?: string;
         priority?: string;
         queue?: string;
@@ -57,7 +58,11 @@ const TicketItem: React.FC<TicketItemProps> = ({ ticket }) => {
                     fontSize: '18px', 
                     fontWeight: '600',
                     color: '#111827',
-                    flex: 1
+                    flex: 1,
+                    minWidth: 0,
+                    whiteSpace: 'nowrap',
+                    overflow: 'hidden',
+                    textOverflow: 'ellipsis'
                 }}>
                     {ticket.title || 'Untitled Ticket'}
                 </h3>
@@ -83,7 +88,7 @@ const TicketItem: React.FC<TicketItemProps> = ({ ticket }) => {
                 WebkitBoxOrient: 'vertical',
                 overflow: 'hidden'
             }}>
-                {ticket.description || 'No description available'}
+                {ticket.preview || ticket.description || 'No description available'}
             </p>
 
             <div style={{ display: 'flex', gap: '8px', flexWrap: 'wrap', alignItems: 'center' }}>
@@ -1,10 +1,30 @@
-import React, { useEffect, useState } from 'react';
-import { fetchTickets } from '../services/api';
-import { Ticket } from '../types';
-import TicketItem from './TicketItem';
+import React, { useEffect, useRef, useState } from 'react';
+import {
+    fetchMatchingTicketIds,
+    fetchTicketById,
+    fetchTicketFacets,
+    fetchTickets,
+    ticketExportUrl,
+} from '../services/api';
+import { Ticket, TicketFacets } from '../types';
+import { useDebouncedValue } from '../hooks/useDebouncedValue';
+import type { TicketFilterRequest, TicketFilterResponse } from '../workers/ticketFilter.worker';
+import VirtualTicketList from './VirtualTicketList';
+
+// Filtering waits for a pause in typing; the input itself updates immediately
+const SEARCH_DEBOUNCE_MS = 150;
 
 const TicketList: React.FC = () => {
     const [tickets, setTickets] = useState<Ticket[]>([]);
+    const [facets, setFacets] = useState<TicketFacets>({
+        total: 0,
+        status: {},
+        priority: {},
+        queue: {},
+        disjunctive: { status: {}, priority: {}, queue: {} },
+    });
+    // Counts for the active filters (see below); null while no filter is set
+    const [filteredFacets, setFilteredFacets] = useState<TicketFacets | null>(null);
     const [loading, setLoading] = useState<boolean>(true);
     const [error, setError] = useState<string | null>(null);
     const [searchQuery, setSearchQuery] = useState<string>('');
@@ -14,15 +34,25 @@ const TicketList: React.FC = () => {
     const [showFilters, setShowFilters] = useState<boolean>(false);
     const [sortBy, setSortBy] = useState<'id' | 'priority' | 'title'>('id');
     const [sortOrder, setSortOrder] = useState<'asc' | 'desc'>('desc');
-    const [currentPage, setCurrentPage] = useState<number>(1);
-    const [itemsPerPage, setItemsPerPage] = useState<number>(20);
     const [selectedTicket, setSelectedTicket] = useState<Ticket | null>(null);
-
+    // Positions in tickets matching the filters, in display order (from the worker)
+    const [order, setOrder] = useState<Int32Array | null>(null);
+    // Bumped when the server's search matches reach the worker
+    const [matchesVersion, setMatchesVersion] = useState<number>(0);
+    const workerRef = useRef<Worker | null>(null);
+    const requestIdRef = useRef<number>(0);
+    const debouncedSearch = useDebouncedValue(searchQuery, SEARCH_DEBOUNCE_MS);
+
+    // The list deliberately loads every ticket once rather than paging: it only
+    // carries the projected list fields, and holding all of them lets the worker
+    // filter and sort on each keystroke without a round trip. Body search and
+    // the counts come from the server; other clients page with ?limit/?cursor.
     useEffect(() => {
         const loadTickets = async () => {
             try {
-                const data = await fetchTickets();
+                const [data, counts] = await Promise.all([fetchTickets(), fetchTicketFacets()]);
                 setTickets(data);
+                setFacets(counts);
             } catch (err) {
                 setError('Failed to fetch tickets');
             } finally {
@@ -33,10 +63,119 @@ const TicketList: React.FC = () => {
         loadTickets();
     }, []);
 
-    // Get unique types, priorities, and queues from tickets
-    const uniqueTypes = Array.from(new Set(tickets.map(t => t.status).filter((s): s is string => Boolean(s))));
-    const uniquePriorities = Array.from(new Set(tickets.map(t => t.priority).filter((p): p is string => Boolean(p))));
-    const uniqueQueues = Array.from(new Set(tickets.map(t => t.queue).filter((q): q is string => Boolean(q))));
+    useEffect(() => {
+        const worker = new Worker(new URL('../workers/ticketFilter.worker.ts', import.meta.url), { type: 'module' });
+        worker.onmessage = (event: MessageEvent<TicketFilterResponse>) => {
+            // Drop answers to queries that have since been replaced
+            if (event.data.requestId === requestIdRef.current) {
+                setOrder(event.data.order);
+            }
+        };
+        workerRef.current = worker;
+        return () => {
+            worker.terminate();
+            workerRef.current = null;
+        };
+    }, []);
+
+    useEffect(() => {
+        const message: TicketFilterRequest = { type: 'load', tickets };
+        workerRef.current?.postMessage(message);
+    }, [tickets]);
+
+    // Tickets only carry a preview, so body text is also searched on the server;
+    // until its ids arrive the worker matches titles and previews
+    useEffect(() => {
+        if (debouncedSearch === '') {
+            return;
+        }
+        // A newer search (or unmounting) aborts this one's request
+        const controller = new AbortController();
+        fetchMatchingTicketIds(debouncedSearch, controller.signal)
+            .then(ids => {
+                if (!controller.signal.aborted && workerRef.current) {
+                    const message: TicketFilterRequest = { type: 'matches', search: debouncedSearch, ids: Array.from(ids) };
+                    workerRef.current.postMessage(message);
+                    setMatchesVersion(version => version + 1);
+                }
+            })
+            .catch(() => {
+                // Keep the title and preview matches
+            });
+        return () => {
+            controller.abort();
+        };
+    }, [debouncedSearch]);
+
+    useEffect(() => {
+        requestIdRef.current += 1;
+        const message: TicketFilterRequest = {
+            type: 'query',
+            requestId: requestIdRef.current,
+            query: {
+                types: Array.from(selectedTypes),
+                priorities: Array.from(selectedPriorities),
+                queues: Array.from(selectedQueues),
+                search: debouncedSearch,
+                sortBy,
+                sortOrder,
+            },
+        };
+        workerRef.current?.postMessage(message);
+    }, [tickets, selectedTypes, selectedPriorities, selectedQueues, debouncedSearch, sortBy, sortOrder, matchesVersion]);
+
+    // The stats header counts the tickets matching every active filter. Each
+    // filter group's badges show the server's disjunctive counts, which leave
+    // out that group's own selection, so its other values still show how many
+    // tickets selecting them would add.
+    useEffect(() => {
+        const filters = {
+            type: Array.from(selectedTypes),
+            priority: Array.from(selectedPriorities),
+            queue: Array.from(selectedQueues),
+            search: debouncedSearch,
+        };
+        if (filters.type.length === 0 && filters.priority.length === 0 && filters.queue.length === 0 && !filters.search) {
+            setFilteredFacets(null);
+            return;
+        }
+        let cancelled = false;
+        fetchTicketFacets(filters)
+            .then(counts => {
+                if (!cancelled) {
+                    setFilteredFacets(counts);
+                }
+            })
+            .catch(() => {
+                // Keep showing the previous counts
+            });
+        return () => {
+            cancelled = true;
+        };
+    }, [selectedTypes, selectedPriorities, selectedQueues, debouncedSearch]);
+
+    const openTicket = (ticket: Ticket) => {
+        setSelectedTicket(ticket);
+        if (ticket.description === undefined) {
+            fetchTicketById(ticket.id)
+                .then(full => setSelectedTicket(current => (current && current.id === full.id ? full : current)))
+                .catch(() => {
+                    // Keep showing the preview
+                });
+        }
+    };
+
+    // Facet values and counts come from the server, not from the loaded tickets.
+    // The values are always the unfiltered ones, so no option disappears.
+    const uniqueTypes = Object.keys(facets.status);
+    const uniquePriorities = Object.keys(facets.priority);
+    const uniqueQueues = Object.keys(facets.queue);
+    const matchingFacets = filteredFacets || facets;
+    const badgeFacets = matchingFacets.disjunctive;
+
+    const priorityCount = (level: string) => Object.entries(matchingFacets.priority)
+        .filter(([priority]) => priority.toLowerCase() === level)
+        .reduce((sum, [, count]) => sum + count, 0);
 
     const toggleType = (type: string) => {
         const newTypes = new Set(selectedTypes);
@@ -75,66 +214,20 @@ const TicketList: React.FC = () => {
         setSearchQuery('');
     };
 
-    const filteredTickets = tickets.filter(ticket => {
-        const matchesType = selectedTypes.size === 0 || (ticket.status && selectedTypes.has(ticket.status));
-        const matchesPriority = selectedPriorities.size === 0 || (ticket.priority && selectedPriorities.has(ticket.priority));
-        const matchesQueue = selectedQueues.size === 0 || (ticket.queue && selectedQueues.has(ticket.queue));
-        const matchesSearch = searchQuery === '' || 
-            ticket.title?.toLowerCase().includes(searchQuery.toLowerCase()) ||
-            ticket.description?.toLowerCase().includes(searchQuery.toLowerCase());
-        return matchesType && matchesPriority && matchesQueue && matchesSearch;
-    });
-
-    // Sort tickets
-    const sortedTickets = [...filteredTickets].sort((a, b) => {
-        let comparison = 0;
-        
-        if (sortBy === 'id') {
-            comparison = a.id - b.id;
-        } else if (sortBy === 'priority') {
-            const priorityOrder: { [key: string]: number } = { 'high': 3, 'medium': 2, 'low': 1 };
-            const aPriority = priorityOrder[a.priority?.toLowerCase() || ''] || 0;
-            const bPriority = priorityOrder[b.priority?.toLowerCase() || ''] || 0;
-            comparison = bPriority - aPriority;
-        } else if (sortBy === 'title') {
-            comparison = (a.title || '').localeCompare(b.title || '');
-        }
-        
-        return sortOrder === 'asc' ? comparison : -comparison;
-    });
-
-    // Pagination
-    const totalPages = Math.ceil(sortedTickets.length / itemsPerPage);
-    const startIndex = (currentPage - 1) * itemsPerPage;
-    const paginatedTickets = sortedTickets.slice(startIndex, startIndex + itemsPerPage);
-
-    // Reset to page 1 when filters change
-    useEffect(() => {
-        setCurrentPage(1);
-    }, [searchQuery, selectedTypes, selectedPriorities, selectedQueues]);
+    const resultCount = order ? order.length : 0;
 
+    // The server streams the CSV for the active filters straight to a download,
+    // so neither side holds the whole export in memory
     const exportToCSV = () => {
-        const headers = ['ID', 'Title', 'Description', 'Status', 'Priority', 'Queue', 'Language'];
-        const csvContent = [
-            headers.join(','),
-            ...filteredTickets.map(ticket => [
-                ticket.id,
-                `"${(ticket.title || '').replace(/"/g, '""')}"`,
-                `"${(ticket.description || '').replace(/"/g, '""')}"`,
-                ticket.status || '',
-                ticket.priority || '',
-                ticket.queue || '',
-                ticket.language || ''
-            ].join(','))
-        ].join('\n');
-
-        const blob = new Blob([csvContent], { type: 'text/csv' });
-        const url = window.URL.createObjectURL(blob);
         const a = document.createElement('a');
-        a.href = url;
+        a.href = ticketExportUrl({
+            type: Array.from(selectedTypes),
+            priority: Array.from(selectedPriorities),
+            queue: Array.from(selectedQueues),
+            search: searchQuery,
+        });
         a.download = `tickets_export_${new Date().toISOString().split('T')[0]}.csv`;
         a.click();
-        window.URL.revokeObjectURL(url);
     };
 
     if (loading) {
@@ -194,7 +287,7 @@ const TicketList: React.FC = () => {
                     border: '1px solid #dbeafe'
                 }}>
                     <div style={{ fontSize: '14px', color: '#1e40af', marginBottom: '4px' }}>Total Tickets</div>
-                    <div style={{ fontSize: '32px', fontWeight: 'bold', color: '#1e3a8a' }}>{tickets.length}</div>
+                    <div style={{ fontSize: '32px', fontWeight: 'bold', color: '#1e3a8a' }}>{matchingFacets.total}</div>
                 </div>
                 <div style={{
                     backgroundColor: '#fef2f2',
@@ -204,7 +297,7 @@ const TicketList: React.FC = () => {
                 }}>
                     <div style={{ fontSize: '14px', color: '#991b1b', marginBottom: '4px' }}>High Priority</div>
                     <div style={{ fontSize: '32px', fontWeight: 'bold', color: '#7f1d1d' }}>
-                        {tickets.filter(t => t.priority?.toLowerCase() === 'high').length}
+                        {priorityCount('high')}
                     </div>
                 </div>
                 <div style={{
@@ -215,7 +308,7 @@ const TicketList: React.FC = () => {
                 }}>
                     <div style={{ fontSize: '14px', color: '#854d0e', marginBottom: '4px' }}>Medium Priority</div>
                     <div style={{ fontSize: '32px', fontWeight: 'bold', color: '#713f12' }}>
-                        {tickets.filter(t => t.priority?.toLowerCase() === 'medium').length}
+                        {priorityCount('medium')}
                     </div>
                 </div>
                 <div style={{
@@ -226,7 +319,7 @@ const TicketList: React.FC = () => {
                 }}>
                     <div style={{ fontSize: '14px', color: '#166534', marginBottom: '4px' }}>Low Priority</div>
                     <div style={{ fontSize: '32px', fontWeight: 'bold', color: '#14532d' }}>
-                        {tickets.filter(t => t.priority?.toLowerCase() === 'low').length}
+                        {priorityCount('low')}
                     </div>
                 </div>
             </div>
@@ -378,7 +471,7 @@ const TicketList: React.FC = () => {
                                             padding: '2px 8px',
                                             borderRadius: '10px'
                                         }}>
-                                            {tickets.filter(t => t.status === type).length}
+                                            {badgeFacets.status[type] || 0}
                                         </span>
                                     </label>
                                 ))}
@@ -454,7 +547,7 @@ const TicketList: React.FC = () => {
                                                 padding: '2px 8px',
                                                 borderRadius: '10px'
                                             }}>
-                                                {tickets.filter(t => t.priority === priority).length}
+                                                {badgeFacets.priority[priority] || 0}
                                             </span>
                                         </label>
                                     );
@@ -518,7 +611,7 @@ const TicketList: React.FC = () => {
                                             padding: '2px 8px',
                                             borderRadius: '10px'
                                         }}>
-                                            {tickets.filter(t => t.queue === queue).length}
+                                            {badgeFacets.queue[queue] || 0}
                                         </span>
                                     </label>
                                 ))}
@@ -543,28 +636,8 @@ const TicketList: React.FC = () => {
             }}>
                 <div style={{ display: 'flex', alignItems: 'center', gap: '12px', flexWrap: 'wrap' }}>
                     <span style={{ color: '#6b7280', fontSize: '14px', fontWeight: '500' }}>
-                        Showing {startIndex + 1}-{Math.min(startIndex + itemsPerPage, sortedTickets.length)} of {sortedTickets.length} tickets
+                        Showing {resultCount} of {tickets.length} tickets
                     </span>
-                    
-                    {/* Items per page */}
-                    <select
-                        value={itemsPerPage}
-                        onChange={(e) => setItemsPerPage(Number(e.target.value))}
-                        style={{
-                            padding: '6px 12px',
-                            fontSize: '14px',
-                            border: '1px solid #e5e7eb',
-                            borderRadius: '6px',
-                            backgroundColor: '#ffffff',
-                            cursor: 'pointer',
-                            outline: 'none'
-                        }}
-                    >
-                        <option value={10}>10 per page</option>
-                        <option value={20}>20 per page</option>
-                        <option value={50}>50 per page</option>
-                        <option value={100}>100 per page</option>
-                    </select>
                 </div>
 
                 <div style={{ display: 'flex', gap: '8px', alignItems: 'center' }}>
@@ -634,7 +707,7 @@ const TicketList: React.FC = () => {
 
             {/* Ticket List */}
             <div>
-                {filteredTickets.length === 0 ? (
+                {order !== null && order.length === 0 ? (
                     <div style={{
                         textAlign: 'center',
                         padding: '60px 20px',
@@ -645,96 +718,14 @@ const TicketList: React.FC = () => {
                         <div style={{ fontSize: '14px' }}>Try adjusting your search or filter</div>
                     </div>
                 ) : (
-                    paginatedTickets.map(ticket => (
-                        <div key={ticket.id} onClick={() => setSelectedTicket(ticket)}>
-                            <TicketItem ticket={ticket} />
-                        </div>
-                    ))
+                    <VirtualTicketList
+                        tickets={tickets}
+                        order={order ?? new Int32Array(0)}
+                        onSelect={openTicket}
+                    />
                 )}
             </div>
 
-            {/* Pagination */}
-            {totalPages > 1 && (
-                <div style={{
-                    display: 'flex',
-                    justifyContent: 'center',
-                    alignItems: 'center',
-                    gap: '8px',
-                    marginTop: '32px',
-                    paddingBottom: '32px'
-                }}>
-                    <button
-                        onClick={() => setCurrentPage(prev => Math.max(1, prev - 1))}
-                        disabled={currentPage === 1}
-                        style={{
-                            padding: '8px 16px',
-                            fontSize: '14px',
-                            fontWeight: '500',
-                            border: '1px solid #e5e7eb',
-                            borderRadius: '6px',
-                            backgroundColor: currentPage === 1 ? '#f9fafb' : '#ffffff',
-                            color: currentPage === 1 ? '#9ca3af' : '#374151',
-                            cursor: currentPage === 1 ? 'not-allowed' : 'pointer'
-                        }}
-                    >
-                        ← Previous
-                    </button>
-
-                    <div style={{ display: 'flex', gap: '4px' }}>
-                        {Array.from({ length: Math.min(5, totalPages) }, (_, i) => {
-                            let pageNum;
-                            if (totalPages <= 5) {
-                                pageNum = i + 1;
-                            } else if (currentPage <= 3) {
-                                pageNum = i + 1;
-                            } else if (currentPage >= totalPages - 2) {
-                                pageNum = totalPages - 4 + i;
-                            } else {
-                                pageNum = currentPage - 2 + i;
-                            }
-
-                            return (
-                                <button
-                                    key={pageNum}
-                                    onClick={() => setCurrentPage(pageNum)}
-                                    style={{
-                                        width: '40px',
-                                        height: '40px',
-                                        fontSize: '14px',
-                                        fontWeight: currentPage === pageNum ? '600' : '500',
-                                        border: currentPage === pageNum ? 'none' : '1px solid #e5e7eb',
-                                        borderRadius: '6px',
-                                        backgroundColor: currentPage === pageNum ? '#3b82f6' : '#ffffff',
-                                        color: currentPage === pageNum ? '#ffffff' : '#374151',
-                                        cursor: 'pointer',
-                                        transition: 'all 0.2s'
-                                    }}
-                                >
-                                    {pageNum}
-                                </button>
-                            );
-                        })}
-                    </div>
-
-                    <button
-                        onClick={() => setCurrentPage(prev => Math.min(totalPages, prev + 1))}
-                        disabled={currentPage === totalPages}
-                        style={{
-                            padding: '8px 16px',
-                            fontSize: '14px',
-                            fontWeight: '500',
-                            border: '1px solid #e5e7eb',
-                            borderRadius: '6px',
-                            backgroundColor: currentPage === totalPages ? '#f9fafb' : '#ffffff',
-                            color: currentPage === totalPages ? '#9ca3af' : '#374151',
-                            cursor: currentPage === totalPages ? 'not-allowed' : 'pointer'
-                        }}
-                    >
-                        Next →
-                    </button>
-                </div>
-            )}
-
             {/* Ticket Detail Modal */}
             {selectedTicket && (
                 <div
@@ -853,7 +844,7 @@ const TicketList: React.FC = () => {
                                     color: '#374151',
                                     whiteSpace: 'pre-wrap'
                                 }}>
-                                    {selectedTicket.description || 'No description available'}
+                                    {selectedTicket.description || selectedTicket.preview || 'No description available'}
                                 </p>
                             </div>
 
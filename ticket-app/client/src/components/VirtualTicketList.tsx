@@ -0,0 +1,109 @@
+import React, { useEffect, useRef, useState } from 'react';
+import { Ticket } from '../types';
+import TicketItem from './TicketItem';
+
+// Every row gets the same slot so the visible range follows from scrollTop alone
+export const TICKET_ROW_HEIGHT = 212;
+// Rows rendered above and below the viewport to avoid blank edges while scrolling
+const OVERSCAN_ROWS = 4;
+
+interface VirtualTicketListProps {
+    tickets: Ticket[];
+    // Positions in tickets, in display order
+    order: Int32Array;
+    onSelect: (ticket: Ticket) => void;
+    height?: string;
+}
+
+// Windowed list: only the rows in (or near) the viewport are mounted, so the
+// DOM stays a few dozen nodes whether 20 or 100k tickets match
+const VirtualTicketList: React.FC<VirtualTicketListProps> = ({ tickets, order, onSelect, height = '70vh' }) => {
+    const containerRef = useRef<HTMLDivElement>(null);
+    const frameRef = useRef<number | null>(null);
+    const [scrollTop, setScrollTop] = useState<number>(0);
+    const [viewportHeight, setViewportHeight] = useState<number>(800);
+
+    useEffect(() => {
+        const measure = () => {
+            if (containerRef.current) {
+                setViewportHeight(containerRef.current.clientHeight);
+            }
+        };
+        measure();
+        window.addEventListener('resize', measure);
+        return () => window.removeEventListener('resize', measure);
+    }, []);
+
+    // New results start from the top, as a new page used to
+    useEffect(() => {
+        if (containerRef.current) {
+            containerRef.current.scrollTop = 0;
+        }
+        setScrollTop(0);
+    }, [order]);
+
+    useEffect(() => () => {
+        if (frameRef.current !== null) {
+            cancelAnimationFrame(frameRef.current);
+        }
+    }, []);
+
+    // At most one re-render per animation frame while scrolling
+    const handleScroll = () => {
+        if (frameRef.current !== null) {
+            return;
+        }
+        frameRef.current = requestAnimationFrame(() => {
+            frameRef.current = null;
+            if (containerRef.current) {
+                setScrollTop(containerRef.current.scrollTop);
+            }
+        });
+    };
+
+    const first = Math.max(0, Math.floor(scrollTop / TICKET_ROW_HEIGHT) - OVERSCAN_ROWS);
+    const last = Math.min(order.length, Math.ceil((scrollTop + viewportHeight) / TICKET_ROW_HEIGHT) + OVERSCAN_ROWS);
+    const rows = [];
+    for (let row = first; row < last; row++) {
+        const ticket = tickets[order[row]];
+        if (!ticket) {
+            continue;
+        }
+        rows.push(
+            <div
+                key={ticket.id}
+                onClick={() => onSelect(ticket)}
+                style={{
+                    position: 'absolute',
+                    top: row * TICKET_ROW_HEIGHT,
+                    left: 0,
+                    right: 0,
+                    height: TICKET_ROW_HEIGHT,
+                    overflow: 'hidden',
+                    padding: '2px 4px 0 4px',
+                    boxSizing: 'border-box'
+                }}
+            >
+                <TicketItem ticket={ticket} />
+            </div>
+        );
+    }
+
+    return (
+        <div
+            ref={containerRef}
+            onScroll={handleScroll}
+            style={{
+                height,
+                overflowY: 'auto',
+                position: 'relative'
+            }}
+        >
+            <div style={{ height: order.length * TICKET_ROW_HEIGHT, position: 'relative' }}>
+                {rows}
+            </div>
+        </div>
+    );
+};
+
+export default VirtualTicketList;
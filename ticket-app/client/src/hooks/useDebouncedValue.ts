@@ -0,0 +1,13 @@
+import { useEffect, useState } from 'react';
+
+// value, once it has stopped changing for delayMs
+export const useDebouncedValue = <T,>(value: T, delayMs: number): T => {
+    const [debounced, setDebounced] = useState<T>(value);
+
+    useEffect(() => {
+        const timer = setTimeout(() => setDebounced(value), delayMs);
+        return () => clearTimeout(timer);
+    }, [value, delayMs]);
+
+    return debounced;
+};
@@ -1,10 +1,14 @@
 import axios from 'axios';
+import { Ticket, TicketFacets, TicketQuery } from '../types';
 
 const API_URL = 'http://localhost:3001/api/tickets';
 
-export const fetchTickets = async () => {
+// Fields the list view needs; the full description is loaded per ticket
+export const LIST_FIELDS = ['id', 'title', 'preview', 'status', 'priority', 'queue', 'language'];
+
+export const fetchTickets = async (fields: string[] = LIST_FIELDS) => {
     try {
-        const response = await axios.get(API_URL);
+        const response = await axios.get(API_URL, { params: { fields: fields.join(',') } });
         return response.data;
     } catch (error) {
         const errorMessage = error instanceof Error ? error.message : 'Unknown error';
@@ -12,6 +16,77 @@ export const fetchTickets = async () => {
     }
 };
 
+// Multi-value filters are sent comma-separated; empty values are left out
+export const toQueryParams = (query: TicketQuery): Record<string, string | number> => {
+    const params: Record<string, string | number> = {};
+    Object.entries(query).forEach(([key, value]) => {
+        if (Array.isArray(value)) {
+            if (value.length > 0) {
+                params[key] = value.join(',');
+            }
+        } else if (value !== undefined && value !== null && value !== '') {
+            params[key] = value;
+        }
+    });
+    return params;
+};
+
+export const fetchTicketById = async (id: number): Promise<Ticket> => {
+    try {
+        const response = await axios.get(`${API_URL}/${id}`);
+        return response.data;
+    } catch (error) {
+        const errorMessage = error instanceof Error ? error.message : 'Unknown error';
+        throw new Error('Error fetching ticket: ' + errorMessage);
+    }
+};
+
+// Most ids a body search returns; matches past the cap still show when their
+// title or preview matches, since the list filters those itself
+export const MAX_SEARCH_MATCHES = 5000;
+
+// Ids of tickets whose subject or body contains the search text; the list
+// only holds previews, so full-text matching is left to the server. Aborting
+// the signal cancels the request and the server stops streaming.
+export const fetchMatchingTicketIds = async (search: string, signal?: AbortSignal): Promise<Set<number>> => {
+    try {
+        const response = await axios.get(`${API_URL}/export`, {
+            params: { search, fields: 'id', limit: MAX_SEARCH_MATCHES },
+            responseType: 'text',
+            signal,
+        });
+        const ids = String(response.data)
+            .split('\n')
+            .filter(line => line.trim() !== '')
+            .map(line => (JSON.parse(line) as { id: number }).id);
+        return new Set(ids);
+    } catch (error) {
+        const errorMessage = error instanceof Error ? error.message : 'Unknown error';
+        throw new Error('Error searching tickets: ' + errorMessage);
+    }
+};
+
+// Download URL for the server's streamed CSV export of the given filters
+export const ticketExportUrl = (
+    filters: TicketQuery = {}
+): string => {
+    const params = new URLSearchParams({ format: 'csv' });
+    Object.entries(toQueryParams(filters)).forEach(([key, value]) => params.set(key, String(value)));
+    return `${API_URL}/export?${params.toString()}`;
+};
+
+export const fetchTicketFacets = async (
+    filters: TicketQuery = {}
+): Promise<TicketFacets> => {
+    try {
+        const response = await axios.get(`${API_URL}/facets`, { params: toQueryParams(filters) });
+        return response.data;
+    } catch (error) {
+        const errorMessage = error instanceof Error ? error.message : 'Unknown error';
+        throw new Error('Error fetching ticket counts: ' + errorMessage);
+    }
+};
+
 export const createTicket = async (ticketData: {
     title: string;
     description: string;
@@ -1,7 +1,9 @@
 export interface Ticket {
     id: number;
     title: string;
-    description: string;
+    // Only returned when requested; list views load the preview instead
+    description?: string;
+    preview?: string;
     status?: string;
     priority?: string;
     queue?: string;
@@ -10,7 +12,24 @@ export interface Ticket {
     updatedAt?: string;
 }
 
-export interface TicketResponse {
-    tickets: Ticket[];
+export type TicketSortKey = 'id' | 'priority' | 'title';
+
+// Filters sent to the export and facet endpoints
+export interface TicketQuery {
+    type?: string[];
+    priority?: string[];
+    queue?: string[];
+    search?: string;
+}
+
+export interface TicketFacetCounts {
+    status: Record<string, number>;
+    priority: Record<string, number>;
+    queue: Record<string, number>;
+}
+
+// Counts matching every filter; disjunctive leaves out each facet's own filter
+export interface TicketFacets extends TicketFacetCounts {
     total: number;
-}
\ No newline at end of file
+    disjunctive: TicketFacetCounts;
+}
@@ -0,0 +1,148 @@
+import { Ticket, TicketSortKey } from '../types';
+
+// Filter, search and sort off the main thread. The tickets are sent once; each
+// query returns the matching positions in that array, already sorted, so the
+// UI only touches the rows it actually renders.
+
+export interface TicketFilterQuery {
+    types: string[];
+    priorities: string[];
+    queues: string[];
+    search: string;
+    sortBy: TicketSortKey;
+    sortOrder: 'asc' | 'desc';
+}
+
+export type TicketFilterRequest =
+    | { type: 'load'; tickets: Ticket[] }
+    // Ids the server matched for a search (it sees full bodies, the list only has previews)
+    | { type: 'matches'; search: string; ids: number[] }
+    | { type: 'query'; requestId: number; query: TicketFilterQuery };
+
+export interface TicketFilterResponse {
+    requestId: number;
+    order: Int32Array;
+}
+
+const PRIORITY_RANK: Record<string, number> = { high: 3, medium: 2, low: 1 };
+const MAX_CACHED_RESULTS = 16;
+
+const ctx = self as unknown as Worker;
+
+let tickets: Ticket[] = [];
+// Lower-cased title + preview per ticket, for local search
+let searchText: string[] = [];
+// Every ticket position in ascending order for each sort key; filtering walks
+// one of these, so results come out sorted without sorting per query
+let sortedBy: Record<TicketSortKey, Int32Array> = {
+    id: new Int32Array(0),
+    priority: new Int32Array(0),
+    title: new Int32Array(0),
+};
+let serverMatches: { search: string; ids: Set<number> } | null = null;
+let matchesVersion = 0;
+
+// Memoized results (ascending order), least recently used evicted first
+const results = new Map<string, Int32Array>();
+let lastResult: { query: TicketFilterQuery; key: string; order: Int32Array } | null = null;
+
+const sortPositions = (compare: (a: number, b: number) => number): Int32Array => {
+    const positions = Int32Array.from(tickets.keys());
+    // Equal keys fall back to id order, matching the server's keyset sort
+    return positions.sort((a, b) => compare(a, b) || tickets[a].id - tickets[b].id);
+};
+
+const load = (loaded: Ticket[]) => {
+    tickets = loaded;
+    searchText = tickets.map(ticket => `${ticket.title || ''}\n${ticket.preview || ticket.description || ''}`.toLowerCase());
+    const rank = tickets.map(ticket => PRIORITY_RANK[ticket.priority?.toLowerCase() || ''] || 0);
+    const collator = new Intl.Collator();
+    sortedBy = {
+        id: sortPositions(() => 0),
+        // As before, ascending priority lists high first
+        priority: sortPositions((a, b) => rank[b] - rank[a]),
+        title: sortPositions((a, b) => collator.compare(tickets[a].title || '', tickets[b].title || '')),
+    };
+    serverMatches = null;
+    results.clear();
+    lastResult = null;
+};
+
+const cacheKey = (query: TicketFilterQuery): string => JSON.stringify([
+    [...query.types].sort(),
+    [...query.priorities].sort(),
+    [...query.queues].sort(),
+    query.search.toLowerCase(),
+    query.sortBy,
+    serverMatches && serverMatches.search === query.search ? matchesVersion : -1,
+]);
+
+const filterPositions = (query: TicketFilterQuery): Int32Array => {
+    const types = new Set(query.types);
+    const priorities = new Set(query.priorities);
+    const queues = new Set(query.queues);
+    const search = query.search.toLowerCase();
+    const matchedIds = serverMatches && serverMatches.search === query.search ? serverMatches.ids : null;
+
+    // Typing more characters only narrows a local search, so start from the
+    // previous result when nothing else changed
+    let candidates = sortedBy[query.sortBy];
+    if (
+        lastResult &&
+        !matchedIds &&
+        search.startsWith(lastResult.query.search.toLowerCase()) &&
+        lastResult.key === cacheKey({ ...query, search: lastResult.query.search })
+    ) {
+        candidates = lastResult.order;
+    }
+
+    const matches: number[] = [];
+    for (const i of candidates) {
+        const ticket = tickets[i];
+        if (types.size > 0 && !(ticket.status && types.has(ticket.status))) {
+            continue;
+        }
+        if (priorities.size > 0 && !(ticket.priority && priorities.has(ticket.priority))) {
+            continue;
+        }
+        if (queues.size > 0 && !(ticket.queue && queues.has(ticket.queue))) {
+            continue;
+        }
+        if (search !== '' && !(matchedIds ? matchedIds.has(ticket.id) : searchText[i].includes(search))) {
+            continue;
+        }
+        matches.push(i);
+    }
+    return Int32Array.from(matches);
+};
+
+const runQuery = (query: TicketFilterQuery): Int32Array => {
+    const key = cacheKey(query);
+    let ascending = results.get(key);
+    if (ascending) {
+        results.delete(key);
+    } else {
+        ascending = filterPositions(query);
+    }
+    results.set(key, ascending);
+    if (results.size > MAX_CACHED_RESULTS) {
+        results.delete(results.keys().next().value as string);
+    }
+    lastResult = { query, key, order: ascending };
+    // Always a copy: the cached array stays here, the copy is transferred
+    return query.sortOrder === 'asc' ? ascending.slice() : ascending.slice().reverse();
+};
+
+ctx.onmessage = (event: MessageEvent<TicketFilterRequest>) => {
+    const message = event.data;
+    if (message.type === 'load') {
+        load(message.tickets);
+    } else if (message.type === 'matches') {
+        serverMatches = { search: message.search, ids: new Set(message.ids) };
+        matchesVersion++;
+    } else {
+        const order = runQuery(message.query);
+        const response: TicketFilterResponse = { requestId: message.requestId, order };
+        ctx.postMessage(response, [order.buffer]);
+    }
+};
@@ -1,14 +1,400 @@
-import sqlite3 from 'sqlite3';
+import sqlite3, { Database, RunResult, Statement } from 'sqlite3';
 import path from 'path';
+import { RANKED_SORT_EXPRESSIONS, SEARCH_TABLE, SORT_EXPRESSIONS } from '../utils/ticketQuery';
+import { TicketSortKey } from '../types';
 
 // Point to the data folder in the root ITDB directory
 const dbPath = path.join(__dirname, '../../../../data/english_support_tickets.db');
 
-export const db = new sqlite3.Database(dbPath, (err) => {
-  if (err) {
-    console.error('Error opening database:', err);
-    console.error('Attempted path:', dbPath);
-  } else {
-    console.log('Connected to SQLite database at:', dbPath);
+// Read-only connections queries are spread over; WAL lets them run while the writer commits
+const READ_POOL_SIZE = Number(process.env.DB_READ_POOL_SIZE) || 4;
+// Prepared statements kept per connection (least recently used are finalized)
+const STATEMENT_CACHE_SIZE = 100;
+const BUSY_TIMEOUT_MS = 5000;
+// How often to look for commits made by other processes between requests
+const DATA_VERSION_POLL_MS = 1000;
+
+// Indexes backing the /api/tickets filters and keyset sort orders
+const TICKET_INDEXES = [
+  // Covers the grouped facet counts
+  'CREATE INDEX IF NOT EXISTS idx_tickets_facets ON tickets (type, priority, queue)',
+  // Type-filtered id pages seek (type, rowid) here; in the facets index the
+  // rowid follows priority and queue, so those pages would sort every match
+  'CREATE INDEX IF NOT EXISTS idx_tickets_type ON tickets (type)',
+  'CREATE INDEX IF NOT EXISTS idx_tickets_priority ON tickets (priority)',
+  'CREATE INDEX IF NOT EXISTS idx_tickets_queue ON tickets (queue)',
+  `CREATE INDEX IF NOT EXISTS idx_tickets_priority_rank ON tickets (${SORT_EXPRESSIONS.priority})`,
+  `CREATE INDEX IF NOT EXISTS idx_tickets_title ON tickets (${SORT_EXPRESSIONS.title})`,
+];
+
+// In the normalized layout (see ticket_schema.py) `tickets` is a view over
+// ticket_rows, which the ingest already indexes on its lookup ids and
+// priority_rank; views cannot be indexed, so only the title sort index is
+// added to the table
+const NORMALIZED_INDEXES = [
+  `CREATE INDEX IF NOT EXISTS idx_ticket_rows_title ON ticket_rows (${SORT_EXPRESSIONS.title})`,
+];
+
+// External-content FTS5 index for ?search=: it stores only the trigram index and
+// reads subject and body from `tickets` (the table, or the normalized view).
+// Triggers on the table that stores the text keep it in sync, so rows written
+// by the Python scripts are indexed too. Compressed bodies (body_store.py) are
+// unreadable here, so that layout keeps the LIKE search.
+const SEARCH_TRIGGERS = ['insert', 'delete', 'update'].map(event => `${SEARCH_TABLE}_${event}`);
+
+const searchIndexSql = (source: string): string => {
+  const remove = `INSERT INTO ${SEARCH_TABLE} (${SEARCH_TABLE}, rowid, subject, body) ` +
+    "VALUES ('delete', old.rowid, old.subject, old.body);";
+  const add = `INSERT INTO ${SEARCH_TABLE} (rowid, subject, body) VALUES (new.rowid, new.subject, new.body);`;
+  return [
+    'BEGIN IMMEDIATE',
+    `CREATE VIRTUAL TABLE IF NOT EXISTS ${SEARCH_TABLE} USING fts5(subject, body, ` +
+      "content='tickets', content_rowid='rowid', tokenize='trigram')",
+    ...SEARCH_TRIGGERS.map(name => `DROP TRIGGER IF EXISTS ${name}`),
+    `CREATE TRIGGER ${SEARCH_TRIGGERS[0]} AFTER INSERT ON ${source} BEGIN ${add} END`,
+    `CREATE TRIGGER ${SEARCH_TRIGGERS[1]} AFTER DELETE ON ${source} BEGIN ${remove} END`,
+    `CREATE TRIGGER ${SEARCH_TRIGGERS[2]} AFTER UPDATE OF subject, body ON ${source} BEGIN ${remove} ${add} END`,
+    // Rows written while the triggers were missing (e.g. a re-ingest) are only picked up by a rebuild
+    `INSERT INTO ${SEARCH_TABLE} (${SEARCH_TABLE}) VALUES ('rebuild')`,
+    'COMMIT',
+  ].join(';\n');
+};
+
+type SqlParams = (string | number | null)[];
+
+interface PooledConnection {
+  db: Database;
+  statements: Map<string, Statement>;
+  pending: number;
+}
+
+export interface WriteResult {
+  lastID: number;
+  changes: number;
+}
+
+const openConnection = (mode: number, label: string, onOpen?: (db: Database) => void): PooledConnection => {
+  const db = new sqlite3.Database(dbPath, mode, (err) => {
+    if (err) {
+      console.error(`Error opening ${label} database connection:`, err);
+      console.error('Attempted path:', dbPath);
+      return;
+    }
+    db.configure('busyTimeout', BUSY_TIMEOUT_MS);
+    if (onOpen) {
+      onOpen(db);
+    }
+  });
+  return { db, statements: new Map(), pending: 0 };
+};
+
+let normalizedSchema = false;
+let rankedSchema = false;
+let compressedSchema = false;
+let searchIndexed = false;
+let searchBuilding = false;
+// Set when SQLite lacks FTS5 or the trigram tokenizer, so the build is not retried
+let searchUnavailable = false;
+
+// True when tickets is the view over ticket_rows and its lookup tables
+export const isNormalizedSchema = (): boolean => normalizedSchema;
+
+// Sort expressions for keyset pages; a normalized view sorts priority on its
+// indexed priority_rank column (databases normalized before it existed lack it)
+// True when ?search= can MATCH the full-text index instead of scanning with LIKE
+export const isSearchIndexed = (): boolean => searchIndexed;
+
+export const pageSortExpressions = (): Record<TicketSortKey, string> =>
+  rankedSchema ? RANKED_SORT_EXPRESSIONS : SORT_EXPRESSIONS;
+
+const detectSchema = (db: Database, callback?: () => void) => {
+  db.all(
+    "SELECT name, type, tbl_name FROM sqlite_master WHERE name IN ('tickets', 'ticket_bodies', ?) " +
+      "OR (type = 'trigger' AND name IN (?, ?, ?)) " +
+      "UNION ALL SELECT name, 'column', NULL FROM pragma_table_info('tickets') WHERE name = 'priority_rank'",
+    [SEARCH_TABLE, ...SEARCH_TRIGGERS],
+    (err: Error | null, rows: { name: string; type: string; tbl_name: string | null }[]) => {
+      if (!err) {
+        normalizedSchema = rows.some(row => row.name === 'tickets' && row.type === 'view');
+        rankedSchema = normalizedSchema && rows.some(row => row.name === 'priority_rank');
+        compressedSchema = rows.some(row => row.name === 'ticket_bodies');
+        // Triggers on a table that was dropped or renamed (a re-ingest or
+        // normalize) go with it, leaving the index stale
+        const source = normalizedSchema ? 'ticket_rows' : 'tickets';
+        searchIndexed = !compressedSchema && rows.some(row => row.name === SEARCH_TABLE) &&
+          SEARCH_TRIGGERS.every(name => rows.some(row => row.name === name && row.tbl_name === source));
+        // body_store.py's ticket_body() SQL function cannot be registered from node-sqlite3
+        if (compressedSchema) {
+          console.error('Ticket bodies are stored compressed; queries that read them will fail. ' +
+            'Re-ingest without --compress-bodies for the ticket app.');
+        }
+      }
+      if (callback) {
+        callback();
+      }
+    },
+  );
+};
+
+// Create or rebuild the full-text index when detectSchema found it missing or stale
+const ensureSearchIndex = () => {
+  if (searchIndexed || searchBuilding || searchUnavailable || compressedSchema) {
+    return;
+  }
+  searchBuilding = true;
+  const source = normalizedSchema ? 'ticket_rows' : 'tickets';
+  enqueueWrite((db, done) => {
+    db.exec(searchIndexSql(source), (err: Error | null) => {
+      searchBuilding = false;
+      if (err) {
+        console.error('Error building the search index, searching with LIKE:', err.message);
+        searchUnavailable = (err as Error & { code?: string }).code !== 'SQLITE_BUSY';
+        db.run('ROLLBACK', () => done());
+        return;
+      }
+      searchIndexed = true;
+      done();
+    });
+  });
+};
+
+const initializeWriter = (db: Database) => {
+  console.log('Connected to SQLite database at:', dbPath);
+  db.serialize(() => {
+    db.run('PRAGMA journal_mode = WAL', (err) => {
+      if (err) {
+        console.error('Error enabling WAL mode:', err.message);
+      }
+    });
+    db.run('PRAGMA synchronous = NORMAL');
+  });
+  detectSchema(db, () => {
+    (normalizedSchema ? NORMALIZED_INDEXES : TICKET_INDEXES).forEach(sql => {
+      db.run(sql, (err) => {
+        if (err) {
+          console.error('Error creating index:', err.message);
+        }
+      });
+    });
+    ensureSearchIndex();
+  });
+};
+
+// The single connection that writes; WAL mode and indexes are set up through it
+const writer = openConnection(sqlite3.OPEN_READWRITE | sqlite3.OPEN_CREATE, 'writer', initializeWriter);
+
+const readers: PooledConnection[] = Array.from({ length: READ_POOL_SIZE }, (_, i) =>
+  openConnection(sqlite3.OPEN_READONLY, `reader ${i + 1}`)
+);
+
+// Cached prepared statement for this SQL on this connection. node-sqlite3 queues
+// calls on a statement until it is prepared, so it can be used right away.
+const statementFor = (conn: PooledConnection, sql: string): Statement => {
+  const cached = conn.statements.get(sql);
+  if (cached) {
+    // Re-insert to mark as most recently used
+    conn.statements.delete(sql);
+    conn.statements.set(sql, cached);
+    return cached;
+  }
+
+  const statement = conn.db.prepare(sql, (err: Error | null) => {
+    if (err && conn.statements.get(sql) === statement) {
+      conn.statements.delete(sql);
+    }
+  });
+  conn.statements.set(sql, statement);
+
+  if (conn.statements.size > STATEMENT_CACHE_SIZE) {
+    const [oldestSql, oldest] = conn.statements.entries().next().value as [string, Statement];
+    conn.statements.delete(oldestSql);
+    oldest.finalize();
   }
-});
\ No newline at end of file
+  return statement;
+};
+
+// Least busy reader; with an idle pool this spreads requests round the connections
+const acquireReader = (): PooledConnection =>
+  readers.reduce((best, conn) => (conn.pending < best.pending ? conn : best));
+
+export const readAll = <T>(sql: string, params: SqlParams, callback: (err: Error | null, rows: T[]) => void) => {
+  const conn = acquireReader();
+  conn.pending++;
+  statementFor(conn, sql).all(params, (err: Error | null, rows: T[]) => {
+    conn.pending--;
+    callback(err, rows);
+  });
+};
+
+export const readGet = <T>(sql: string, params: SqlParams, callback: (err: Error | null, row: T | undefined) => void) => {
+  const conn = acquireReader();
+  conn.pending++;
+  const statement = statementFor(conn, sql);
+  statement.get(params, (err: Error | null, row: T | undefined) => {
+    // get() leaves the cursor (and its read snapshot) open until reset
+    statement.reset(() => {
+      conn.pending--;
+      callback(err, row);
+    });
+  });
+};
+
+// Change marker for response caching. Writes made here bump writeCount as they
+// commit. PRAGMA data_version, read on a connection of its own, changes when
+// any other connection commits: the writer, or another process such as the
+// Python scripts. It is re-read before every cached response, and polled so a
+// re-ingest is noticed between requests too. The boot id keeps markers from a
+// previous server run from matching.
+const bootId = Date.now().toString(36);
+let writeCount = 0;
+let externalVersion = 0;
+
+const versionConnection = openConnection(sqlite3.OPEN_READONLY, 'data version');
+
+export const refreshDataVersion = (callback: (version: string) => void) => {
+  versionConnection.db.get('PRAGMA data_version', (err: Error | null, row: { data_version: number } | undefined) => {
+    if (!err && row) {
+      if (row.data_version !== externalVersion) {
+        // Another process may have re-ingested in the other layout
+        detectSchema(writer.db, ensureSearchIndex);
+      }
+      externalVersion = row.data_version;
+    }
+    callback(getDataVersion());
+  });
+};
+
+setInterval(() => refreshDataVersion(() => undefined), DATA_VERSION_POLL_MS).unref();
+
+export const getDataVersion = (): string => `${bootId}-${externalVersion}-${writeCount}`;
+
+// Writes go through one connection, one task at a time, so a multi-statement
+// task (e.g. a transaction) never interleaves with another request's writes
+type WriteTask = (db: Database, done: () => void) => void;
+const writeQueue: WriteTask[] = [];
+let writeInProgress = false;
+
+const runNextWrite = () => {
+  const task = writeQueue.shift();
+  if (!task) {
+    writeInProgress = false;
+    return;
+  }
+  writeInProgress = true;
+  task(writer.db, runNextWrite);
+};
+
+export const enqueueWrite = (task: WriteTask) => {
+  writeQueue.push(task);
+  if (!writeInProgress) {
+    runNextWrite();
+  }
+};
+
+export const write = (sql: string, params: SqlParams, callback: (err: Error | null, result: WriteResult) => void) => {
+  enqueueWrite((_db, done) => {
+    statementFor(writer, sql).run(params, function (this: RunResult, err: Error | null) {
+      const result = { lastID: this.lastID, changes: this.changes };
+      if (!err) {
+        writeCount++;
+      }
+      done();
+      callback(err, result);
+    });
+  });
+};
+
+// Insert one row and return its rowid. An insert through the normalized
+// tickets view runs in an INSTEAD OF trigger, which leaves last_insert_rowid
+// unchanged, so the new rowid is read back inside the same transaction.
+export const insertRow = (sql: string, params: SqlParams, callback: (err: Error | null, result: WriteResult) => void) => {
+  if (!normalizedSchema) {
+    write(sql, params, callback);
+    return;
+  }
+  enqueueWrite((db, done) => {
+    const finish = (err: Error | null, result: WriteResult) => {
+      done();
+      callback(err, result);
+    };
+    const rollback = (err: Error) => db.run('ROLLBACK', () => finish(err, { lastID: 0, changes: 0 }));
+
+    db.run('BEGIN IMMEDIATE', (beginErr: Error | null) => {
+      if (beginErr) {
+        finish(beginErr, { lastID: 0, changes: 0 });
+        return;
+      }
+      statementFor(writer, sql).run(params, (err: Error | null) => {
+        if (err) {
+          rollback(err);
+          return;
+        }
+        db.get('SELECT MAX(rowid) AS id FROM ticket_rows', (readErr: Error | null, row: { id: number } | undefined) => {
+          if (readErr) {
+            rollback(readErr);
+            return;
+          }
+          db.run('COMMIT', (commitErr: Error | null) => {
+            if (commitErr) {
+              rollback(commitErr);
+              return;
+            }
+            writeCount++;
+            finish(null, { lastID: row ? row.id : 0, changes: 1 });
+          });
+        });
+      });
+    });
+  });
+};
+
+// Run one statement for many parameter sets in a single transaction. Rows that
+// fail get their Error in the results array; the others are still committed.
+export const writeMany = (
+  sql: string,
+  paramsList: SqlParams[],
+  callback: (err: Error | null, results: (WriteResult | Error)[]) => void,
+) => {
+  enqueueWrite((db, done) => {
+    const results: (WriteResult | Error)[] = new Array(paramsList.length);
+    const finish = (err: Error | null) => {
+      done();
+      callback(err, results);
+    };
+
+    db.run('BEGIN IMMEDIATE', (beginErr: Error | null) => {
+      if (beginErr) {
+        finish(beginErr);
+        return;
+      }
+      const commit = () => {
+        db.run('COMMIT', (commitErr: Error | null) => {
+          if (commitErr) {
+            db.run('ROLLBACK', () => finish(commitErr));
+            return;
+          }
+          writeCount++;
+          finish(null);
+        });
+      };
+
+      let remaining = paramsList.length;
+      if (remaining === 0) {
+        commit();
+        return;
+      }
+      // Statement calls run in the order they are issued
+      const statement = statementFor(writer, sql);
+      paramsList.forEach((params, i) => {
+        statement.run(params, function (this: RunResult, err: Error | null) {
+          results[i] = err ? err : { lastID: this.lastID, changes: this.changes };
+          if (--remaining === 0) {
+            commit();
+          }
+        });
+      });
+    });
+  });
+};
+
+export { writer as writeConnection };
@@ -1,21 +1,263 @@
 import { Request, Response } from 'express';
-import { db } from '../config/database';
-import { Ticket } from '../types';
+import {
+  insertRow,
+  isNormalizedSchema,
+  isSearchIndexed,
+  pageSortExpressions,
+  readAll,
+  readGet,
+  writeMany,
+} from '../config/database';
+import { BulkCreateResult, Ticket, TicketFacets, TicketPage } from '../types';
+import {
+  TICKET_COLUMNS,
+  buildPageQuery,
+  encodeCursor,
+  buildWhereClause,
+  isPagedRequest,
+  parseFieldColumns,
+  parseFieldList,
+  parsePageOptions,
+  parseTicketFilters,
+} from '../utils/ticketQuery';
+import {
+  BULK_BATCH_SIZE,
+  BULK_INSERT_SQL,
+  MAX_REPORTED_ERRORS,
+  createLineSplitter,
+  validateTicketInput,
+} from '../utils/bulkTickets';
+import { csvRow } from '../utils/csv';
+
+const EXPORT_BATCH_SIZE = 1000;
+
+// ?limit= on the export: stop after this many rows (default: every match)
+const parseExportLimit = (query: Request['query']): number | { error: string } => {
+  if (query.limit === undefined) {
+    return Infinity;
+  }
+  const limit = Number(query.limit);
+  return Number.isInteger(limit) && limit >= 1 ? limit : { error: 'limit must be a positive integer' };
+};
 
 export const getAllTickets = (req: Request, res: Response) => {
-  // Fetch all tickets (remove LIMIT for full dataset)
-  db.all('SELECT rowid as id, subject as title, body as description, type as status, priority, queue, language FROM tickets', [], (err, rows: Ticket[]) => {
+  if (!isPagedRequest(req.query)) {
+    // No filter or page parameters: keep returning the full table as before
+    const columns = parseFieldColumns(req.query);
+    if (typeof columns !== 'string') {
+      res.status(400).json({ error: columns.error });
+      return;
+    }
+    readAll<Ticket>(`SELECT ${columns} FROM tickets`, [], (err, rows) => {
+      if (err) {
+        res.status(500).json({ error: err.message });
+        return;
+      }
+      res.json(rows);
+    });
+    return;
+  }
+
+  const options = parsePageOptions(req.query);
+  if ('error' in options) {
+    res.status(400).json({ error: options.error });
+    return;
+  }
+
+  const { sql, params } = buildPageQuery(options, pageSortExpressions(), isSearchIndexed());
+  readAll<Ticket & { sort_value: string | number }>(sql, params, (err, rows) => {
     if (err) {
       res.status(500).json({ error: err.message });
       return;
     }
-    res.json(rows);
+    const hasMore = rows.length > options.limit;
+    const pageRows = hasMore ? rows.slice(0, options.limit) : rows;
+    const last = pageRows[pageRows.length - 1];
+    const page: TicketPage = {
+      tickets: pageRows.map(({ sort_value, ...ticket }) => ticket),
+      nextCursor: hasMore && last ? encodeCursor(last.sort_value, last.id) : null,
+      limit: options.limit,
+    };
+    res.json(page);
+  });
+};
+
+// Stream every ticket matching the request filters (up to ?limit=), EXPORT_BATCH_SIZE
+// rows at a time. Each batch continues after the last rowid written (a rowid cursor) and
+// the next batch is only read once the socket has drained, so server memory is
+// bounded by one batch however large the table is.
+const streamTickets = (
+  req: Request,
+  res: Response,
+  contentType: string,
+  formatRows: (rows: Ticket[]) => string,
+  header = '',
+) => {
+  const columns = parseFieldColumns(req.query);
+  if (typeof columns !== 'string') {
+    res.status(400).json({ error: columns.error });
+    return;
+  }
+  const limit = parseExportLimit(req.query);
+  if (typeof limit !== 'number') {
+    res.status(400).json({ error: limit.error });
+    return;
+  }
+  const { clauses, params } = buildWhereClause(parseTicketFilters(req.query), isSearchIndexed());
+  const where = [...clauses, 'rowid > ?'].join(' AND ');
+  const sql = `SELECT ${columns} FROM tickets WHERE ${where} ORDER BY rowid LIMIT ?`;
+
+  let lastId = 0;
+  let remaining = limit;
+  let closed = false;
+  res.on('close', () => {
+    closed = true;
+  });
+  res.status(200).type(contentType);
+  if (header) {
+    res.write(header);
+  }
+
+  const writeNextBatch = () => {
+    readAll<Ticket>(sql, [...params, lastId, Math.min(EXPORT_BATCH_SIZE, remaining)], (err, rows) => {
+      if (closed) {
+        return;
+      }
+      if (err) {
+        if (!res.headersSent) {
+          res.status(500).json({ error: err.message });
+        } else {
+          res.destroy(err);
+        }
+        return;
+      }
+      if (rows.length === 0) {
+        res.end();
+        return;
+      }
+      lastId = rows[rows.length - 1].id;
+      remaining -= rows.length;
+      const flushed = res.write(formatRows(rows));
+      if (remaining <= 0) {
+        res.end();
+      } else if (flushed) {
+        writeNextBatch();
+      } else {
+        res.once('drain', writeNextBatch);
+      }
+    });
+  };
+
+  writeNextBatch();
+};
+
+// ?format=csv streams the same rows as a CSV download, one column per field
+export const exportTickets = (req: Request, res: Response) => {
+  const format = req.query.format === undefined ? 'ndjson' : req.query.format;
+
+  if (format === 'csv') {
+    const fields = parseFieldList(req.query);
+    if (!Array.isArray(fields)) {
+      res.status(400).json({ error: fields.error });
+      return;
+    }
+    const date = new Date().toISOString().split('T')[0];
+    res.setHeader('Content-Disposition', `attachment; filename="tickets_export_${date}.csv"`);
+    streamTickets(
+      req,
+      res,
+      'text/csv; charset=utf-8',
+      rows => rows.map(row => csvRow(fields.map(field => (row as unknown as Record<string, unknown>)[field]))).join(''),
+      csvRow(fields),
+    );
+    return;
+  }
+
+  if (format !== 'ndjson') {
+    res.status(400).json({ error: `Invalid format: ${String(req.query.format)}` });
+    return;
+  }
+  streamTickets(req, res, 'application/x-ndjson', rows =>
+    rows.map(row => JSON.stringify(row)).join('\n') + '\n'
+  );
+};
+
+interface FacetRow {
+  type: string | null;
+  priority: string | null;
+  queue: string | null;
+  count: number;
+}
+
+// One grouped pass over the (type, priority, queue) index with only the search
+// applied; the filtered and disjunctive counts are both rolled up from those
+// combinations, so one request answers the stats header and every badge
+export const getTicketFacets = (req: Request, res: Response) => {
+  const filters = parseTicketFilters(req.query);
+  const { clauses, params } = buildWhereClause(
+    { types: [], priorities: [], queues: [], search: filters.search },
+    isSearchIndexed(),
+  );
+  const where = clauses.length > 0 ? `WHERE ${clauses.join(' AND ')}` : '';
+  // Normalized databases are grouped on the lookup ids and only the grouped
+  // rows joined back to names, rather than every row through the view
+  const sql = isNormalizedSchema()
+    ? `SELECT t.name AS type, p.name AS priority, q.name AS queue, c.count FROM
+         (SELECT type_id, priority_id, queue_id, COUNT(*) AS count FROM ticket_rows
+          ${where ? `WHERE rowid IN (SELECT rowid FROM tickets ${where})` : ''}
+          GROUP BY type_id, priority_id, queue_id) c
+       LEFT JOIN ticket_types t ON t.id = c.type_id
+       LEFT JOIN ticket_priorities p ON p.id = c.priority_id
+       LEFT JOIN ticket_queues q ON q.id = c.queue_id`
+    : `SELECT type, priority, queue, COUNT(*) as count FROM tickets ${where} GROUP BY type, priority, queue`;
+
+  readAll<FacetRow>(sql, params, (err, rows) => {
+    if (err) {
+      res.status(500).json({ error: err.message });
+      return;
+    }
+    const facets: TicketFacets = {
+      total: 0,
+      status: {},
+      priority: {},
+      queue: {},
+      disjunctive: { status: {}, priority: {}, queue: {} },
+    };
+    // Same semantics as the IN (...) filters: an empty list matches every row
+    const selected = (values: string[], value: string | null) =>
+      values.length === 0 || (value !== null && values.includes(value));
+    const addCount = (counts: Record<string, number>, value: string | null, count: number) => {
+      if (value) {
+        counts[value] = (counts[value] || 0) + count;
+      }
+    };
+    rows.forEach(row => {
+      const type = selected(filters.types, row.type);
+      const priority = selected(filters.priorities, row.priority);
+      const queue = selected(filters.queues, row.queue);
+      if (type && priority && queue) {
+        facets.total += row.count;
+        addCount(facets.status, row.type, row.count);
+        addCount(facets.priority, row.priority, row.count);
+        addCount(facets.queue, row.queue, row.count);
+      }
+      if (priority && queue) {
+        addCount(facets.disjunctive.status, row.type, row.count);
+      }
+      if (type && queue) {
+        addCount(facets.disjunctive.priority, row.priority, row.count);
+      }
+      if (type && priority) {
+        addCount(facets.disjunctive.queue, row.queue, row.count);
+      }
+    });
+    res.json(facets);
   });
 };
 
 export const getTicketById = (req: Request, res: Response) => {
   const { id } = req.params;
-  db.get('SELECT rowid as id, subject as title, body as description, type as status, priority, queue, language FROM tickets WHERE rowid = ?', [id], (err, row: Ticket) => {
+  readGet<Ticket>(`SELECT ${TICKET_COLUMNS} FROM tickets WHERE rowid = ?`, [id], (err, row) => {
     if (err) {
       res.status(500).json({ error: err.message });
       return;
@@ -33,11 +275,130 @@ export const createTicket = (req: Request, res: Response) => {
   const query = `INSERT INTO tickets (subject, body, type, priority) 
                  VALUES (?, ?, ?, ?)`;
   
-  db.run(query, [title, description, status, priority], function(err) {
+  insertRow(query, [title, description, status, priority], (err, result) => {
     if (err) {
       res.status(500).json({ error: err.message });
       return;
     }
-    res.status(201).json({ id: this.lastID, title, description, status, priority });
+    res.status(201).json({ id: result.lastID, title, description, status, priority });
+  });
+};
+
+// Batches being written before an NDJSON upload is paused
+const MAX_BULK_BATCHES_IN_FLIGHT = 2;
+
+// Create many tickets from a JSON array or an NDJSON body. Rows are inserted in
+// transactions of BULK_BATCH_SIZE; an invalid or failing row is reported by its
+// position in the input and does not stop the rest of the import.
+export const createTicketsBulk = (req: Request, res: Response) => {
+  const streaming = Boolean(req.is('application/x-ndjson'));
+  if (!streaming && !Array.isArray(req.body)) {
+    res.status(400).json({ error: 'Expected a JSON array or an application/x-ndjson body' });
+    return;
+  }
+
+  const result: BulkCreateResult = { received: 0, inserted: 0, failed: 0, errors: [] };
+  let batch: { index: number; params: (string | null)[] }[] = [];
+  let inFlight = 0;
+  let ended = false;
+  let responded = false;
+
+  const reject = (index: number, error: string) => {
+    result.failed++;
+    if (result.errors.length < MAX_REPORTED_ERRORS) {
+      result.errors.push({ index, error });
+    }
+  };
+
+  const finishIfDone = () => {
+    if (!ended || inFlight > 0 || responded) {
+      return;
+    }
+    responded = true;
+    const status = result.failed === 0 ? 201 : result.inserted > 0 ? 207 : 400;
+    res.status(status).json(result);
+  };
+
+  const flush = () => {
+    if (batch.length === 0) {
+      return;
+    }
+    const rows = batch;
+    batch = [];
+    inFlight++;
+    if (streaming && inFlight >= MAX_BULK_BATCHES_IN_FLIGHT) {
+      req.pause();
+    }
+    writeMany(BULK_INSERT_SQL, rows.map(row => row.params), (err, results) => {
+      inFlight--;
+      rows.forEach((row, i) => {
+        const outcome = err || results[i];
+        if (outcome instanceof Error) {
+          reject(row.index, outcome.message);
+        } else {
+          result.inserted++;
+        }
+      });
+      if (streaming && !ended && inFlight < MAX_BULK_BATCHES_IN_FLIGHT) {
+        req.resume();
+      }
+      finishIfDone();
+    });
+  };
+
+  const addTicket = (index: number, value: unknown) => {
+    result.received++;
+    const checked = validateTicketInput(value);
+    if ('error' in checked) {
+      reject(index, checked.error);
+      return;
+    }
+    batch.push({ index, params: checked.params });
+    if (batch.length >= BULK_BATCH_SIZE) {
+      flush();
+    }
+  };
+
+  const endInput = () => {
+    ended = true;
+    flush();
+    finishIfDone();
+  };
+
+  if (!streaming) {
+    (req.body as unknown[]).forEach((value, index) => addTicket(index, value));
+    endInput();
+    return;
+  }
+
+  // NDJSON is parsed as it arrives; blank lines are skipped and not counted
+  let lineIndex = 0;
+  const lines = createLineSplitter(line => {
+    if (line.trim() === '') {
+      return;
+    }
+    const index = lineIndex++;
+    let value: unknown;
+    try {
+      value = JSON.parse(line);
+    } catch {
+      result.received++;
+      reject(index, 'Invalid JSON');
+      return;
+    }
+    addTicket(index, value);
+  });
+
+  req.setEncoding('utf8');
+  req.on('data', (chunk: string) => lines.write(chunk));
+  req.on('end', () => {
+    lines.end();
+    endInput();
   });
-};
\ No newline at end of file
+  req.on('error', (err: Error) => {
+    if (!responded) {
+      responded = true;
+      res.status(400).json({ error: err.message });
+    }
+  });
+};
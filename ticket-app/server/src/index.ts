@@ -1,13 +1,16 @@
 import express from 'express';
 import cors from 'cors';
 import ticketRoutes from './routes/ticketRoutes';
+import { compressResponses } from './utils/compression';
 
 const app = express();
 const PORT = process.env.PORT || 3001;
 
 // Middleware
 app.use(cors());
-app.use(express.json());
+app.use(compressResponses);
+// Bulk imports may post large JSON arrays; bigger uploads should use NDJSON
+app.use(express.json({ limit: '10mb' }));
 
 // Routes
 app.use('/api', ticketRoutes);
@@ -1,10 +1,22 @@
 import express from 'express';
-import { getAllTickets, getTicketById, createTicket } from '../controllers/ticketController';
+import {
+  getAllTickets,
+  getTicketById,
+  createTicket,
+  createTicketsBulk,
+  exportTickets,
+  getTicketFacets,
+} from '../controllers/ticketController';
+import { cacheJsonResponse } from '../utils/responseCache';
 
 const router = express.Router();
 
-router.get('/tickets', getAllTickets);
-router.get('/tickets/:id', getTicketById);
+router.get('/tickets', cacheJsonResponse, getAllTickets);
+// Must be registered before /tickets/:id so these paths are not read as ids
+router.get('/tickets/export', exportTickets);
+router.get('/tickets/facets', cacheJsonResponse, getTicketFacets);
+router.get('/tickets/:id', cacheJsonResponse, getTicketById);
 router.post('/tickets', createTicket);
+router.post('/tickets/bulk', createTicketsBulk);
 
 export default router;
\ No newline at end of file
@@ -2,13 +2,79 @@ export interface Ticket {
   id: number;
   title: string;
   description: string;
+  preview?: string;
   status: string;
   priority: string;
-  created_at: string;
-  updated_at: string;
+  queue?: string;
+  language?: string;
+  created_at?: string;
+  updated_at?: string;
 }
 
 export interface TicketRequest {
     title: string;
     description: string;
-}
\ No newline at end of file
+}
+
+export type TicketSortKey = 'id' | 'priority' | 'title';
+export type SortOrder = 'asc' | 'desc';
+
+export interface TicketFilters {
+  types: string[];
+  priorities: string[];
+  queues: string[];
+  search: string;
+}
+
+export interface TicketPageOptions {
+  filters: TicketFilters;
+  // SQL select list from ?fields=
+  columns: string;
+  sort: TicketSortKey;
+  order: SortOrder;
+  limit: number;
+  cursor: [string | number, number] | null;
+}
+
+export interface TicketPage {
+  tickets: Ticket[];
+  nextCursor: string | null;
+  limit: number;
+}
+
+// Counts per facet value; status is the API name of the type column
+export interface TicketFacetCounts {
+  status: Record<string, number>;
+  priority: Record<string, number>;
+  queue: Record<string, number>;
+}
+
+// Counts of the tickets matching every filter, plus the disjunctive counts
+// for multi-select badges: each facet's values counted with every filter
+// except that facet's own, so unselected values show what selecting them adds
+export interface TicketFacets extends TicketFacetCounts {
+  total: number;
+  disjunctive: TicketFacetCounts;
+}
+
+// One ticket in a bulk create request (same fields as POST /api/tickets)
+export interface TicketInput {
+  title?: string;
+  description: string;
+  status?: string;
+  priority?: string;
+  queue?: string;
+  language?: string;
+}
+
+export interface BulkTicketError {
+  index: number;
+  error: string;
+}
+
+export interface BulkCreateResult {
+  received: number;
+  inserted: number;
+  failed: number;
+  errors: BulkTicketError[];
+}
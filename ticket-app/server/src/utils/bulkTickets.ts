@@ -0,0 +1,57 @@
+import { TicketInput } from '../types';
+
+export const BULK_BATCH_SIZE = 500;
+// Per-row errors listed in the response; the failed count is always exact
+export const MAX_REPORTED_ERRORS = 1000;
+
+export const BULK_INSERT_SQL = `INSERT INTO tickets (subject, body, type, priority, queue, language)
+                                VALUES (?, ?, ?, ?, ?, ?)`;
+
+// Imported tickets often have no subject, so only the body is required
+const OPTIONAL_FIELDS = ['title', 'status', 'priority', 'queue', 'language'] as const;
+
+// Check one incoming ticket; returns the insert parameters or a reason it was rejected
+export const validateTicketInput = (value: unknown): { params: (string | null)[] } | { error: string } => {
+  if (typeof value !== 'object' || value === null || Array.isArray(value)) {
+    return { error: 'Ticket must be a JSON object' };
+  }
+  const ticket = value as Partial<Record<keyof TicketInput, unknown>>;
+  if (typeof ticket.description !== 'string' || ticket.description.trim() === '') {
+    return { error: 'description is required' };
+  }
+  for (const field of OPTIONAL_FIELDS) {
+    if (ticket[field] !== undefined && ticket[field] !== null && typeof ticket[field] !== 'string') {
+      return { error: `${field} must be a string` };
+    }
+  }
+  const optional = (field: typeof OPTIONAL_FIELDS[number]) => (ticket[field] as string | undefined) ?? null;
+  return {
+    params: [
+      optional('title'),
+      ticket.description,
+      optional('status'),
+      optional('priority'),
+      optional('queue'),
+      optional('language'),
+    ],
+  };
+};
+
+// Split a text stream into lines across chunk boundaries
+export const createLineSplitter = (onLine: (line: string) => void) => {
+  let buffered = '';
+  return {
+    write(chunk: string) {
+      buffered += chunk;
+      const lines = buffered.split('\n');
+      buffered = lines.pop() ?? '';
+      lines.forEach(onLine);
+    },
+    end() {
+      if (buffered) {
+        onLine(buffered);
+        buffered = '';
+      }
+    },
+  };
+};
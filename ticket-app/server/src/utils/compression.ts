@@ -0,0 +1,127 @@
+import zlib from 'zlib';
+import { NextFunction, Request, Response } from 'express';
+
+// Bodies smaller than this are sent as-is; compressing them saves nothing
+const MIN_COMPRESS_BYTES = 1024;
+// Mid-range brotli quality: close to the best ratio for JSON at a fraction of
+// the CPU of the default (11), which matters for full-table responses
+const BROTLI_QUALITY = 5;
+const COMPRESSIBLE_TYPES = /json|ndjson|text|csv|javascript/i;
+
+type Encoding = 'br' | 'gzip';
+
+// Prefer brotli, then gzip; q=0 means the client refuses that encoding
+const negotiateEncoding = (header: string | string[] | undefined): Encoding | null => {
+  const accepted = new Map<string, number>();
+  (Array.isArray(header) ? header.join(',') : header || '').split(',').forEach(part => {
+    const [name, ...options] = part.trim().toLowerCase().split(';');
+    const quality = options.find(option => option.trim().startsWith('q='));
+    accepted.set(name, quality ? Number(quality.trim().slice(2)) : 1);
+  });
+  const allows = (encoding: Encoding) => (accepted.get(encoding) ?? accepted.get('*') ?? 0) > 0;
+  if (allows('br')) {
+    return 'br';
+  }
+  if (allows('gzip')) {
+    return 'gzip';
+  }
+  return null;
+};
+
+const createEncoder = (encoding: Encoding): zlib.Gzip | zlib.BrotliCompress =>
+  encoding === 'br'
+    ? zlib.createBrotliCompress({ params: { [zlib.constants.BROTLI_PARAM_QUALITY]: BROTLI_QUALITY } })
+    : zlib.createGzip();
+
+const appendVary = (res: Response) => {
+  const vary = res.getHeader('Vary');
+  if (!vary) {
+    res.setHeader('Vary', 'Accept-Encoding');
+  } else if (!String(vary).toLowerCase().includes('accept-encoding')) {
+    res.setHeader('Vary', `${vary}, Accept-Encoding`);
+  }
+};
+
+// gzip/brotli response compression built on Node's zlib. res.write/res.end are
+// routed through an encoder once the first chunk shows the response is worth
+// compressing; streamed responses keep their backpressure because the
+// encoder's drain is forwarded to the response.
+export const compressResponses = (req: Request, res: Response, next: NextFunction) => {
+  const encoding = negotiateEncoding(req.headers['accept-encoding']);
+  appendVary(res);
+  if (!encoding || req.method === 'HEAD') {
+    next();
+    return;
+  }
+
+  const rawWrite = res.write.bind(res) as (chunk: any, ...args: any[]) => boolean;
+  const rawEnd = res.end.bind(res) as (...args: any[]) => Response;
+  let encoder: zlib.Gzip | zlib.BrotliCompress | null = null;
+  let decided = false;
+  let endCallback: (() => void) | undefined;
+
+  const shouldCompress = (firstChunkBytes: number, ending: boolean): boolean => {
+    if (res.statusCode < 200 || res.statusCode === 204 || res.statusCode === 304) {
+      return false;
+    }
+    if (res.getHeader('Content-Encoding') || !COMPRESSIBLE_TYPES.test(String(res.getHeader('Content-Type') || ''))) {
+      return false;
+    }
+    const length = Number(res.getHeader('Content-Length') ?? (ending ? firstChunkBytes : NaN));
+    return Number.isNaN(length) || length >= MIN_COMPRESS_BYTES;
+  };
+
+  const decide = (chunk: unknown, ending: boolean) => {
+    if (decided) {
+      return;
+    }
+    decided = true;
+    const bytes = chunk ? Buffer.byteLength(chunk as string | Buffer) : 0;
+    if (!shouldCompress(bytes, ending)) {
+      return;
+    }
+    res.setHeader('Content-Encoding', encoding);
+    res.removeHeader('Content-Length');
+    encoder = createEncoder(encoding);
+    encoder.on('data', (compressed: Buffer) => {
+      if (!rawWrite(compressed)) {
+        encoder?.pause();
+      }
+    });
+    encoder.on('end', () => rawEnd(endCallback));
+    encoder.on('drain', () => res.emit('drain'));
+    res.on('drain', () => encoder?.resume());
+    // Client went away: drop whatever the encoder still holds
+    res.on('close', () => encoder?.destroy());
+  };
+
+  (res as any).write = (chunk: any, ...args: any[]): boolean => {
+    decide(chunk, false);
+    if (!encoder) {
+      return rawWrite(chunk, ...args);
+    }
+    const chunkEncoding = typeof args[0] === 'string' ? (args[0] as BufferEncoding) : undefined;
+    return chunkEncoding ? encoder.write(chunk, chunkEncoding) : encoder.write(chunk);
+  };
+
+  (res as any).end = (chunk?: any, ...args: any[]): Response => {
+    const data = typeof chunk === 'function' ? undefined : chunk;
+    decide(data, true);
+    if (!encoder) {
+      return rawEnd(chunk, ...args);
+    }
+    endCallback = [chunk, ...args].find(arg => typeof arg === 'function');
+    if (data) {
+      const chunkEncoding = typeof args[0] === 'string' ? (args[0] as BufferEncoding) : undefined;
+      if (chunkEncoding) {
+        encoder.write(data, chunkEncoding);
+      } else {
+        encoder.write(data);
+      }
+    }
+    encoder.end();
+    return res;
+  };
+
+  next();
+};
@@ -0,0 +1,13 @@
+// RFC 4180 CSV: fields holding a comma, quote or line break are quoted, with
+// embedded quotes doubled; rows end in CRLF
+const NEEDS_QUOTING = /[",\r\n]/;
+
+export const csvField = (value: unknown): string => {
+  if (value === null || value === undefined) {
+    return '';
+  }
+  const text = String(value);
+  return NEEDS_QUOTING.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+};
+
+export const csvRow = (values: unknown[]): string => values.map(csvField).join(',') + '\r\n';
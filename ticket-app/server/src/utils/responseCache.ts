@@ -0,0 +1,101 @@
+import { NextFunction, Request, Response } from 'express';
+import { getDataVersion, refreshDataVersion } from '../config/database';
+
+// Serialized JSON responses kept in memory, least recently used evicted first
+const MAX_CACHED_RESPONSES = 200;
+const MAX_CACHED_BYTES = 64 * 1024 * 1024;
+
+interface CachedResponse {
+  body: string;
+  bytes: number;
+}
+
+// Every entry belongs to cachedVersion. The data version is re-read from the
+// database before each lookup and a commit by any process changes it, which
+// empties the cache, so a response never predates a commit that finished
+// before its request arrived
+const cache = new Map<string, CachedResponse>();
+let cachedVersion = '';
+let cachedBytes = 0;
+
+const clearIfStale = (version: string) => {
+  if (version !== cachedVersion) {
+    cache.clear();
+    cachedBytes = 0;
+    cachedVersion = version;
+  }
+};
+
+const store = (key: string, body: string) => {
+  const bytes = Buffer.byteLength(body);
+  if (bytes > MAX_CACHED_BYTES) {
+    return;
+  }
+  cache.set(key, { body, bytes });
+  cachedBytes += bytes;
+  for (const [oldestKey, oldest] of cache) {
+    if (cache.size <= MAX_CACHED_RESPONSES && cachedBytes <= MAX_CACHED_BYTES) {
+      break;
+    }
+    cache.delete(oldestKey);
+    cachedBytes -= oldest.bytes;
+  }
+};
+
+// If-None-Match uses the weak comparison, so W/ prefixes are ignored on both sides
+const matchesEtag = (header: string | string[] | undefined, etag: string): boolean => {
+  if (!header) {
+    return false;
+  }
+  const opaque = (value: string) => value.replace(/^W\//, '');
+  const values = (Array.isArray(header) ? header.join(',') : header).split(',').map(v => opaque(v.trim()));
+  return values.includes('*') || values.includes(opaque(etag));
+};
+
+// Conditional GET and response caching for JSON read endpoints. The ETag is the
+// data version, so a client revalidating an unchanged resource gets a 304 and
+// a repeat of a cached URL is answered from memory; neither runs a query. The
+// ETag is weak: compressResponses sends the same version as br, gzip or
+// identity (with Vary: Accept-Encoding), and the bytes differ between them.
+export const cacheJsonResponse = (req: Request, res: Response, next: NextFunction) => {
+  refreshDataVersion(version => {
+    const etag = `W/"${version}"`;
+    res.setHeader('ETag', etag);
+    res.setHeader('Cache-Control', 'no-cache');
+
+    if (matchesEtag(req.headers['if-none-match'], etag)) {
+      res.status(304).end();
+      return;
+    }
+
+    clearIfStale(version);
+    const key = req.originalUrl;
+    const hit = cache.get(key);
+    if (hit) {
+      // Re-insert to mark as most recently used
+      cache.delete(key);
+      cache.set(key, hit);
+      res.setHeader('X-Cache', 'HIT');
+      res.type('application/json').send(hit.body);
+      return;
+    }
+
+    const sendJson = res.json.bind(res);
+    res.json = (body: unknown) => {
+      if (res.statusCode !== 200) {
+        // Errors and 404s must not be revalidated as if they were the resource
+        res.removeHeader('ETag');
+        return sendJson(body);
+      }
+      const text = JSON.stringify(body);
+      // Only keep it if no write landed while the query ran
+      if (getDataVersion() === version) {
+        clearIfStale(version);
+        store(key, text);
+      }
+      res.setHeader('X-Cache', 'MISS');
+      return res.type('application/json').send(text);
+    };
+    next();
+  });
+};
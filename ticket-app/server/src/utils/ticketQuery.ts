@@ -0,0 +1,235 @@
+import { Request } from 'express';
+import { TicketFilters, TicketPageOptions, TicketSortKey } from '../types';
+
+// Map DB columns to API field names; the column mapping lives in SQL
+export const TICKET_COLUMNS = 'rowid as id, subject as title, body as description, type as status, priority, queue, language';
+
+// Sort expressions are also used for the expression indexes in config/database.ts,
+// so they must stay byte-for-byte identical for SQLite to use those indexes
+export const SORT_EXPRESSIONS: Record<TicketSortKey, string> = {
+  id: 'rowid',
+  priority: "CASE lower(priority) WHEN 'high' THEN 3 WHEN 'medium' THEN 2 WHEN 'low' THEN 1 ELSE 0 END",
+  title: "COALESCE(subject, '')",
+};
+
+// In the normalized layout (ticket_schema.py) priority is joined in from a
+// lookup table and cannot be indexed; the view's priority_rank column holds
+// the same rank, stored and indexed in ticket_rows
+export const RANKED_SORT_EXPRESSIONS: Record<TicketSortKey, string> = {
+  ...SORT_EXPRESSIONS,
+  priority: 'priority_rank',
+};
+
+// Trigram full-text index over subject and body (see config/database.ts). Its
+// MATCH is a case-insensitive substring search, like the LIKE it replaces, but
+// a term shorter than one trigram matches nothing, so those still use LIKE.
+export const SEARCH_TABLE = 'tickets_fts';
+const TRIGRAM_LENGTH = 3;
+
+// Characters of the body returned as the preview field
+export const PREVIEW_LENGTH = 200;
+
+// Columns selectable with ?fields=; preview lets list views skip full bodies
+export const FIELD_COLUMNS: Record<string, string> = {
+  id: 'rowid as id',
+  title: 'subject as title',
+  description: 'body as description',
+  preview: `substr(body, 1, ${PREVIEW_LENGTH}) as preview`,
+  status: 'type as status',
+  priority: 'priority',
+  queue: 'queue',
+  language: 'language',
+};
+
+export const DEFAULT_PAGE_SIZE = 20;
+export const MAX_PAGE_SIZE = 100;
+
+const PAGE_PARAMS = ['limit', 'cursor', 'sort', 'order', 'type', 'priority', 'queue', 'search'];
+
+type QueryParams = Request['query'];
+type SqlParam = string | number;
+
+// Accept both repeated (?type=a&type=b) and comma-separated (?type=a,b) values
+const toList = (value: unknown): string[] => {
+  if (value === undefined) {
+    return [];
+  }
+  const values = Array.isArray(value) ? value : [value];
+  return values
+    .flatMap(v => String(v).split(','))
+    .map(v => v.trim())
+    .filter(Boolean);
+};
+
+// Fields returned when ?fields= is not given, in TICKET_COLUMNS order
+export const DEFAULT_FIELDS = ['id', 'title', 'description', 'status', 'priority', 'queue', 'language'];
+
+// Field names for ?fields=a,b; id is always included since page cursors and
+// exports are keyed on it
+export const parseFieldList = (query: QueryParams): string[] | { error: string } => {
+  if (query.fields === undefined) {
+    return DEFAULT_FIELDS;
+  }
+  const fields = toList(query.fields);
+  const unknown = fields.find(field => !Object.prototype.hasOwnProperty.call(FIELD_COLUMNS, field));
+  if (unknown !== undefined) {
+    return { error: `Unknown field: ${unknown}` };
+  }
+  return [...new Set(['id', ...fields])];
+};
+
+// SQL select list for ?fields=; without it every ticket column is returned
+export const parseFieldColumns = (query: QueryParams): string | { error: string } => {
+  if (query.fields === undefined) {
+    return TICKET_COLUMNS;
+  }
+  const fields = parseFieldList(query);
+  return Array.isArray(fields) ? fields.map(field => FIELD_COLUMNS[field]).join(', ') : fields;
+};
+
+export const isPagedRequest = (query: QueryParams): boolean =>
+  PAGE_PARAMS.some(param => query[param] !== undefined);
+
+export const parseTicketFilters = (query: QueryParams): TicketFilters => ({
+  types: toList(query.type),
+  priorities: toList(query.priority),
+  queues: toList(query.queue),
+  search: typeof query.search === 'string' ? query.search.trim() : '',
+});
+
+export const buildWhereClause = (
+  filters: TicketFilters,
+  fullTextSearch = false,
+): { clauses: string[]; params: SqlParam[] } => {
+  const clauses: string[] = [];
+  const params: SqlParam[] = [];
+
+  const addIn = (column: string, values: string[]) => {
+    if (values.length === 0) {
+      return;
+    }
+    clauses.push(`${column} IN (${values.map(() => '?').join(', ')})`);
+    params.push(...values);
+  };
+
+  addIn('type', filters.types);
+  addIn('priority', filters.priorities);
+  addIn('queue', filters.queues);
+
+  if (filters.search && fullTextSearch && [...filters.search].length >= TRIGRAM_LENGTH) {
+    // A quoted FTS5 string is one phrase, so operators in the term are literal
+    clauses.push(`rowid IN (SELECT rowid FROM ${SEARCH_TABLE} WHERE ${SEARCH_TABLE} MATCH ?)`);
+    params.push(`"${filters.search.replace(/"/g, '""')}"`);
+  } else if (filters.search) {
+    // LIKE is case-insensitive for ASCII, matching the client-side search
+    const pattern = `%${filters.search.replace(/[\\%_]/g, match => '\\' + match)}%`;
+    clauses.push("(subject LIKE ? ESCAPE '\\' OR body LIKE ? ESCAPE '\\')");
+    params.push(pattern, pattern);
+  }
+
+  return { clauses, params };
+};
+
+export const encodeCursor = (sortValue: SqlParam, id: number): string =>
+  Buffer.from(JSON.stringify([sortValue, id])).toString('base64url');
+
+export const decodeCursor = (cursor: string): [SqlParam, number] | null => {
+  try {
+    const parsed = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+    if (
+      Array.isArray(parsed) &&
+      parsed.length === 2 &&
+      (typeof parsed[0] === 'string' || typeof parsed[0] === 'number') &&
+      Number.isInteger(parsed[1])
+    ) {
+      return [parsed[0], parsed[1]];
+    }
+  } catch {
+    // Fall through to the invalid-cursor result
+  }
+  return null;
+};
+
+export const parsePageOptions = (query: QueryParams): TicketPageOptions | { error: string } => {
+  const sort = query.sort === undefined ? 'id' : query.sort;
+  if (typeof sort !== 'string' || !Object.prototype.hasOwnProperty.call(SORT_EXPRESSIONS, sort)) {
+    return { error: `Invalid sort: ${String(query.sort)}` };
+  }
+
+  const order = query.order === undefined ? 'desc' : query.order;
+  if (order !== 'asc' && order !== 'desc') {
+    return { error: `Invalid order: ${String(query.order)}` };
+  }
+
+  const limit = query.limit === undefined ? DEFAULT_PAGE_SIZE : Number(query.limit);
+  if (!Number.isInteger(limit) || limit < 1 || limit > MAX_PAGE_SIZE) {
+    return { error: `limit must be an integer between 1 and ${MAX_PAGE_SIZE}` };
+  }
+
+  const columns = parseFieldColumns(query);
+  if (typeof columns !== 'string') {
+    return columns;
+  }
+
+  let cursor: [SqlParam, number] | null = null;
+  if (query.cursor !== undefined) {
+    cursor = typeof query.cursor === 'string' ? decodeCursor(query.cursor) : null;
+    if (!cursor) {
+      return { error: 'Invalid cursor' };
+    }
+  }
+
+  return { filters: parseTicketFilters(query), columns, sort: sort as TicketSortKey, order, limit, cursor };
+};
+
+// Keyset pagination: continue strictly after (sort value, rowid) of the last row
+// seen, so each page is an index range scan regardless of how deep it is
+export const buildPageQuery = (
+  options: TicketPageOptions,
+  sortExpressions: Record<TicketSortKey, string> = SORT_EXPRESSIONS,
+  fullTextSearch = false,
+): { sql: string; params: SqlParam[] } => {
+  const { clauses, params } = buildWhereClause(options.filters, fullTextSearch);
+  const sortExpression = sortExpressions[options.sort];
+  const direction = options.order === 'asc' ? 'ASC' : 'DESC';
+  const comparison = options.order === 'asc' ? '>' : '<';
+  const columns = `${options.columns}, ${sortExpression} as sort_value`;
+  // Fetch one extra row to know whether another page exists
+  const fetchSize = options.limit + 1;
+
+  const select = (extraClauses: string[], orderBy: string) => {
+    const where = [...clauses, ...extraClauses];
+    const whereSql = where.length > 0 ? `WHERE ${where.join(' AND ')}` : '';
+    return `SELECT ${columns} FROM tickets ${whereSql} ORDER BY ${orderBy} LIMIT ?`;
+  };
+
+  if (options.sort === 'id') {
+    const extra = options.cursor ? [`rowid ${comparison} ?`] : [];
+    const cursorParams = options.cursor ? [options.cursor[1]] : [];
+    return {
+      sql: select(extra, `rowid ${direction}`),
+      params: [...params, ...cursorParams, fetchSize],
+    };
+  }
+
+  const orderBy = `${sortExpression} ${direction}, rowid ${direction}`;
+  if (!options.cursor) {
+    return { sql: select([], orderBy), params: [...params, fetchSize] };
+  }
+
+  // A row-value comparison (expr, rowid) < (?, ?) cannot seek the (expr, rowid)
+  // index, so split it into the rest of the current sort group plus the groups
+  // after it. Each half is an index seek and at most 2 * fetchSize rows are merged.
+  const [sortValue, id] = options.cursor;
+  const sameGroup = select([`${sortExpression} = ?`, `rowid ${comparison} ?`], `rowid ${direction}`);
+  const laterGroups = select([`${sortExpression} ${comparison} ?`], orderBy);
+  return {
+    sql: `SELECT * FROM (${sameGroup}) UNION ALL SELECT * FROM (${laterGroups}) ` +
+      `ORDER BY sort_value ${direction}, id ${direction} LIMIT ?`,
+    params: [
+      ...params, sortValue, id, fetchSize,
+      ...params, sortValue, fetchSize,
+      fetchSize,
+    ],
+  };
+};
@@ -0,0 +1,221 @@
+"""
+Client for the ticket-app REST API (ticket-app/server).
+
+stream_tickets() reads /api/tickets/export line by line, so even a full
+table export is processed with constant memory on the Python side.
+upload_tickets() imports the English tickets CSV through /api/tickets/bulk,
+keeping several NDJSON batches in flight so parsing, network and inserts
+overlap. payload_sizes() measures the bytes on the wire for the list
+endpoint with and without field projection and compression.
+"""
+import csv
+import json
+import shutil
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+API_URL = 'http://localhost:3001/api'
+CSV_FILENAME = 'english_support_tickets.csv'
+UPLOAD_BATCH_SIZE = 1000
+PIPELINE_DEPTH = 4
+
+# Field projection used by the web client's list view
+LIST_FIELDS = ['id', 'title', 'preview', 'status', 'priority', 'queue', 'language']
+ENCODINGS = ['identity', 'gzip', 'br']
+
+# CSV column -> API field
+CSV_FIELDS = {
+    'subject': 'title',
+    'body': 'description',
+    'type': 'status',
+    'priority': 'priority',
+    'queue': 'queue',
+    'language': 'language',
+}
+
+
+def _export_url(api_url, filters):
+    """Build the export URL; list filters are sent comma-separated"""
+    params = {}
+    for key, value in filters.items():
+        if value is None or value == '' or value == []:
+            continue
+        params[key] = ','.join(value) if isinstance(value, (list, tuple, set)) else value
+    query = urllib.parse.urlencode(params)
+    return f"{api_url}/tickets/export" + (f"?{query}" if query else '')
+
+
+def stream_tickets(api_url=API_URL, timeout=60, **filters):
+    """Yield ticket dicts from the NDJSON export one at a time
+
+    Accepts the same filters as the API: type, priority, queue and search,
+    plus limit to stop after that many rows.
+    """
+    url = _export_url(api_url, filters)
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        for line in response:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def download_tickets_csv(filename, api_url=API_URL, timeout=60, **filters):
+    """Save the server's CSV export to filename, streamed in chunks
+
+    Accepts the same filters as stream_tickets(); returns the bytes written.
+    """
+    url = _export_url(api_url, {'format': 'csv', **filters})
+    with urllib.request.urlopen(url, timeout=timeout) as response, open(filename, 'wb') as f:
+        shutil.copyfileobj(response, f)
+        return f.tell()
+
+
+def iter_ticket_frames(chunksize=10_000, api_url=API_URL, **filters):
+    """Yield the export as pandas DataFrames of at most chunksize rows"""
+    import pandas as pd
+
+    batch = []
+    for ticket in stream_tickets(api_url, **filters):
+        batch.append(ticket)
+        if len(batch) >= chunksize:
+            yield pd.DataFrame(batch)
+            batch = []
+    if batch:
+        yield pd.DataFrame(batch)
+
+
+def csv_ticket_batches(csv_filename=CSV_FILENAME, batch_size=UPLOAD_BATCH_SIZE):
+    """Yield lists of API ticket dicts read from the tickets CSV"""
+    with open(csv_filename, newline='', encoding='utf-8') as f:
+        batch = []
+        for row in csv.DictReader(f):
+            batch.append({field: row[column] or None
+                          for column, field in CSV_FIELDS.items() if column in row})
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def post_ticket_batch(tickets, api_url=API_URL, timeout=60):
+    """POST one batch to /tickets/bulk as NDJSON and return the server summary"""
+    body = ''.join(json.dumps(ticket) + '\n' for ticket in tickets).encode('utf-8')
+    request = urllib.request.Request(
+        f"{api_url}/tickets/bulk", data=body, method='POST',
+        headers={'Content-Type': 'application/x-ndjson'},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.load(response)
+    except urllib.error.HTTPError as error:
+        # A batch where every row was rejected still carries the per-row summary;
+        # anything else (an HTML 413 from Express, a proxy's 502) is re-raised
+        # with the status code and the body the server sent
+        text = error.read().decode('utf-8', errors='replace')
+        try:
+            summary = json.loads(text)
+        except ValueError:
+            summary = None
+        if not isinstance(summary, dict) or 'received' not in summary:
+            raise urllib.error.HTTPError(error.url, error.code, f"{error.reason}: {text}",
+                                         error.headers, None) from error
+        return summary
+
+
+def upload_tickets(csv_filename=CSV_FILENAME, api_url=API_URL,
+                   batch_size=UPLOAD_BATCH_SIZE, pipeline_depth=PIPELINE_DEPTH):
+    """Upload every ticket in the CSV with up to pipeline_depth batches in flight
+
+    Error indices are positions in the CSV (0-based data rows). Returns a dict
+    with row, insert and failure counts, the errors, elapsed seconds and rows/sec.
+    """
+    started = time.perf_counter()
+    stats = {'rows': 0, 'inserted': 0, 'failed': 0, 'errors': [], 'batches': 0}
+
+    def collect(offset, future):
+        summary = future.result()
+        stats['inserted'] += summary['inserted']
+        stats['failed'] += summary['failed']
+        stats['errors'].extend({'index': offset + error['index'], 'error': error['error']}
+                               for error in summary['errors'])
+
+    in_flight = deque()
+    with ThreadPoolExecutor(max_workers=pipeline_depth) as pool:
+        for batch in csv_ticket_batches(csv_filename, batch_size):
+            if len(in_flight) >= pipeline_depth:
+                collect(*in_flight.popleft())
+            in_flight.append((stats['rows'], pool.submit(post_ticket_batch, batch, api_url)))
+            stats['rows'] += len(batch)
+            stats['batches'] += 1
+        while in_flight:
+            collect(*in_flight.popleft())
+
+    elapsed = time.perf_counter() - started
+    stats['seconds'] = elapsed
+    stats['rows_per_sec'] = stats['rows'] / elapsed if elapsed else 0.0
+    return stats
+
+
+def payload_sizes(api_url=API_URL, fields=LIST_FIELDS, encodings=ENCODINGS, timeout=120):
+    """Bytes on the wire for GET /tickets, full and projected, per encoding
+
+    Returns a list of dicts with variant, encoding, the Content-Encoding the
+    server chose, bytes received and seconds taken.
+    """
+    variants = [('full', f"{api_url}/tickets"),
+                ('list', f"{api_url}/tickets?fields={','.join(fields)}")]
+    results = []
+    for variant, url in variants:
+        for encoding in encodings:
+            request = urllib.request.Request(url, headers={'Accept-Encoding': encoding})
+            started = time.perf_counter()
+            # urllib does not decompress, so len() is the transferred size
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                size = len(response.read())
+                content_encoding = response.headers.get('Content-Encoding') or 'identity'
+            results.append({
+                'variant': variant,
+                'encoding': encoding,
+                'content_encoding': content_encoding,
+                'bytes': size,
+                'seconds': time.perf_counter() - started,
+            })
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+    from collections import Counter
+
+    if len(sys.argv) > 1 and sys.argv[1] == '--upload':
+        csv_file = sys.argv[2] if len(sys.argv) > 2 else CSV_FILENAME
+        print(f"📤 Uploading tickets from {csv_file}...")
+        stats = upload_tickets(csv_file)
+        print(f"✅ Uploaded {stats['inserted']:,} of {stats['rows']:,} tickets in {stats['batches']} batches "
+              f"({stats['seconds']:.1f}s, {stats['rows_per_sec']:,.0f} rows/sec)")
+        if stats['failed']:
+            print(f"⚠️ {stats['failed']:,} tickets were rejected")
+            for error in stats['errors'][:10]:
+                print(f"   row {error['index']}: {error['error']}")
+    elif len(sys.argv) > 1 and sys.argv[1] == '--payload-report':
+        print("📏 Measuring /api/tickets payload sizes...")
+        results = payload_sizes()
+        baseline = next(r['bytes'] for r in results if r['variant'] == 'full' and r['encoding'] == 'identity')
+        for result in results:
+            print(f"   {result['variant']:<5} {result['content_encoding']:<9} {result['bytes']:>12,} bytes "
+                  f"({result['bytes'] / baseline:6.1%} of full) in {result['seconds']:.2f}s")
+    else:
+        print("📡 Streaming tickets from the API...")
+        total = 0
+        priorities = Counter()
+        for ticket in stream_tickets():
+            total += 1
+            priorities[ticket.get('priority')] += 1
+        print(f"✅ Received {total:,} tickets")
+        for priority, count in priorities.most_common():
+            print(f"   {priority}: {count:,}")
@@ -0,0 +1,95 @@
+"""
+Train, save and load a ticket classifier (TF-IDF + Multinomial Naive Bayes).
+
+This is the same pipeline as simple_ml_test.py, trained on the stored
+tickets instead of toy sentences, so it can be applied to the whole table.
+With a features_dir the TF-IDF matrix comes from the feature store
+(feature_store.py) instead of being refitted from the raw text.
+"""
+import pickle
+import sqlite3
+
+import pandas as pd
+
+from body_store import register_body_functions
+from similar_tickets import ticket_text
+
+DB_FILENAME = 'english_support_tickets.db'
+MODEL_FILENAME = 'ticket_classifier.pkl'
+TARGET_COLUMNS = ('queue', 'priority', 'type')
+
+
+def build_pipeline():
+    """Create the untrained TF-IDF + Naive Bayes pipeline"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.naive_bayes import MultinomialNB
+    from sklearn.pipeline import Pipeline
+
+    return Pipeline([
+        ('tfidf', TfidfVectorizer(stop_words='english', sublinear_tf=True)),
+        ('naive_bayes', MultinomialNB())
+    ])
+
+
+def train_ticket_classifier(db_filename=DB_FILENAME, target='queue', model_filename=MODEL_FILENAME,
+                            features_dir=None):
+    """Train a classifier for one categorical column and save it to disk"""
+    if target not in TARGET_COLUMNS:
+        raise ValueError(f"target must be one of {TARGET_COLUMNS}, got {target!r}")
+    if features_dir:
+        classifier = _train_from_feature_store(db_filename, target, features_dir)
+        save_classifier(classifier, target, model_filename)
+        return classifier
+
+    conn = register_body_functions(sqlite3.connect(db_filename))
+    try:
+        df = pd.read_sql_query(
+            f"SELECT subject, body, {target} FROM tickets WHERE {target} IS NOT NULL", conn
+        )
+    finally:
+        conn.close()
+
+    classifier = build_pipeline()
+    classifier.fit(ticket_text(df), df[target])
+    save_classifier(classifier, target, model_filename)
+    return classifier
+
+
+def _train_from_feature_store(db_filename, target, features_dir):
+    """Fit only the Naive Bayes step on stored features; the stored vectorizer becomes the pipeline's tfidf step"""
+    import numpy as np
+    from sklearn.naive_bayes import MultinomialNB
+    from sklearn.pipeline import Pipeline
+
+    from feature_store import load_features, load_vectorizer
+
+    features = load_features(db_filename, store_dir=features_dir)
+    codes = np.asarray(features['labels'][target])
+    labelled = codes >= 0
+    X = features['X'] if labelled.all() else features['X'][labelled]
+    naive_bayes = MultinomialNB().fit(X, np.array(features['classes'][target], dtype=object)[codes[labelled]])
+    return Pipeline([
+        ('tfidf', load_vectorizer(features)),
+        ('naive_bayes', naive_bayes)
+    ])
+
+
+def save_classifier(classifier, target, model_filename=MODEL_FILENAME):
+    """Pickle a fitted classifier together with the column it predicts"""
+    with open(model_filename, 'wb') as f:
+        pickle.dump({'target': target, 'classifier': classifier}, f)
+
+
+def load_classifier(model_filename=MODEL_FILENAME):
+    """Load a saved classifier; returns a dict with 'target' and 'classifier'"""
+    with open(model_filename, 'rb') as f:
+        return pickle.load(f)
+
+
+if __name__ == "__main__":
+    import sys
+
+    target = sys.argv[1] if len(sys.argv) > 1 else 'queue'
+    print(f"🧠 Training ticket classifier for '{target}'...")
+    model = train_ticket_classifier(target=target)
+    print(f"✅ Saved to {MODEL_FILENAME} ({len(model.classes_)} classes)")
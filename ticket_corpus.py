@@ -0,0 +1,282 @@
+"""
+Reproducible synthetic support-ticket corpus.
+
+Streams CSV rows with the multi-lang dataset columns (subject, body, type,
+priority, queue, language) without customer data or network access:
+
+- categorical columns follow skewed distributions close to the real dataset
+- words are drawn from per-language vocabularies with Zipf frequencies
+- body lengths are log-normal, so there is a long tail of very long tickets,
+  and some subjects are left empty as in the real data
+- a configurable share of rows repeat an earlier ticket exactly (duplicates)
+  or with a one- or two-word edit (near-duplicates)
+
+Rows are generated in numpy-vectorised chunks and earlier tickets are kept
+in a fixed-size ring buffer, so memory stays constant however many rows are
+written. The same seed always produces the same file.
+
+    python ticket_corpus.py 1000000 synthetic_tickets.csv --seed 7
+"""
+import argparse
+import csv
+import sys
+import time
+
+import numpy as np
+
+COLUMNS = ['subject', 'body', 'type', 'priority', 'queue', 'language']
+DEFAULT_SEED = 42
+CHUNK_ROWS = 50_000
+# Earlier tickets available to be duplicated
+HISTORY_SIZE = 10_000
+DUPLICATE_RATE = 0.02
+NEAR_DUPLICATE_RATE = 0.03
+EMPTY_SUBJECT_RATE = 0.08
+ZIPF_EXPONENT = 1.1
+
+TYPES = {'Incident': 0.40, 'Request': 0.29, 'Problem': 0.21, 'Change': 0.10}
+PRIORITIES = {'medium': 0.41, 'high': 0.39, 'low': 0.20}
+QUEUES = {
+    'Technical Support': 0.29,
+    'Product Support': 0.19,
+    'Customer Service': 0.15,
+    'IT Support': 0.12,
+    'Billing and Payments': 0.10,
+    'Returns and Exchanges': 0.05,
+    'Service Outages and Maintenance': 0.04,
+    'Sales and Pre-Sales': 0.03,
+    'Human Resources': 0.02,
+    'General Inquiry': 0.01,
+}
+LANGUAGES = {'en': 0.52, 'de': 0.33, 'es': 0.07, 'fr': 0.05, 'pt': 0.03}
+
+# Body length in words: log-normal around BODY_MEDIAN_WORDS, clipped
+BODY_MEDIAN_WORDS = 55
+BODY_SIGMA = 0.6
+BODY_WORDS_RANGE = (8, 400)
+SUBJECT_WORDS_RANGE = (3, 9)
+
+# Words that give each queue its own vocabulary, so classifiers have signal
+QUEUE_TOPICS = {
+    'Technical Support': 'server crash error configuration integration api database timeout'.split(),
+    'Product Support': 'feature product version dashboard analytics setting tool documentation'.split(),
+    'Customer Service': 'account assistance order details request help experience feedback'.split(),
+    'IT Support': 'laptop vpn printer password login firewall network device'.split(),
+    'Billing and Payments': 'invoice payment charge charged billing refund subscription receipt'.split(),
+    'Returns and Exchanges': 'return exchange refund shipping delivery damaged product replacement'.split(),
+    'Service Outages and Maintenance': 'outage downtime maintenance monitoring alert restore unavailable incident'.split(),
+    'Sales and Pre-Sales': 'pricing plan trial purchase quote license demo upgrade'.split(),
+    'Human Resources': 'employee payroll onboarding leave policy benefits contract training'.split(),
+    'General Inquiry': 'information question contact hours website general inquiry details'.split(),
+}
+TOPIC_WORDS_PER_TICKET = 3
+
+# Most frequent words first; Zipf weights follow list order
+VOCABULARY = {
+    'en': (
+        'the to and a i is of we my our in for please with have not this it on be '
+        'you issue error system account access can after since help support data '
+        'customer service problem update working unable login password server email '
+        'team request would could need when from your are has been any that all '
+        'application network software device payment billing invoice order refund '
+        'integration connection database platform security configuration report '
+        'performance subscription license installation website browser mobile app '
+        'project management marketing analytics dashboard cloud storage backup '
+        'sync printer laptop vpn firewall outage downtime maintenance upgrade '
+        'version release feature setting user users admin permission role file '
+        'files upload download export import failed failure crash slow timeout '
+        'delay charge charged duplicate receipt shipping delivery return exchange '
+        'product products purchase plan pricing trial renewal cancel cancellation '
+        'investigate resolve assistance urgent immediately affected impact '
+        'business critical clients hospital medical records digital strategy '
+        'campaign tool tools guidance documentation steps details attached '
+        'screenshot logs message notification alert monitoring api token key '
+        'certificate expired encryption compliance policy audit breach'
+    ).split(),
+    'de': (
+        'der die und ich ist das nicht wir mit für ein eine zu auf unser bitte '
+        'problem fehler system konto zugang daten kunde hilfe support service '
+        'anmeldung passwort server update rechnung zahlung bestellung software '
+        'netzwerk verbindung datenbank sicherheit leistung lizenz installation '
+        'drucker laptop ausfall wartung version benutzer datei hochladen '
+        'herunterladen fehlgeschlagen langsam dringend sofort betroffen '
+        'unternehmen kritisch projekt plattform integration bericht'
+    ).split(),
+    'es': (
+        'el la de que y en un una por para con no mi nuestro problema error '
+        'sistema cuenta acceso datos cliente ayuda soporte servicio contraseña '
+        'servidor actualización factura pago pedido software red conexión base '
+        'seguridad rendimiento licencia instalación usuario archivo urgente'
+    ).split(),
+    'fr': (
+        'le la de et les des un une je nous pour avec pas mon notre problème '
+        'erreur système compte accès données client aide support service '
+        'connexion mot passe serveur mise jour facture paiement commande '
+        'logiciel réseau sécurité performance licence utilisateur fichier urgent'
+    ).split(),
+    'pt': (
+        'o a de que e em um uma por para com não meu nosso problema erro '
+        'sistema conta acesso dados cliente ajuda suporte serviço senha servidor '
+        'atualização fatura pagamento pedido software rede conexão segurança '
+        'desempenho licença instalação usuário arquivo urgente'
+    ).split(),
+}
+
+OPENINGS = {
+    'en': ['Dear Customer Support,', 'Hello,', 'Hi team,', 'Dear Support Team,', ''],
+    'de': ['Sehr geehrtes Support-Team,', 'Hallo,', 'Guten Tag,', ''],
+    'es': ['Estimado equipo de soporte,', 'Hola,', ''],
+    'fr': ['Cher support client,', 'Bonjour,', ''],
+    'pt': ['Prezada equipe de suporte,', 'Olá,', ''],
+}
+CLOSINGS = {
+    'en': ['Thank you.', 'Best regards.', 'Thanks in advance for your help.', ''],
+    'de': ['Vielen Dank.', 'Mit freundlichen Grüßen.', ''],
+    'es': ['Gracias.', 'Saludos cordiales.', ''],
+    'fr': ['Merci.', 'Cordialement.', ''],
+    'pt': ['Obrigado.', 'Atenciosamente.', ''],
+}
+
+
+def _weights(distribution):
+    values = list(distribution)
+    probabilities = np.array([distribution[v] for v in values], dtype=float)
+    return values, probabilities / probabilities.sum()
+
+
+def _zipf_cdf(size, exponent=ZIPF_EXPONENT):
+    weights = 1.0 / np.arange(1, size + 1) ** exponent
+    return np.cumsum(weights / weights.sum())
+
+
+class _Vocabulary:
+    """Words of one language with a Zipf CDF for fast vectorised sampling"""
+
+    def __init__(self, language):
+        self.words = VOCABULARY[language]
+        self.cdf = _zipf_cdf(len(self.words))
+        self.openings = OPENINGS[language]
+        self.closings = CLOSINGS[language]
+
+    def sample(self, rng, count):
+        """count word indices, most frequent words most likely"""
+        return np.minimum(np.searchsorted(self.cdf, rng.random(count)), len(self.words) - 1)
+
+    def texts(self, rng, lengths):
+        """One space-joined text per length"""
+        indices = self.sample(rng, int(lengths.sum()))
+        words = [self.words[i] for i in indices.tolist()]
+        offsets = np.concatenate(([0], np.cumsum(lengths))).tolist()
+        return [' '.join(words[offsets[i]:offsets[i + 1]]) for i in range(len(lengths))]
+
+
+def _perturb(rng, vocabulary, body):
+    """Near-duplicate of a body: replace one or two words"""
+    words = body.split(' ')
+    for _ in range(int(rng.integers(1, 3))):
+        words[int(rng.integers(0, len(words)))] = vocabulary.words[int(vocabulary.sample(rng, 1)[0])]
+    return ' '.join(words)
+
+
+def iter_ticket_chunks(rows, seed=DEFAULT_SEED, duplicate_rate=DUPLICATE_RATE,
+                       near_duplicate_rate=NEAR_DUPLICATE_RATE, chunk_rows=CHUNK_ROWS):
+    """Yield lists of (subject, body, type, priority, queue, language) tuples"""
+    if duplicate_rate + near_duplicate_rate > 1:
+        raise ValueError("duplicate_rate + near_duplicate_rate must not exceed 1")
+
+    rng = np.random.default_rng(seed)
+    vocabularies = {language: _Vocabulary(language) for language in LANGUAGES}
+    types, type_p = _weights(TYPES)
+    priorities, priority_p = _weights(PRIORITIES)
+    queues, queue_p = _weights(QUEUES)
+    languages, language_p = _weights(LANGUAGES)
+    history = []
+    history_next = 0
+
+    for start in range(0, rows, chunk_rows):
+        count = min(chunk_rows, rows - start)
+        ticket_types = rng.choice(types, size=count, p=type_p)
+        ticket_priorities = rng.choice(priorities, size=count, p=priority_p)
+        ticket_queues = rng.choice(queues, size=count, p=queue_p)
+        ticket_languages = rng.choice(languages, size=count, p=language_p)
+        body_lengths = np.clip(
+            rng.lognormal(np.log(BODY_MEDIAN_WORDS), BODY_SIGMA, size=count).astype(int),
+            *BODY_WORDS_RANGE,
+        )
+        subject_lengths = rng.integers(SUBJECT_WORDS_RANGE[0], SUBJECT_WORDS_RANGE[1] + 1, size=count)
+        empty_subject = rng.random(count) < EMPTY_SUBJECT_RATE
+        copy_draw = rng.random(count)
+        topic_picks = rng.integers(0, 1 << 16, size=(count, TOPIC_WORDS_PER_TICKET)).tolist()
+
+        subjects = [''] * count
+        bodies = [''] * count
+        for language in languages:
+            positions = np.flatnonzero(ticket_languages == language)
+            if len(positions) == 0:
+                continue
+            vocabulary = vocabularies[language]
+            language_subjects = vocabulary.texts(rng, subject_lengths[positions])
+            language_bodies = vocabulary.texts(rng, body_lengths[positions])
+            openings = rng.integers(0, len(vocabulary.openings), size=len(positions)).tolist()
+            closings = rng.integers(0, len(vocabulary.closings), size=len(positions)).tolist()
+            for j, position in enumerate(positions.tolist()):
+                subjects[position] = '' if empty_subject[position] else language_subjects[j].capitalize()
+                topics = QUEUE_TOPICS[ticket_queues[position]]
+                topic = ' '.join(topics[k % len(topics)] for k in topic_picks[position])
+                parts = (vocabulary.openings[openings[j]], language_bodies[j].capitalize(), topic + '.',
+                         vocabulary.closings[closings[j]])
+                bodies[position] = ' '.join(part for part in parts if part)
+
+        chunk = []
+        for i in range(count):
+            row = (subjects[i], bodies[i], str(ticket_types[i]), str(ticket_priorities[i]),
+                   str(ticket_queues[i]), str(ticket_languages[i]))
+            if history and copy_draw[i] < duplicate_rate + near_duplicate_rate:
+                original = history[int(rng.integers(0, len(history)))]
+                if copy_draw[i] < duplicate_rate:
+                    row = original
+                else:
+                    vocabulary = vocabularies[original[5]]
+                    row = (original[0], _perturb(rng, vocabulary, original[1])) + original[2:]
+            chunk.append(row)
+            # Fixed-size ring buffer of earlier tickets keeps memory constant
+            if len(history) < HISTORY_SIZE:
+                history.append(row)
+            else:
+                history[history_next] = row
+                history_next = (history_next + 1) % HISTORY_SIZE
+        yield chunk
+
+
+def write_corpus(filename, rows, seed=DEFAULT_SEED, duplicate_rate=DUPLICATE_RATE,
+                 near_duplicate_rate=NEAR_DUPLICATE_RATE, chunk_rows=CHUNK_ROWS):
+    """Stream a synthetic corpus to a CSV file; returns rows, seconds and rows/sec"""
+    started = time.perf_counter()
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for chunk in iter_ticket_chunks(rows, seed, duplicate_rate, near_duplicate_rate, chunk_rows):
+            writer.writerows(chunk)
+    elapsed = time.perf_counter() - started
+    return {'rows': rows, 'seconds': elapsed, 'rows_per_sec': rows / elapsed if elapsed else 0.0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic support-ticket CSV")
+    parser.add_argument('rows', type=int)
+    parser.add_argument('filename', nargs='?', default='synthetic_tickets.csv')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--duplicate-rate', type=float, default=DUPLICATE_RATE)
+    parser.add_argument('--near-duplicate-rate', type=float, default=NEAR_DUPLICATE_RATE)
+    args = parser.parse_args(argv)
+
+    print(f"🧪 Generating {args.rows:,} synthetic tickets (seed {args.seed})...")
+    stats = write_corpus(args.filename, args.rows, args.seed,
+                         args.duplicate_rate, args.near_duplicate_rate)
+    print(f"✅ Wrote {args.filename} in {stats['seconds']:.1f}s "
+          f"({stats['rows_per_sec'] * 60:,.0f} rows/min)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
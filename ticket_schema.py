@@ -0,0 +1,461 @@
+"""
+Dictionary-encoded (normalized) layout for the tickets database.
+
+pandas.to_sql stores type, priority, queue and language as the same few
+strings repeated in every row. In the normalized layout each distinct value
+is stored once in a lookup table (ticket_types, ticket_priorities,
+ticket_queues, ticket_languages) and ticket_rows holds an integer id:
+
+    ticket_rows(rowid INTEGER PRIMARY KEY, subject, body, ..., type_id, priority_id, ...)
+
+A view named `tickets` joins the names back under the original column names
+and in the original order, so the Express controller, the change feed and
+the Python scripts keep querying `tickets` unchanged. When there is a
+priority column the view ends with one extra column, priority_rank: the
+stored, indexed 3/2/1/0 rank of high/medium/low/other that the ticket app
+sorts by priority on. An INSTEAD OF INSERT
+trigger lets INSERT INTO tickets (...) through the view, adding unseen
+values to the lookup tables. Conversion keeps every rowid.
+
+    python ticket_schema.py normalize [db]    # convert a flat database in place
+    python ticket_schema.py compare [db]      # size and GROUP BY timings, flat vs normalized
+"""
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+
+DB_FILENAME = 'english_support_tickets.db'
+DATA_TABLE = 'ticket_rows'
+# Flat table while it is being converted
+STAGING_TABLE = 'tickets_flat'
+# Optional compressed body storage, see body_store.py
+BODY_TABLE = 'ticket_bodies'
+DICTIONARY_TABLE = 'body_dictionaries'
+# One row holding a random id that each ingest replaces; caches derived from the
+# tickets (feature_store.py) are keyed on it, so a re-ingest of the same shape
+# and size is still told apart
+INGEST_TABLE = 'ticket_ingest'
+# The ticket app's full-text index, kept in sync by triggers named tickets_fts_*
+# (see ticket-app/server/src/config/database.ts)
+SEARCH_TABLE = 'tickets_fts'
+LOOKUP_TABLES = {
+    'type': 'ticket_types',
+    'priority': 'ticket_priorities',
+    'queue': 'ticket_queues',
+    'language': 'ticket_languages',
+}
+# Indexes on the integer ids; GROUP BY on ids is answered from these alone
+ID_INDEXES = {
+    'facets': ('type', 'priority', 'queue'),
+    'priority': ('priority',),
+    'queue': ('queue',),
+    'language': ('language',),
+}
+# Stored rank of the priority, so sorting by priority is an index scan; the
+# view's joined priority name cannot be indexed
+RANK_COLUMN = 'priority_rank'
+# Same ranks as SORT_EXPRESSIONS.priority in ticket-app/server/src/utils/ticketQuery.ts
+PRIORITY_RANK_SQL = "CASE lower({}) WHEN 'high' THEN 3 WHEN 'medium' THEN 2 WHEN 'low' THEN 1 ELSE 0 END"
+COMPARE_REPEAT = 5
+
+
+def is_normalized(conn):
+    """True when `tickets` is the compatibility view over ticket_rows"""
+    row = conn.execute("SELECT type FROM sqlite_master WHERE name = 'tickets'").fetchone()
+    return row is not None and row[0] == 'view'
+
+
+def record_ingest(conn):
+    """Give the freshly ingested tickets a new random ingest id; returns it"""
+    ingest_id = uuid.uuid4().hex
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {INGEST_TABLE} "
+                 f"(id TEXT NOT NULL, ingested_at TEXT DEFAULT CURRENT_TIMESTAMP)")
+    conn.execute(f"DELETE FROM {INGEST_TABLE}")
+    conn.execute(f"INSERT INTO {INGEST_TABLE} (id) VALUES (?)", (ingest_id,))
+    return ingest_id
+
+
+def ingest_id(conn):
+    """The id recorded by the last ingest, or None for a database no ingest wrote"""
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (INGEST_TABLE,)).fetchone() is None:
+        return None
+    row = conn.execute(f"SELECT id FROM {INGEST_TABLE}").fetchone()
+    return row[0] if row else None
+
+
+def tickets_definition(conn):
+    """[(name, sql), ...] from sqlite_master for the tables and view that hold the tickets"""
+    names = ['tickets', DATA_TABLE, BODY_TABLE, DICTIONARY_TABLE, *LOOKUP_TABLES.values()]
+    return conn.execute(
+        f"SELECT name, sql FROM sqlite_master WHERE type IN ('table', 'view') "
+        f"AND name IN ({', '.join('?' * len(names))}) ORDER BY name", names).fetchall()
+
+
+def drop_search_index(conn):
+    """Drop the ticket app's full-text index and its triggers; the app rebuilds it when it next starts"""
+    for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name GLOB ?",
+                                (f"{SEARCH_TABLE}_*",)).fetchall():
+        conn.execute(f"DROP TRIGGER {_quote(name)}")
+    conn.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+def drop_tickets(conn):
+    """Drop the tickets table, or the view with its data and lookup tables"""
+    drop_search_index(conn)
+    if is_normalized(conn):
+        conn.execute("DROP VIEW tickets")
+    else:
+        conn.execute("DROP TABLE IF EXISTS tickets")
+    conn.execute(f"DROP TABLE IF EXISTS {DATA_TABLE}")
+    conn.execute(f"DROP TABLE IF EXISTS {BODY_TABLE}")
+    conn.execute(f"DROP TABLE IF EXISTS {DICTIONARY_TABLE}")
+    for lookup in LOOKUP_TABLES.values():
+        conn.execute(f"DROP TABLE IF EXISTS {lookup}")
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def view_columns(conn):
+    """[(name, declared type), ...] of the tickets table or view, without the view's rowid and priority_rank"""
+    return [(row[1], row[2]) for row in conn.execute("PRAGMA table_info(tickets)")
+            if row[1] not in ('rowid', RANK_COLUMN)]
+
+
+def _has_rank_column(conn):
+    return any(row[1] == RANK_COLUMN for row in conn.execute(f"PRAGMA table_info({DATA_TABLE})"))
+
+
+def _create_view_and_trigger(conn, columns, compressed_body=False):
+    """columns: [(name, declared type), ...] in the original table order
+
+    With compressed_body, body is read from ticket_bodies through the
+    ticket_body() SQL function and inserted there uncompressed.
+    """
+    selects = []
+    joins = []
+    for name, _ in columns:
+        lookup = LOOKUP_TABLES.get(name)
+        if compressed_body and name == 'body':
+            selects.append("ticket_body(b.dictionary_id, b.data) AS body")
+            joins.append(f"LEFT JOIN {BODY_TABLE} b ON b.rowid = r.rowid")
+        elif lookup:
+            alias = f"l_{name}"
+            selects.append(f"{alias}.name AS {_quote(name)}")
+            joins.append(f"LEFT JOIN {lookup} {alias} ON {alias}.id = r.{name}_id")
+        else:
+            selects.append(f"r.{_quote(name)}")
+    ranked = _has_rank_column(conn)
+    if ranked:
+        selects.append(f"r.{RANK_COLUMN}")
+    conn.execute(
+        f"CREATE VIEW tickets AS SELECT r.rowid AS rowid, {', '.join(selects)} "
+        f"FROM {DATA_TABLE} r {' '.join(joins)}"
+    )
+
+    lookup_inserts = ''.join(
+        f"INSERT OR IGNORE INTO {LOOKUP_TABLES[name]} (name) SELECT NEW.{_quote(name)} "
+        f"WHERE NEW.{_quote(name)} IS NOT NULL;\n"
+        for name, _ in columns if name in LOOKUP_TABLES
+    )
+    stored = [(name, declared) for name, declared in columns if not (compressed_body and name == 'body')]
+    targets = [f"{name}_id" if name in LOOKUP_TABLES else _quote(name) for name, _ in stored]
+    values = [
+        f"(SELECT id FROM {LOOKUP_TABLES[name]} WHERE name = NEW.{_quote(name)})"
+        if name in LOOKUP_TABLES else f"NEW.{_quote(name)}"
+        for name, _ in stored
+    ]
+    if ranked:
+        targets.append(RANK_COLUMN)
+        values.append(PRIORITY_RANK_SQL.format('NEW.priority'))
+    # New bodies are stored as plain text (dictionary_id NULL) until the next compress_bodies()
+    body_insert = (f"INSERT INTO {BODY_TABLE} (rowid, dictionary_id, data) "
+                   f"VALUES (last_insert_rowid(), NULL, NEW.body);" if compressed_body else '')
+    conn.execute(f"""
+        CREATE TRIGGER tickets_insert INSTEAD OF INSERT ON tickets
+        BEGIN
+            {lookup_inserts}
+            INSERT INTO {DATA_TABLE} ({', '.join(targets)}) VALUES ({', '.join(values)});
+            {body_insert}
+        END
+    """)
+
+
+def normalize_tickets(conn):
+    """Convert a flat tickets table to the normalized layout, in place and in one transaction
+
+    Runs entirely in SQL, so memory use does not depend on the table size.
+    The flat table's pages are left on the freelist, so the file only shrinks
+    after a VACUUM. Returns the number of rows converted (0 if already normalized).
+    """
+    if is_normalized(conn):
+        add_priority_rank(conn)
+        return 0
+    columns = [(row[1], row[2]) for row in conn.execute("PRAGMA table_info(tickets)")]
+    if not columns:
+        raise ValueError("No tickets table to normalize")
+
+    # Don't rewrite views that mention tickets (e.g. unique_tickets) to the staging name
+    conn.execute("PRAGMA legacy_alter_table = ON")
+    try:
+        with conn:
+            # DDL does not open a transaction implicitly
+            conn.execute("BEGIN")
+            conn.execute(f"ALTER TABLE tickets RENAME TO {STAGING_TABLE}")
+            definitions = []
+            for name, declared in columns:
+                lookup = LOOKUP_TABLES.get(name)
+                if lookup:
+                    conn.execute(f"CREATE TABLE IF NOT EXISTS {lookup} "
+                                 f"(id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)")
+                    conn.execute(f"INSERT OR IGNORE INTO {lookup} (name) SELECT DISTINCT {_quote(name)} "
+                                 f"FROM {STAGING_TABLE} WHERE {_quote(name)} IS NOT NULL "
+                                 f"ORDER BY {_quote(name)}")
+                    definitions.append(f"{name}_id INTEGER REFERENCES {lookup} (id)")
+                else:
+                    definitions.append(f"{_quote(name)} {declared}".strip())
+            names = {name for name, _ in columns}
+            if 'priority' in names:
+                definitions.append(f"{RANK_COLUMN} INTEGER NOT NULL DEFAULT 0")
+            conn.execute(f"CREATE TABLE {DATA_TABLE} (rowid INTEGER PRIMARY KEY, {', '.join(definitions)})")
+
+            targets = ['rowid'] + [f"{name}_id" if name in LOOKUP_TABLES else _quote(name) for name, _ in columns]
+            values = ['f.rowid'] + [
+                f"(SELECT id FROM {LOOKUP_TABLES[name]} WHERE name = f.{_quote(name)})"
+                if name in LOOKUP_TABLES else f"f.{_quote(name)}"
+                for name, _ in columns
+            ]
+            if 'priority' in names:
+                targets.append(RANK_COLUMN)
+                values.append(PRIORITY_RANK_SQL.format('f.priority'))
+            converted = conn.execute(
+                f"INSERT INTO {DATA_TABLE} ({', '.join(targets)}) "
+                f"SELECT {', '.join(values)} FROM {STAGING_TABLE} f ORDER BY f.rowid"
+            ).rowcount
+            for index, indexed in ID_INDEXES.items():
+                if set(indexed) <= names:
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{DATA_TABLE}_{index} "
+                                 f"ON {DATA_TABLE} ({', '.join(f'{name}_id' for name in indexed)})")
+            if 'priority' in names:
+                _create_rank_index(conn)
+            conn.execute(f"DROP TABLE {STAGING_TABLE}")
+            _create_view_and_trigger(conn, columns)
+    finally:
+        conn.execute("PRAGMA legacy_alter_table = OFF")
+    return converted
+
+
+def _create_rank_index(conn):
+    # (priority_rank, rowid): a priority-sorted page is a range of this index
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{DATA_TABLE}_{RANK_COLUMN} ON {DATA_TABLE} ({RANK_COLUMN})")
+
+
+def add_priority_rank(conn):
+    """Add priority_rank to a database normalized before the column existed; returns True if added"""
+    columns = view_columns(conn)
+    if _has_rank_column(conn) or 'priority' not in {name for name, _ in columns}:
+        return False
+    compressed_body = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = ?", (BODY_TABLE,)).fetchone() is not None
+    with conn:
+        conn.execute("BEGIN")
+        conn.execute(f"ALTER TABLE {DATA_TABLE} ADD COLUMN {RANK_COLUMN} INTEGER NOT NULL DEFAULT 0")
+        priority = f"(SELECT name FROM {LOOKUP_TABLES['priority']} WHERE id = priority_id)"
+        conn.execute(f"UPDATE {DATA_TABLE} SET {RANK_COLUMN} = {PRIORITY_RANK_SQL.format(priority)}")
+        _create_rank_index(conn)
+        conn.execute("DROP VIEW tickets")
+        _create_view_and_trigger(conn, columns, compressed_body=compressed_body)
+    return True
+
+
+def _stored_columns(conn):
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({DATA_TABLE})")}
+
+
+def group_by_sql(conn, column, aggregates, where=None, order_by=None, uses=()):
+    """SQL for (column, aggregate aliases...) over the tickets where column is not NULL
+
+    aggregates is {alias: SQL expression}; the expressions and where may use
+    the tickets columns named in uses. On a normalized database the grouping
+    runs over ticket_rows, on the integer id for a lookup column, and only
+    the few result rows are joined to their names, instead of joining every
+    row through the tickets view. A column that ticket_rows does not store
+    (a compressed body) is only readable through the view, which is used then.
+    """
+    selects = ', '.join(f"{expression} AS {alias}" for alias, expression in aggregates.items())
+    order_sql = f" ORDER BY {order_by}" if order_by else ''
+    if is_normalized(conn):
+        stored = _stored_columns(conn)
+        if all(name in stored for name in uses):
+            if column in LOOKUP_TABLES:
+                filters = ' AND '.join([f"{column}_id IS NOT NULL"] + ([f"({where})"] if where else []))
+                aliases = ', '.join(f"c.{alias}" for alias in aggregates)
+                return (f"SELECT l.name AS {column}, {aliases} FROM "
+                        f"(SELECT {column}_id, {selects} FROM {DATA_TABLE} "
+                        f"WHERE {filters} GROUP BY {column}_id) c "
+                        f"JOIN {LOOKUP_TABLES[column]} l ON l.id = c.{column}_id{order_sql}")
+            if column in stored:
+                filters = ' AND '.join([f"{column} IS NOT NULL"] + ([f"({where})"] if where else []))
+                return (f"SELECT {column}, {selects} FROM {DATA_TABLE} "
+                        f"WHERE {filters} GROUP BY {column}{order_sql}")
+    filters = ' AND '.join([f"{column} IS NOT NULL"] + ([f"({where})"] if where else []))
+    return f"SELECT {column}, {selects} FROM tickets WHERE {filters} GROUP BY {column}{order_sql}"
+
+
+def count_by_sql(conn, column, count_alias='ticket_count'):
+    """SQL for (column, count) of non-NULL values, most common first (see group_by_sql)"""
+    return group_by_sql(conn, column, {count_alias: 'COUNT(*)'}, order_by=f"{count_alias} DESC")
+
+
+def storage_bytes(conn):
+    """{'tables': bytes, 'indexes': bytes} from the dbstat table, or None if SQLite lacks it"""
+    try:
+        rows = conn.execute("""
+            SELECT m.type, SUM(s.pgsize) FROM dbstat s
+            JOIN sqlite_master m ON m.name = s.name
+            GROUP BY m.type
+        """).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    sizes = dict(rows)
+    return {'tables': sizes.get('table', 0), 'indexes': sizes.get('index', 0)}
+
+
+def _best_time(conn, sql, repeat=COMPARE_REPEAT):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(sql).fetchall()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def comparison_queries(conn):
+    """{label: (flat/view SQL, id-level SQL or None)} for the columns present"""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(tickets)")}
+    queries = {}
+    for name in LOOKUP_TABLES:
+        if name in columns:
+            queries[f"GROUP BY {name}"] = (
+                f"SELECT {name}, COUNT(*) AS ticket_count FROM tickets "
+                f"WHERE {name} IS NOT NULL GROUP BY {name} ORDER BY ticket_count DESC",
+                # What count_by_sql() generates for a normalized database
+                f"SELECT l.name AS {name}, c.ticket_count FROM "
+                f"(SELECT {name}_id, COUNT(*) AS ticket_count FROM {DATA_TABLE} "
+                f"WHERE {name}_id IS NOT NULL GROUP BY {name}_id) c "
+                f"JOIN {LOOKUP_TABLES[name]} l ON l.id = c.{name}_id "
+                f"ORDER BY ticket_count DESC",
+            )
+    if {'type', 'priority', 'queue'} <= columns:
+        queries["GROUP BY type, priority, queue"] = (
+            "SELECT type, priority, queue, COUNT(*) FROM tickets GROUP BY type, priority, queue",
+            f"SELECT t.name, p.name, q.name, c.n FROM (SELECT type_id, priority_id, queue_id, COUNT(*) AS n "
+            f"FROM {DATA_TABLE} GROUP BY type_id, priority_id, queue_id) c "
+            f"LEFT JOIN ticket_types t ON t.id = c.type_id "
+            f"LEFT JOIN ticket_priorities p ON p.id = c.priority_id "
+            f"LEFT JOIN ticket_queues q ON q.id = c.queue_id",
+        )
+    if 'priority' in columns:
+        queries["WHERE priority = 'high'"] = ("SELECT COUNT(*) FROM tickets WHERE priority = 'high'", None)
+    return queries
+
+
+def compare_layouts(db_filename=DB_FILENAME, repeat=COMPARE_REPEAT):
+    """File size and query timings of the flat and normalized layouts of one database
+
+    Works on vacuumed copies in a temporary directory, both with the
+    ID_INDEXES column sets indexed; the source database is not modified. Returns {'flat_bytes', 'normalized_bytes', 'flat_storage',
+    'normalized_storage', 'queries': {label: {'flat', 'view', 'ids'}}} with
+    times in seconds; the storage entries split table and index bytes.
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        flat_path = os.path.join(workdir, 'flat.db')
+        normalized_path = os.path.join(workdir, 'normalized.db')
+        shutil.copyfile(db_filename, flat_path)
+
+        conn = sqlite3.connect(flat_path)
+        if is_normalized(conn):
+            raise ValueError(f"{db_filename} is already normalized; compare needs a flat database")
+        # Only the tickets data is compared
+        for name, kind in conn.execute(
+                "SELECT name, type FROM sqlite_master WHERE type IN ('table', 'view') "
+                "AND name NOT LIKE 'sqlite_%' AND name != 'tickets'").fetchall():
+            conn.execute(f"DROP {kind.upper()} IF EXISTS {_quote(name)}")
+        conn.commit()
+        conn.execute("VACUUM")
+        conn.close()
+        shutil.copyfile(flat_path, normalized_path)
+
+        # The same indexes on the text columns, so both layouts are compared indexed
+        conn = sqlite3.connect(flat_path)
+        names = {row[1] for row in conn.execute("PRAGMA table_info(tickets)")}
+        for index, indexed in ID_INDEXES.items():
+            if set(indexed) <= names:
+                conn.execute(f"CREATE INDEX idx_tickets_flat_{index} ON tickets ({', '.join(indexed)})")
+        conn.commit()
+        conn.close()
+
+        conn = sqlite3.connect(normalized_path)
+        normalize_tickets(conn)
+        conn.execute("VACUUM")
+        conn.close()
+
+        results = {
+            'flat_bytes': os.path.getsize(flat_path),
+            'normalized_bytes': os.path.getsize(normalized_path),
+            'queries': {},
+        }
+        flat = sqlite3.connect(flat_path)
+        normalized = sqlite3.connect(normalized_path)
+        try:
+            results['flat_storage'] = storage_bytes(flat)
+            results['normalized_storage'] = storage_bytes(normalized)
+            for label, (sql, ids_sql) in comparison_queries(flat).items():
+                results['queries'][label] = {
+                    'flat': _best_time(flat, sql, repeat),
+                    'view': _best_time(normalized, sql, repeat),
+                    'ids': _best_time(normalized, ids_sql, repeat) if ids_sql else None,
+                }
+        finally:
+            flat.close()
+            normalized.close()
+    return results
+
+
+def print_comparison(results):
+    print("\n📦 FLAT vs NORMALIZED LAYOUT")
+    print("=" * 70)
+    flat_mb, normalized_mb = results['flat_bytes'] / 1e6, results['normalized_bytes'] / 1e6
+    print(f"Database size: {flat_mb:,.1f} MB flat → {normalized_mb:,.1f} MB normalized "
+          f"({(normalized_mb / flat_mb - 1) * 100:+.1f}%)")
+    if results.get('flat_storage') and results.get('normalized_storage'):
+        for label, key in (('tables', 'tables'), ('indexes', 'indexes')):
+            before = results['flat_storage'][key] / 1e6
+            after = results['normalized_storage'][key] / 1e6
+            print(f"   {label:<8} {before:9,.1f} MB → {after:9,.1f} MB")
+    print(f"\n{'Query':<34} {'flat':>9} {'view':>9} {'ids':>9}")
+    print("-" * 70)
+    for label, times in results['queries'].items():
+        ids = f"{times['ids'] * 1000:7.1f}ms" if times['ids'] is not None else f"{'-':>9}"
+        print(f"{label:<34} {times['flat'] * 1000:7.1f}ms {times['view'] * 1000:7.1f}ms {ids}")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else 'compare'
+    db_file = sys.argv[2] if len(sys.argv) > 2 else DB_FILENAME
+    if command == 'normalize':
+        conn = sqlite3.connect(db_file)
+        rows = normalize_tickets(conn)
+        conn.execute("VACUUM")
+        conn.close()
+        print(f"✅ Normalized {rows:,} tickets in {db_file}" if rows else f"ℹ️ {db_file} is already normalized")
+    elif command == 'compare':
+        print_comparison(compare_layouts(db_file))
+    else:
+        print("Usage: python ticket_schema.py normalize|compare [db]")
@@ -0,0 +1,298 @@
+"""
+ticketdb: one command line for the ticket pipeline.
+
+    python ticketdb.py [--db FILE] ingest [--csv FILE] [--report FILE] [--flat-schema] [--compress-bodies]
+    python ticketdb.py [--db FILE] analyze [--profile]
+    python ticketdb.py [--db FILE] search "text" | --ticket ROWID | --build
+    python ticketdb.py [--db FILE] train [--target queue] [--no-feature-store]
+    python ticketdb.py [--db FILE] features [--build | --prune]
+    python ticketdb.py [--db FILE] tune [--target queue] [--folds 3] [--eta 3] [--save]
+    python ticketdb.py [--db FILE] score [--workers N] [--incremental]
+    python ticketdb.py [--db FILE] feed [--reset CONSUMER | --reset-all]
+    python ticketdb.py [--db FILE] schema [--normalize | --compare | --compress-bodies | --compare-bodies]
+    python ticketdb.py bench [benchmark_suite options]
+
+--db, --model, --index-dir and --features-dir are shared by every subcommand
+and default to the TICKETDB_DB, TICKETDB_MODEL, TICKETDB_INDEX_DIR and
+TICKETDB_FEATURES_DIR environment variables, then to the usual file names. This module imports only argparse at startup;
+each subcommand imports its own dependencies when it runs, so `--help` and
+light commands do not pay for pandas, scipy or scikit-learn.
+"""
+import argparse
+import os
+import sys
+import time
+
+DEFAULT_DB = 'english_support_tickets.db'
+DEFAULT_MODEL = 'ticket_classifier.pkl'
+DEFAULT_INDEX_DIR = 'similarity_index'
+DEFAULT_FEATURES_DIR = 'feature_store'
+
+
+def cmd_ingest(args):
+    import filter_english_tickets as ingest
+    from near_duplicates import duplicate_summary, update_near_duplicates
+
+    if args.report:
+        from stage_metrics import StageMetrics
+        ingest.METRICS = StageMetrics(trace_memory=not args.no_memory)
+
+    english_df = ingest.filter_english_tickets(args.csv)
+    if english_df is None:
+        print("❌ Could not filter English tickets. Check dataset format.")
+        return 1
+    ingest.save_english_tickets(english_df, args.output_csv, args.db, normalize=not args.flat_schema,
+                                compress=args.compress_bodies)
+    if not args.skip_near_duplicates:
+        with ingest._stage('near_duplicates') as stage:
+            update_near_duplicates(args.db, rebuild=True)
+            stage['rows'] = len(english_df)
+        duplicate_summary(args.db)
+    print(f"\n📊 {len(english_df):,} English tickets saved to {args.db}")
+
+    if ingest.METRICS:
+        ingest.METRICS.close()
+        ingest.METRICS.print_summary()
+        ingest.METRICS.write_json(args.report)
+        print(f"📄 Stage report: {args.report}")
+    return 0
+
+
+def cmd_analyze(args):
+    import analyze_tickets
+
+    analyze_tickets.main(profile=args.profile, db_filename=args.db)
+    return 0
+
+
+def cmd_search(args):
+    import similar_tickets
+
+    if args.build:
+        print("🏗️ Building similarity index...")
+        stats = similar_tickets.build_similarity_index(args.db, args.index_dir)
+        print(f"✅ Indexed {stats['tickets']:,} tickets ({stats['terms']:,} terms, {stats['nnz']:,} non-zeros)")
+        return 0
+
+    started = time.perf_counter()
+    if args.ticket is not None:
+        matches = similar_tickets.similar_to_ticket(args.ticket, args.k, args.db, args.index_dir)
+        label = f"#{args.ticket}"
+    elif args.text:
+        matches = similar_tickets.find_similar_tickets(' '.join(args.text), args.k, args.index_dir)
+        label = repr(' '.join(args.text))
+    else:
+        print("❌ Give search text, --ticket ROWID or --build")
+        return 2
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"🔎 Tickets similar to {label} ({elapsed:.1f} ms):")
+    for rowid, score in matches:
+        print(f"   #{rowid:<8} {score:.3f}")
+    return 0
+
+
+def cmd_train(args):
+    from ticket_classifier import train_ticket_classifier
+
+    print(f"🧠 Training ticket classifier for '{args.target}'...")
+    features_dir = None if args.no_feature_store else args.features_dir
+    model = train_ticket_classifier(args.db, args.target, args.model, features_dir=features_dir)
+    print(f"✅ Saved to {args.model} ({len(model.classes_)} classes)")
+    return 0
+
+
+def cmd_tune(args):
+    import tune_classifier
+
+    print(f"🔧 Tuning the '{args.target}' classifier...")
+    report = tune_classifier.tune_classifier(args.db, args.target, folds=args.folds, eta=args.eta,
+                                             workers=args.workers, metric=args.metric)
+    tune_classifier.print_leaderboard(report)
+    tune_classifier.write_leaderboard(report, args.output)
+    print(f"\n📄 Leaderboard: {args.output}")
+    if args.save:
+        tune_classifier.save_best_classifier(report, args.db, args.model)
+        print(f"✅ Best config saved to {args.model}")
+    return 0
+
+
+def cmd_score(args):
+    from score_tickets import score_tickets
+
+    print(f"⚙️ Scoring tickets with {args.model}...")
+    stats = score_tickets(args.db, args.model, workers=args.workers, incremental=args.incremental)
+    print(f"✅ Scored {stats['rows']:,} tickets in {stats['ranges']} ranges "
+          f"({stats['seconds']:.1f}s, {stats['rows_per_sec']:,.0f} rows/sec)")
+    return 0
+
+
+def cmd_features(args):
+    import feature_store
+
+    if args.build:
+        started = time.perf_counter()
+        features = feature_store.open_features(feature_store.build_features(args.db, store_dir=args.features_dir))
+        print(f"✅ {features['meta']['rows']:,} tickets x {features['meta']['terms']:,} terms "
+              f"in {features['path']} ({time.perf_counter() - started:.1f}s)")
+    if args.prune:
+        removed = feature_store.prune_features(args.db, args.features_dir)
+        print(f"🧹 Removed {len(removed)} stale feature sets")
+    entries = feature_store.list_features(args.features_dir)
+    if not entries:
+        print(f"📭 No feature sets in {args.features_dir}")
+    for meta in entries:
+        print(f"📦 {meta['key']}  {meta['rows']:>9,} rows  {meta['terms']:>8,} terms  "
+              f"db {meta['db_version']}  {meta['created_at']}")
+    return 0
+
+
+def cmd_feed(args):
+    import sqlite3
+    from change_feed import feed_status, reset_checkpoints
+
+    if args.reset or args.reset_all:
+        conn = sqlite3.connect(args.db)
+        with conn:
+            reset_checkpoints(conn, None if args.reset_all else args.reset)
+        conn.close()
+        print(f"♻️ Reset {'all consumers' if args.reset_all else args.reset}")
+    status = feed_status(args.db)
+    if not status:
+        print("📭 No change-feed consumers yet")
+    for consumer, last_rowid, pending, updated_at in status:
+        print(f"📬 {consumer:<30} at rowid {last_rowid:>10,}  {pending:>8,} pending  (updated {updated_at})")
+    return 0
+
+
+def cmd_schema(args):
+    import sqlite3
+    import ticket_schema
+
+    if args.normalize:
+        conn = sqlite3.connect(args.db)
+        rows = ticket_schema.normalize_tickets(conn)
+        # Gives the flat table's pages back to the file system
+        conn.execute("VACUUM")
+        conn.close()
+        print(f"✅ Normalized {rows:,} tickets into {ticket_schema.DATA_TABLE} + lookup tables "
+              f"({os.path.getsize(args.db) / 1e6:,.1f} MB)")
+    elif args.compare:
+        ticket_schema.print_comparison(ticket_schema.compare_layouts(args.db))
+    elif args.compress_bodies:
+        import body_store
+
+        conn = sqlite3.connect(args.db)
+        rows = body_store.compress_bodies(conn)
+        # Rebuilds ticket_rows without the dropped body column's bytes
+        conn.execute("VACUUM")
+        conn.close()
+        print(f"✅ Compressed {rows:,} ticket bodies ({os.path.getsize(args.db) / 1e6:,.1f} MB)")
+    elif args.compare_bodies:
+        import body_store
+
+        body_store.print_body_comparison(body_store.compare_body_storage(args.db))
+    else:
+        conn = sqlite3.connect(args.db)
+        layout = 'normalized' if ticket_schema.is_normalized(conn) else 'flat'
+        compressed = conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?",
+                                  (ticket_schema.BODY_TABLE,)).fetchone() is not None
+        conn.close()
+        print(f"🗂️ {args.db}: {layout} tickets layout{', compressed bodies' if compressed else ''}")
+    return 0
+
+
+def cmd_bench(args):
+    import benchmark_suite
+
+    return benchmark_suite.main(args.bench_args)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='ticketdb', description="Support ticket pipeline")
+    parser.add_argument('--db', default=os.environ.get('TICKETDB_DB', DEFAULT_DB),
+                        help='SQLite database (default: %(default)s)')
+    parser.add_argument('--model', default=os.environ.get('TICKETDB_MODEL', DEFAULT_MODEL),
+                        help='classifier file for train/score (default: %(default)s)')
+    parser.add_argument('--index-dir', default=os.environ.get('TICKETDB_INDEX_DIR', DEFAULT_INDEX_DIR),
+                        help='similarity index directory (default: %(default)s)')
+    parser.add_argument('--features-dir', default=os.environ.get('TICKETDB_FEATURES_DIR', DEFAULT_FEATURES_DIR),
+                        help='feature store directory (default: %(default)s)')
+    subcommands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = subcommands.add_parser('ingest', help='filter the dataset to English tickets and load the database')
+    ingest.add_argument('--csv', default='dataset-tickets-multi-lang-4-20k.csv', help='input dataset')
+    ingest.add_argument('--output-csv', default='english_support_tickets.csv')
+    ingest.add_argument('--skip-near-duplicates', action='store_true')
+    ingest.add_argument('--flat-schema', action='store_true', help='store a plain tickets table (no lookup tables)')
+    ingest.add_argument('--compress-bodies', action='store_true', help='store ticket bodies compressed')
+    ingest.add_argument('--report', help='write a per-stage timing/memory JSON report here')
+    ingest.add_argument('--no-memory', action='store_true', help='skip tracemalloc in the stage report')
+    ingest.set_defaults(handler=cmd_ingest)
+
+    analyze = subcommands.add_parser('analyze', help='run the analysis questions')
+    analyze.add_argument('--profile', action='store_true', help='profile every SQL statement')
+    analyze.set_defaults(handler=cmd_analyze)
+
+    search = subcommands.add_parser('search', help='find similar tickets')
+    search.add_argument('text', nargs='*', help='free text to match')
+    search.add_argument('--ticket', type=int, help='match an existing ticket by rowid')
+    search.add_argument('--build', action='store_true', help='(re)build the similarity index')
+    search.add_argument('-k', type=int, default=10)
+    search.set_defaults(handler=cmd_search)
+
+    train = subcommands.add_parser('train', help='train the ticket classifier')
+    train.add_argument('--target', default='queue', choices=('queue', 'priority', 'type'))
+    train.add_argument('--no-feature-store', action='store_true', help='vectorize the raw text instead')
+    train.set_defaults(handler=cmd_train)
+
+    features = subcommands.add_parser('features', help='list, build or prune stored TF-IDF feature sets')
+    features.add_argument('--build', action='store_true', help='build the default feature set if it is not current')
+    features.add_argument('--prune', action='store_true', help='remove feature sets of older database versions')
+    features.set_defaults(handler=cmd_features)
+
+    tune = subcommands.add_parser('tune', help='search classifier hyperparameters (successive halving)')
+    tune.add_argument('--target', default='queue', choices=('queue', 'priority', 'type'))
+    tune.add_argument('--metric', default='accuracy', choices=('accuracy', 'f1_macro'))
+    tune.add_argument('--folds', type=int, default=3)
+    tune.add_argument('--eta', type=int, default=3, help='keep the best 1/eta configs at each rung')
+    tune.add_argument('--workers', type=int)
+    tune.add_argument('--output', default='tuning_leaderboard.json', help='JSON leaderboard file')
+    tune.add_argument('--save', action='store_true', help='refit the best config on all tickets and save it to --model')
+    tune.set_defaults(handler=cmd_tune)
+
+    score = subcommands.add_parser('score', help='score every ticket with the classifier')
+    score.add_argument('--workers', type=int)
+    score.add_argument('--incremental', action='store_true', help='only score tickets added since the last run')
+    score.set_defaults(handler=cmd_score)
+
+    feed = subcommands.add_parser('feed', help='show (or reset) change-feed consumer checkpoints')
+    feed.add_argument('--reset', metavar='CONSUMER')
+    feed.add_argument('--reset-all', action='store_true')
+    feed.set_defaults(handler=cmd_feed)
+
+    schema = subcommands.add_parser('schema', help='show, convert or compare the tickets storage layout')
+    schema.add_argument('--normalize', action='store_true', help='convert a flat tickets table in place')
+    schema.add_argument('--compare', action='store_true', help='compare size and GROUP BY timings of both layouts')
+    schema.add_argument('--compress-bodies', action='store_true', help='move bodies into compressed storage')
+    schema.add_argument('--compare-bodies', action='store_true',
+                        help='compression ratio and query timings with plain vs compressed bodies')
+    schema.set_defaults(handler=cmd_schema)
+
+    # Everything after `bench` (including --help) is passed to benchmark_suite
+    bench = subcommands.add_parser('bench', help='run the benchmark suite', add_help=False)
+    bench.set_defaults(handler=cmd_bench)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command == 'bench':
+        args.bench_args = extra
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,338 @@
+"""
+Hyperparameter search for the ticket classifier (TF-IDF + Multinomial Naive Bayes).
+
+A plain grid search over the simple_ml_test.py pipeline refits the
+TfidfVectorizer for every fold of every parameter combination, although
+most combinations only change the Naive Bayes step. Here the search is
+split in two:
+
+1. Each (vectorizer config, fold) is vectorized once: the vectorizer is
+   fitted on the fold's training rows and both splits are saved as
+   memory-mapped matrices (feature_store.save_matrix) under cache_dir,
+   keyed by the config, the database version, the target and the folds.
+   A rerun on an unchanged database skips this step.
+2. Naive Bayes fits are spread over a process pool and pruned by
+   successive halving: every config is first fitted on a small sample of
+   each fold's training rows, only the best 1/eta go on to eta times more
+   rows, and so on until the survivors are fitted on the full folds.
+
+The result is a leaderboard of every config with its cross-validated
+score, how far it got, and the seconds spent vectorizing, fitting and
+predicting for it.
+
+    python tune_classifier.py [--target queue] [--folds 3] [--eta 3] [--workers N] [--save]
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from feature_store import current_version, feature_key, load_matrix, make_vectorizer, save_matrix, vectorizer_config
+from ticket_classifier import DB_FILENAME, MODEL_FILENAME, TARGET_COLUMNS
+
+CACHE_DIR = 'tuning_cache'
+LEADERBOARD_FILENAME = 'tuning_leaderboard.json'
+VECTORIZER_GRID = {
+    'ngram_range': [(1, 1), (1, 2)],
+    'min_df': [1, 3],
+    'sublinear_tf': [True, False],
+}
+MODEL_GRID = {
+    'alpha': [0.01, 0.1, 0.3, 1.0],
+    'fit_prior': [True, False],
+}
+FOLDS = 3
+ETA = 3
+# Smallest training sample a rung may use. Below a few thousand rows the
+# bigram configs rank far below where they finish and are dropped too early.
+MIN_TRAIN_ROWS = 2000
+SEED = 0
+METRICS = ('accuracy', 'f1_macro')
+
+_worker_db = None
+_worker_target = None
+_worker_texts = None
+
+
+def expand_grid(grid):
+    """[{name: value, ...}, ...] for every combination of the grid's values"""
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def load_labelled_tickets(db_filename, target):
+    """(texts, labels) of the tickets whose target column is set, in rowid order"""
+    import sqlite3
+
+    import pandas as pd
+
+    from body_store import register_body_functions
+    from similar_tickets import ticket_text
+
+    conn = register_body_functions(sqlite3.connect(db_filename))
+    try:
+        df = pd.read_sql_query(
+            f"SELECT subject, body, {target} FROM tickets WHERE {target} IS NOT NULL ORDER BY rowid", conn
+        )
+    finally:
+        conn.close()
+    return ticket_text(df).tolist(), df[target].astype(str).to_numpy()
+
+
+def split_folds(labels, folds=FOLDS, seed=SEED):
+    """[(train positions, valid positions), ...]; training positions are shuffled
+
+    Stratified when every class has at least `folds` rows. Shuffling the
+    training positions makes any prefix of them a random sample, which is
+    what the halving rungs train on.
+    """
+    from sklearn.model_selection import KFold, StratifiedKFold
+
+    _, counts = np.unique(labels, return_counts=True)
+    splitter = (StratifiedKFold(folds, shuffle=True, random_state=seed) if counts.min() >= folds
+                else KFold(folds, shuffle=True, random_state=seed))
+    rng = np.random.default_rng(seed)
+    return [(rng.permutation(train), valid) for train, valid in splitter.split(np.zeros(len(labels)), labels)]
+
+
+def _init_worker(db_filename, target):
+    global _worker_db, _worker_target
+    _worker_db, _worker_target = db_filename, target
+
+
+def _worker_texts_array():
+    """The labelled texts, read once per worker and only by workers that vectorize"""
+    global _worker_texts
+    if _worker_texts is None:
+        texts, _ = load_labelled_tickets(_worker_db, _worker_target)
+        _worker_texts = np.array(texts, dtype=object)
+    return _worker_texts
+
+
+def _vectorize_fold(root, vectorizer, fold):
+    """Fit the vectorizer on one fold's training rows and cache both splits; returns seconds (0 if cached)"""
+    path = os.path.join(root, feature_key(vectorizer, 'tuning'), f"fold{fold}")
+    if os.path.exists(path):
+        return 0.0
+    started = time.perf_counter()
+    texts = _worker_texts_array()
+    train = np.load(os.path.join(root, f"fold{fold}_train.npy"))
+    valid = np.load(os.path.join(root, f"fold{fold}_valid.npy"))
+    model = make_vectorizer(vectorizer)
+    X_train = model.fit_transform(texts[train])
+    X_valid = model.transform(texts[valid])
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    workdir = tempfile.mkdtemp(prefix='.building-', dir=os.path.dirname(path))
+    try:
+        for split, matrix in (('train', X_train), ('valid', X_valid)):
+            os.makedirs(os.path.join(workdir, split))
+            save_matrix(os.path.join(workdir, split), matrix)
+        os.replace(workdir, path)
+    except BaseException:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+    return time.perf_counter() - started
+
+
+def _fit_fold(root, vectorizer, params, fold, train_rows):
+    """Fit Naive Bayes on the first train_rows training rows of a fold and score it on the fold's valid rows"""
+    from sklearn.metrics import accuracy_score, f1_score
+    from sklearn.naive_bayes import MultinomialNB
+
+    path = os.path.join(root, feature_key(vectorizer, 'tuning'), f"fold{fold}")
+    labels = np.load(os.path.join(root, 'labels.npy'), mmap_mode='r')
+    train = np.load(os.path.join(root, f"fold{fold}_train.npy"), mmap_mode='r')[:train_rows]
+    valid = np.load(os.path.join(root, f"fold{fold}_valid.npy"), mmap_mode='r')
+
+    started = time.perf_counter()
+    model = MultinomialNB(**params).fit(load_matrix(os.path.join(path, 'train'))[:train_rows], labels[train])
+    fitted = time.perf_counter()
+    predicted = model.predict(load_matrix(os.path.join(path, 'valid')))
+    finished = time.perf_counter()
+    return {
+        'accuracy': accuracy_score(labels[valid], predicted),
+        'f1_macro': f1_score(labels[valid], predicted, average='macro'),
+        'fit_seconds': fitted - started,
+        'predict_seconds': finished - fitted,
+    }
+
+
+def _prepare_cache(db_filename, target, folds, seed, cache_dir):
+    """Cache root for this database file and version, target and fold split; writes labels and folds once
+
+    The version carries the ingest id (see feature_store.db_version), so
+    another database of the same size, or a re-ingest of this one, gets its
+    own root.
+    """
+    version = current_version(db_filename)
+    split = json.dumps({'target': target, 'folds': folds, 'seed': seed, 'db_version': version,
+                        'db_filename': os.path.abspath(db_filename)}, sort_keys=True)
+    root = os.path.join(cache_dir, hashlib.sha1(split.encode('utf-8')).hexdigest()[:16])
+    if not os.path.exists(os.path.join(root, 'labels.npy')):
+        _, labels = load_labelled_tickets(db_filename, target)
+        classes, codes = np.unique(labels, return_inverse=True)
+        os.makedirs(root, exist_ok=True)
+        for fold, (train, valid) in enumerate(split_folds(labels, folds, seed)):
+            np.save(os.path.join(root, f"fold{fold}_train.npy"), train)
+            np.save(os.path.join(root, f"fold{fold}_valid.npy"), valid)
+        with open(os.path.join(root, 'classes.json'), 'w') as f:
+            json.dump([str(name) for name in classes], f)
+        # Written last: its presence marks the fold files as complete
+        np.save(os.path.join(root, 'labels.npy'), codes.astype(np.int32))
+    return root
+
+
+def halving_schedule(num_configs, full_rows, eta=ETA, min_rows=MIN_TRAIN_ROWS):
+    """Training rows per rung, smallest first; the last rung always uses full_rows"""
+    rungs = 1 + int(math.log(max(num_configs, 1), eta) + 1e-9)
+    rungs = min(rungs, 1 + int(math.log(max(full_rows / min_rows, 1), eta) + 1e-9))
+    return [max(min_rows, full_rows // eta ** (rungs - 1 - rung)) if rung < rungs - 1 else full_rows
+            for rung in range(rungs)]
+
+
+def tune_classifier(db_filename=DB_FILENAME, target='queue', vectorizer_grid=None, model_grid=None,
+                    folds=FOLDS, eta=ETA, workers=None, cache_dir=CACHE_DIR, metric='accuracy',
+                    min_train_rows=MIN_TRAIN_ROWS, seed=SEED):
+    """Cross-validated successive-halving search; returns {'leaderboard': [...], 'rungs', 'seconds', ...}
+
+    Leaderboard entries are sorted best first (furthest rung, then score)
+    and hold the config, its mean and std score on the last rung it reached,
+    the training rows of that rung, and its vectorize, fit and predict
+    seconds. Vectorizing is shared by every config with the same vectorizer
+    settings, so each of them reports the full vectorize time.
+    """
+    if target not in TARGET_COLUMNS:
+        raise ValueError(f"target must be one of {TARGET_COLUMNS}, got {target!r}")
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {METRICS}, got {metric!r}")
+    started = time.perf_counter()
+    vectorizers = [vectorizer_config(config) for config in expand_grid(vectorizer_grid or VECTORIZER_GRID)]
+    configs = [{'vectorizer': vectorizer, 'model': params}
+               for vectorizer in vectorizers for params in expand_grid(model_grid or MODEL_GRID)]
+
+    root = _prepare_cache(db_filename, target, folds, seed, cache_dir)
+    full_rows = min(len(np.load(os.path.join(root, f"fold{fold}_train.npy"), mmap_mode='r'))
+                    for fold in range(folds))
+    schedule = halving_schedule(len(configs), full_rows, eta, min_train_rows)
+    results = [dict(config, rung=None, train_rows=0, score=None, score_std=None,
+                    vectorize_seconds=0.0, fit_seconds=0.0, predict_seconds=0.0) for config in configs]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(db_filename, target)) as pool:
+        jobs = {(i, fold): pool.submit(_vectorize_fold, root, vectorizer, fold)
+                for i, vectorizer in enumerate(vectorizers) for fold in range(folds)}
+        vectorize_seconds = [sum(jobs[i, fold].result() for fold in range(folds)) for i in range(len(vectorizers))]
+        for result in results:
+            result['vectorize_seconds'] = vectorize_seconds[vectorizers.index(result['vectorizer'])]
+
+        alive = list(range(len(configs)))
+        for rung, train_rows in enumerate(schedule):
+            futures = {(i, fold): pool.submit(_fit_fold, root, configs[i]['vectorizer'], configs[i]['model'],
+                                              fold, train_rows)
+                       for i in alive for fold in range(folds)}
+            for i in alive:
+                scores = [futures[i, fold].result() for fold in range(folds)]
+                values = [score[metric] for score in scores]
+                results[i].update(rung=rung, train_rows=train_rows,
+                                  score=float(np.mean(values)), score_std=float(np.std(values)))
+                results[i]['fit_seconds'] += sum(score['fit_seconds'] for score in scores)
+                results[i]['predict_seconds'] += sum(score['predict_seconds'] for score in scores)
+            if rung < len(schedule) - 1:
+                alive = sorted(alive, key=lambda i: results[i]['score'], reverse=True)[:math.ceil(len(alive) / eta)]
+
+    leaderboard = sorted(results, key=lambda result: (result['rung'], result['score']), reverse=True)
+    return {
+        'target': target,
+        'metric': metric,
+        'folds': folds,
+        'rungs': schedule,
+        'configs': len(configs),
+        'fits': sum(folds * len([r for r in results if r['rung'] is not None and r['rung'] >= rung])
+                    for rung in range(len(schedule))),
+        'cache': root,
+        'seconds': time.perf_counter() - started,
+        'leaderboard': leaderboard,
+    }
+
+
+def _describe(config):
+    vectorizer, model = config['vectorizer'], config['model']
+    return (f"ngrams={tuple(vectorizer['ngram_range'])} min_df={vectorizer['min_df']} "
+            f"sublinear={vectorizer['sublinear_tf']} alpha={model['alpha']} fit_prior={model['fit_prior']}")
+
+
+def print_leaderboard(report, top=15):
+    print(f"\n🏆 TUNING LEADERBOARD — {report['target']} ({report['metric']}, {report['folds']}-fold CV)")
+    print("=" * 110)
+    print(f"Rungs (training rows per fold): {' → '.join(f'{rows:,}' for rows in report['rungs'])}; "
+          f"{report['fits']} fits for {report['configs']} configs in {report['seconds']:.1f}s")
+    print(f"\n{'#':>3} {'score':>7} {'±':>6} {'rung':>4} {'rows':>9} {'vectorize':>10} {'fit':>8} {'predict':>8}  config")
+    print("-" * 110)
+    for rank, result in enumerate(report['leaderboard'][:top], 1):
+        print(f"{rank:>3} {result['score']:7.4f} {result['score_std']:6.4f} {result['rung']:>4} "
+              f"{result['train_rows']:>9,} {result['vectorize_seconds']:9.2f}s {result['fit_seconds']:7.2f}s "
+              f"{result['predict_seconds']:7.2f}s  {_describe(result)}")
+    if len(report['leaderboard']) > top:
+        print(f"... {len(report['leaderboard']) - top} more in the JSON leaderboard")
+
+
+def write_leaderboard(report, filename=LEADERBOARD_FILENAME):
+    with open(filename, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def save_best_classifier(report, db_filename=DB_FILENAME, model_filename=MODEL_FILENAME):
+    """Fit the best config on every labelled ticket and save it like train_ticket_classifier"""
+    from sklearn.naive_bayes import MultinomialNB
+    from sklearn.pipeline import Pipeline
+
+    from ticket_classifier import save_classifier
+
+    best = report['leaderboard'][0]
+    texts, labels = load_labelled_tickets(db_filename, report['target'])
+    classifier = Pipeline([
+        ('tfidf', make_vectorizer(best['vectorizer'])),
+        ('naive_bayes', MultinomialNB(**best['model']))
+    ])
+    classifier.fit(texts, labels)
+    save_classifier(classifier, report['target'], model_filename)
+    return classifier
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tune the TF-IDF + Naive Bayes ticket classifier")
+    parser.add_argument('--db', default=DB_FILENAME)
+    parser.add_argument('--target', default='queue', choices=TARGET_COLUMNS)
+    parser.add_argument('--metric', default='accuracy', choices=METRICS)
+    parser.add_argument('--folds', type=int, default=FOLDS)
+    parser.add_argument('--eta', type=int, default=ETA, help='keep the best 1/eta configs at each rung')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--output', default=LEADERBOARD_FILENAME, help='JSON leaderboard file')
+    parser.add_argument('--save', action='store_true', help='refit the best config on all tickets and save it')
+    parser.add_argument('--model', default=MODEL_FILENAME, help='where --save writes the classifier')
+    args = parser.parse_args(argv)
+
+    print(f"🔧 Tuning the '{args.target}' classifier...")
+    report = tune_classifier(args.db, args.target, folds=args.folds, eta=args.eta, workers=args.workers,
+                             cache_dir=args.cache_dir, metric=args.metric)
+    print_leaderboard(report)
+    write_leaderboard(report, args.output)
+    print(f"\n📄 Leaderboard: {args.output}")
+    if args.save:
+        save_best_classifier(report, args.db, args.model)
+        print(f"✅ Best config saved to {args.model}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())